@@ -1,8 +1,21 @@
+import datetime
+import functools
+import os
+import re
+import time
+
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+
+from panels import berth_window_panel, safe_limits_panel, schedule_panel, slack_panel, transit_panel
+from ukc.defaults import DEFAULT_GAUGE, DEFAULTS, default_tide
+from ukc.engine import STEP_MINUTES, round_values
+from ukc.graph import SharedCache, ukc_graph
+from ukc.profiling import StageTimer
+from ukc.render import critical_indices
+from ukc.store import ScenarioStore
+
+# Nguồn triều, bản đồ đáy, trạm triều, Monte Carlo, biểu đồ (NumPy/Plotly) chỉ
+# được import trong nhánh dùng đến, như pandas: lần chạy đầu chỉ nạp phần cần.
 
 # --- PAGE CONFIG ---
 st.set_page_config(
@@ -12,290 +25,197 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# --- PROFILING (?profile=1 hoặc công tắc "Chẩn đoán hiệu năng" ở sidebar) ---
+PROFILE_DIR = os.environ.get("UKC_PROFILE_DIR", os.path.join(".ukc_cache", "profile"))
+PROFILE_DEFAULT = st.query_params.get("profile") == "1"
+timer = StageTimer(enabled=st.session_state.get("profile_enabled", PROFILE_DEFAULT),
+                   profile=st.session_state.get("profile_cprofile", False))
+
 # =============================================================================
-# MARITIME DARK THEME (Custom CSS)
-# =============================================================================
-st.markdown("""
-<style>
-/* === GOOGLE FONTS === */
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
-
-/* === MAIN BACKGROUND === */
-.stApp {
-    background: linear-gradient(135deg, #0a1628 0%, #0d1f3c 40%, #0a1a30 100%);
-    font-family: 'Inter', sans-serif;
-}
-
-/* === HEADER === */
-.main-header {
-    background: linear-gradient(135deg, #0d2137 0%, #132d4a 50%, #0d2137 100%);
-    border: 1px solid rgba(0, 212, 170, 0.15);
-    border-radius: 16px;
-    padding: 24px 32px;
-    margin-bottom: 24px;
-    position: relative;
-    overflow: hidden;
-}
-.main-header::before {
-    content: '';
-    position: absolute;
-    top: 0; left: 0; right: 0;
-    height: 3px;
-    background: linear-gradient(90deg, #00d4aa, #0099ff, #00d4aa);
-}
-.main-header h1 {
-    color: #e8f4f8;
-    font-size: 28px;
-    font-weight: 700;
-    margin: 0 0 6px 0;
-    letter-spacing: -0.5px;
-}
-.main-header .subtitle {
-    color: #7eb8c9;
-    font-size: 14px;
-    font-weight: 400;
-    letter-spacing: 0.3px;
-}
-
-/* === STATUS BANNER === */
-.status-safe {
-    background: linear-gradient(135deg, rgba(0, 212, 170, 0.12) 0%, rgba(0, 180, 140, 0.08) 100%);
-    border: 1px solid rgba(0, 212, 170, 0.3);
-    border-radius: 12px;
-    padding: 14px 20px;
-    color: #00d4aa;
-    font-weight: 600;
-    font-size: 15px;
-    margin-bottom: 20px;
-}
-.status-danger {
-    background: linear-gradient(135deg, rgba(255, 82, 82, 0.12) 0%, rgba(200, 50, 50, 0.08) 100%);
-    border: 1px solid rgba(255, 82, 82, 0.3);
-    border-radius: 12px;
-    padding: 14px 20px;
-    color: #ff5252;
-    font-weight: 600;
-    font-size: 15px;
-    margin-bottom: 20px;
-}
-
-/* === METRIC CARDS === */
-.metric-card {
-    background: linear-gradient(135deg, #112240 0%, #0d1b2e 100%);
-    border: 1px solid rgba(0, 153, 255, 0.15);
-    border-radius: 12px;
-    padding: 18px 20px;
-    text-align: center;
-    transition: all 0.3s ease;
-}
-.metric-card:hover {
-    border-color: rgba(0, 212, 170, 0.4);
-    transform: translateY(-2px);
-    box-shadow: 0 8px 25px rgba(0, 212, 170, 0.1);
-}
-.metric-card .label {
-    color: #5a8a9e;
-    font-size: 12px;
-    font-weight: 500;
-    text-transform: uppercase;
-    letter-spacing: 1px;
-    margin-bottom: 8px;
-}
-.metric-card .value {
-    color: #e8f4f8;
-    font-size: 26px;
-    font-weight: 700;
-}
-.metric-card .value.safe { color: #00d4aa; }
-.metric-card .value.danger { color: #ff5252; }
-.metric-card .value.info { color: #0099ff; }
-
-/* === CHART SECTION === */
-.chart-section {
-    background: linear-gradient(135deg, #0d1e33 0%, #0a1628 100%);
-    border: 1px solid rgba(0, 153, 255, 0.1);
-    border-radius: 14px;
-    padding: 20px 24px;
-    margin-bottom: 20px;
-}
-.chart-title {
-    color: #b8d4e3;
-    font-size: 16px;
-    font-weight: 600;
-    margin-bottom: 12px;
-    padding-left: 4px;
-    border-left: 3px solid #0099ff;
-    padding-left: 12px;
-}
-
-/* === SIDEBAR === */
-section[data-testid="stSidebar"] {
-    background: linear-gradient(180deg, #0a1628 0%, #0d1f3c 50%, #0a1628 100%);
-    border-right: 1px solid rgba(0, 153, 255, 0.15);
-}
-section[data-testid="stSidebar"] .stMarkdown h1,
-section[data-testid="stSidebar"] .stMarkdown h2 {
-    color: #7eb8c9 !important;
-    font-size: 16px !important;
-    font-weight: 600 !important;
-    letter-spacing: 0.5px;
-}
-
-/* === EXPANDER === */
-.streamlit-expanderHeader {
-    background: rgba(13, 31, 60, 0.6) !important;
-    border: 1px solid rgba(0, 153, 255, 0.15) !important;
-    border-radius: 10px !important;
-    color: #b8d4e3 !important;
-}
-
-/* === DATA TABLE === */
-.stDataFrame {
-    border-radius: 10px;
-    overflow: hidden;
-}
-
-/* === DIVIDER === */
-hr {
-    border-color: rgba(0, 153, 255, 0.1) !important;
-    margin: 24px 0 !important;
-}
-
-/* === FOOTER === */
-.footer-info {
-    background: rgba(13, 31, 60, 0.5);
-    border: 1px solid rgba(0, 153, 255, 0.1);
-    border-radius: 10px;
-    padding: 14px 20px;
-    color: #5a8a9e;
-    font-size: 13px;
-    text-align: center;
-}
-
-/* Hide default Streamlit elements for cleaner look */
-#MainMenu {visibility: hidden;}
-footer {visibility: hidden;}
-header {visibility: hidden;}
-.stDeployButton {display: none;}
-
-/* Streamlit native metrics styling */
-[data-testid="stMetricValue"] {
-    color: #e8f4f8 !important;
-    font-family: 'Inter', sans-serif !important;
-}
-[data-testid="stMetricLabel"] {
-    color: #5a8a9e !important;
-}
-</style>
-""", unsafe_allow_html=True)
+# MARITIME DARK THEME (static/theme.css)
+# =============================================================================
+# CSS được đọc & rút gọn một lần mỗi tiến trình. Phông Inter tự phục vụ từ
+# static/fonts/Inter.woff2 (server.enableStaticServing, trình duyệt cache lâu
+# dài nhờ ?v=) nếu có, nếu không thì vẫn tải từ Google Fonts như trước.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+GOOGLE_FONTS_URL = "https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap"
+
+@st.cache_resource
+def theme_html():
+    with open(os.path.join(STATIC_DIR, "theme.css"), encoding="utf-8") as fh:
+        css = re.sub(r"\s*([{};:,>])\s*", r"\1", re.sub(r"/\*.*?\*/", "", fh.read(), flags=re.S))
+    css = re.sub(r"\s+", " ", css).strip()
+    font_path = os.path.join(STATIC_DIR, "fonts", "Inter.woff2")
+    if os.path.exists(font_path) and st.get_option("server.enableStaticServing"):
+        version = int(os.path.getmtime(font_path))
+        css = ("@font-face{font-family:'Inter';font-style:normal;font-weight:300 800;"
+               f"font-display:swap;src:url('app/static/fonts/Inter.woff2?v={version}') "
+               "format('woff2')}" + css)
+    else:
+        css = f"@import url('{GOOGLE_FONTS_URL}');" + css
+    return f"<style>{css}</style>"
+
+st.markdown(theme_html(), unsafe_allow_html=True)
 
 # =============================================================================
-# MARITIME COLOR PALETTE (for charts)
-# =============================================================================
-COLORS = {
-    "ocean":       "#0099ff",   # Xanh biển chính
-    "teal":        "#00d4aa",   # Xanh ngọc (safe/positive)
-    "coral":       "#ff5252",   # Đỏ san hô (danger)
-    "amber":       "#ffb74d",   # Cam hổ phách (warning/required)
-    "navy_bg":     "#0a1628",   # Nền tối navy
-    "navy_card":   "#0d1e33",   # Nền card
-    "navy_light":  "#132d4a",   # Navy nhạt
-    "text_primary":"#e8f4f8",   # Chữ chính
-    "text_muted":  "#5a8a9e",   # Chữ phụ
-    "grid":        "rgba(0, 153, 255, 0.06)",  # Grid lines
-    "gridline":    "rgba(0, 153, 255, 0.08)",
-}
-
-# Plotly chart template
-CHART_LAYOUT = dict(
-    paper_bgcolor='rgba(0,0,0,0)',
-    plot_bgcolor='rgba(10, 22, 40, 0.5)',
-    font=dict(family='Inter', color=COLORS["text_muted"], size=12),
-    margin=dict(l=50, r=20, t=10, b=45),
-    legend=dict(
-        bgcolor='rgba(13, 30, 51, 0.8)',
-        bordercolor='rgba(0, 153, 255, 0.15)',
-        borderwidth=1,
-        font=dict(color=COLORS["text_primary"], size=11),
-        x=0.01, y=0.99
-    ),
-    xaxis=dict(
-        gridcolor=COLORS["gridline"],
-        zerolinecolor=COLORS["gridline"],
-        title_font=dict(color=COLORS["text_muted"], size=12),
-        tickfont=dict(color=COLORS["text_muted"], size=10),
-    ),
-    yaxis=dict(
-        gridcolor=COLORS["gridline"],
-        zerolinecolor=COLORS["gridline"],
-        title_font=dict(color=COLORS["text_muted"], size=12),
-        tickfont=dict(color=COLORS["text_muted"], size=10),
-    ),
-    hoverlabel=dict(
-        bgcolor=COLORS["navy_light"],
-        font_size=13,
-        font_family='Inter',
-        bordercolor=COLORS["ocean"]
-    ),
-)
+# TIDE SOURCES (giá trị mặc định & bảng mẫu: ukc/defaults.py)
+# =============================================================================
+# Nguồn thủy triều: bảng mẫu Excel (lặp lại) hoặc dự báo từ hằng số điều hòa
+# hoặc bảng thủy triều nhị phân (ukc/tide_store.py, mở bằng memmap)
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+TIDE_TABLE = "Bảng mẫu Excel (48h, lặp lại)"
+TIDE_HARMONIC = "Dự báo điều hòa"
+TIDE_FILE = "Bảng thủy triều (file)"
+CONSTITUENTS_PATH = os.path.join(DATA_DIR, "namdinhvu_constituents.csv")
+TIDE_STORE_PATH = os.environ.get("UKC_TIDE_STORE", os.path.join(DATA_DIR, "namdinhvu_tide.ukt"))
+TIDE_SOURCES = [TIDE_TABLE, TIDE_HARMONIC] + ([TIDE_FILE] if os.path.exists(TIDE_STORE_PATH) else [])
+PORT_UTC_OFFSET_HOURS = 7   # giờ Việt Nam (UTC+7)
+
+@st.cache_resource
+def get_constituents():
+    from ukc.tide import load_constituents
+    return load_constituents(CONSTITUENTS_PATH)
+
+@st.cache_resource
+def get_tide_store():
+    from ukc.tide_store import TideStore
+    return TideStore(TIDE_STORE_PATH)
+
+def tide_start_utc(tide_start):
+    import numpy as np
+    return np.datetime64(tide_start) - np.timedelta64(PORT_UTC_OFFSET_HOURS, "h")
+
+def build_tide(tide_source, tide_start, total_hours, step_minutes=60):
+    n = int(round(total_hours * 60 / step_minutes))
+    if tide_source == TIDE_HARMONIC:
+        from ukc.tide import predict_range
+        _, levels = predict_range(get_constituents(), tide_start_utc(tide_start), total_hours,
+                                  step_minutes)
+        return [round(w, 2) for w in levels.tolist()]
+    if tide_source == TIDE_FILE:
+        import numpy as np
+        store = get_tide_store()
+        start, every = tide_start_utc(tide_start), store.stride(np.timedelta64(step_minutes, "m"))
+        gaps = store.missing(start, n, every)
+        if gaps.size:   # ô trống trong bảng (CSV thiếu mốc) → NaN
+            raise ValueError(f"Bảng thủy triều thiếu {gaps.size} mốc trong khoảng tính "
+                             f"(đầu tiên: mốc thứ {gaps[0]} kể từ {tide_start}).")
+        return round_values(store.window(start, n, every))
+    return default_tide(total_hours, step_minutes)
 
 # =============================================================================
-# DEFAULTS (từ Excel gốc)
-# =============================================================================
-DEFAULTS = {
-    "vessel_name": "NORDSPRING", "imo": "9625346",
-    "port": "Namdinhvu Port", "cargo_type": "Container",
-    "loa": 208.0, "bt": 29.8, "tkt1": 9.5, "tkt2": 9.0, "dwt": 34800,
-    "import_cont": 350, "export_cont": 364,
-    "crane_rate": 28, "cranes": 2, "spare_cranes": 1,
-    "aux_time": 1.0, "wait_time": 2.25, "draft_change_rate": 0.28,
-    "bottom_elevation": -9.50, "op_water_level": 2.25, "total_hours": 48,
-}
-
-DEFAULT_TIDE = [
-    2.8, 3.1, 3.3, 3.5, 3.5, 3.4, 3.2, 2.9, 2.6, 2.2,
-    1.8, 1.5, 1.2, 1.0, 0.8, 0.7, 0.6, 0.5, 0.6, 0.8,
-    1.0, 1.4, 1.8, 2.2, 2.6, 2.9, 3.2, 3.4, 3.5, 3.4,
-    3.3, 3.1, 2.8, 2.5, 2.1, 1.8, 1.6, 1.3, 1.2, 1.0,
-    0.9, 0.7, 0.6, 0.6, 0.7, 0.8, 0.9, 1.2,
-]
+# BERTH BATHYMETRY (ukc/bathymetry.py, raster mở bằng memmap)
+# =============================================================================
+# Bản đồ khảo sát khu nước trước bến thay cho một cao độ đáy duy nhất: cao độ
+# khống chế là điểm nông nhất dưới thân tàu tại vị trí neo cập. Khảo sát cập
+# nhật hàng tháng: mtime nằm trong khóa cache nên file mới được nạp lại.
+BATHYMETRY_PATH = os.environ.get("UKC_BATHYMETRY", os.path.join(DATA_DIR, "namdinhvu_berth.ukb"))
+BOTTOM_MANUAL = "Nhập tay"
+BOTTOM_RASTER = "Bản đồ khảo sát (raster)"
+BOTTOM_SOURCES = [BOTTOM_MANUAL] + ([BOTTOM_RASTER] if os.path.exists(BATHYMETRY_PATH) else [])
+
+@st.cache_resource(max_entries=2)
+def get_berth_raster(path, mtime):
+    from ukc.bathymetry import BerthRaster
+    return BerthRaster(path)
 
 # =============================================================================
-# CALCULATION ENGINE
-# =============================================================================
-def calculate_tkt_series(tkt1, unload_time, load_time, wait_time, aux_time,
-                          draft_change_rate, total_hours, berth_time):
-    tkt = []
-    t_phase_a_end = wait_time + aux_time / 2
-    t_phase_b_end = t_phase_a_end + unload_time
-    t_phase_c_start = t_phase_b_end
-    t_phase_c_end = t_phase_c_start + load_time
-    tkt_min = tkt1 - (unload_time * draft_change_rate)
-    
-    for h in range(total_hours):
-        t = float(h)
-        if t < t_phase_a_end:
-            tkt.append(round(tkt1, 2))
-        elif t < t_phase_b_end:
-            elapsed = t - t_phase_a_end
-            tkt.append(round(tkt1 - (elapsed * draft_change_rate), 2))
-        elif t < t_phase_c_end:
-            elapsed = t - t_phase_c_start
-            tkt.append(round(tkt_min + (elapsed * draft_change_rate), 2))
-        else:
-            tkt_final = tkt_min + (load_time * draft_change_rate)
-            tkt.append(round(tkt_final, 2))
-    return tkt
-
-def calculate_ukc(tide_list, tkt_list, bottom):
-    return [round((w + abs(bottom)) - t, 2) for w, t in zip(tide_list, tkt_list)]
-
-def calculate_ukc_required(tide_list, tkt_list, bottom, berth_time, total_hours):
-    ukc_req = []
-    for h in range(total_hours):
-        req = 0.1 * tkt_list[h] if h < berth_time else 0.2 * tkt_list[h]
-        ukc_req.append(round(req, 2))
-    return ukc_req
+# LIVE TIDE GAUGE (ukc/gauge.py)
+# =============================================================================
+# Một luồng asyncio cho mỗi tiến trình nhận số liệu trạm triều vào bộ đệm vòng;
+# mọi phiên đọc chung bộ đệm. Panel thực đo là một fragment tự làm mới, chỉ
+# tính phần đuôi UKC có số liệu mới, không chạy lại toàn bộ app.py.
+GAUGE_ADDRESS = os.environ.get("UKC_GAUGE", DEFAULT_GAUGE)
+LIVE_REFRESH_SECONDS = 15
+
+@st.cache_resource
+def get_gauge_feed(address):
+    from ukc.gauge import GaugeFeed
+    return GaugeFeed(address).start()
+
+# =============================================================================
+# CACHES & SCENARIO STORE
+# =============================================================================
+# Khóa cache chỉ gồm các tham số ảnh hưởng tới kết quả: đổi tên tàu, IMO,
+# loại hàng, LOA... không tính lại và không vẽ lại biểu đồ.
+CACHE_MAX_ENTRIES = 256
+CACHE_TTL = 3600   # giây (chuỗi "1h" khiến Streamlit phải nạp pandas để đọc)
+
+# Kho kết quả dùng chung giữa các replica / batch job (SQLite). Đặt
+# UKC_STORE_PATH="" để tắt.
+STORE_PATH = os.environ.get("UKC_STORE_PATH", os.path.join(".ukc_cache", "scenarios.sqlite"))
+
+@st.cache_resource
+def get_scenario_store():
+    return ScenarioStore(STORE_PATH) if STORE_PATH else None
+
+# Kịch bản và biểu đồ dùng chung giữa các phiên trong tiến trình (LRU, có TTL);
+# st.plotly_chart chỉ đọc hình nên chia sẻ được.
+@st.cache_resource
+def get_shared_cache():
+    return SharedCache(CACHE_MAX_ENTRIES, CACHE_TTL)
+
+# Monte Carlo: theo giờ, trên cùng nguồn thủy triều (bước phút không áp dụng)
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def compute_monte_carlo(tide_source, tide_start, tkt1, import_cont, export_cont, crane_rate, cranes,
+                        wait_time, aux_time, draft_change, bottom, total_hours, n_samples,
+                        distribution, sd_crane, sd_wait, sd_draft, tide_sigma, tide_corr):
+    from ukc.montecarlo import monte_carlo
+    return monte_carlo(build_tide(tide_source, tide_start, total_hours), tkt1, import_cont,
+                       export_cont, crane_rate, cranes, wait_time, aux_time, draft_change, bottom,
+                       n_samples=n_samples, distribution=distribution,
+                       spread={"crane_rate": sd_crane, "wait_time": sd_wait,
+                               "draft_change_rate": sd_draft},
+                       tide_sigma=tide_sigma, tide_correlation=tide_corr)
+
+
+# =============================================================================
+# CALCULATION GRAPH
+# =============================================================================
+# Đồ thị tính toán theo phiên (ukc/graph.py): mỗi nút chỉ tính lại khi đầu vào
+# của nó thay đổi — đổi cao độ đáy không tính lại mớn nước hay thủy triều.
+# Mỗi phiên chỉ giữ giá trị hiện tại; kịch bản và biểu đồ (shared=True) lấy từ
+# cache chung giới hạn CACHE_MAX_ENTRIES / CACHE_TTL, nên phiên sau dùng lại.
+def slack_index(t, tide, scenario):
+    from ukc.slack import SlackIndex
+    return SlackIndex(t, scenario["ukc_actual"], scenario["ukc_req"], tide)
+
+def build_graph(store, cache):
+    from charts import (figure_draft_ukc, figure_monte_carlo, figure_overview, figure_ukc_area,
+                        figure_ukc_bars)
+
+    graph = ukc_graph(store, cache)
+    graph.add("hours", lambda total_hours, step_minutes, t:
+              list(range(total_hours)) if step_minutes == 60 else t.tolist(),
+              ("total_hours", "step_minutes", "t"))
+    for name in ("tkt_series", "ukc_actual", "ukc_req"):
+        graph.add(f"{name}_list", lambda scenario, name=name: list(map(float, scenario[name])),
+                  ("scenario",))
+    graph.add("exact_results", lambda scenario: {k[len("exact_"):]: v for k, v in scenario.items()
+                                                 if k.startswith("exact_")}, ("scenario",))
+    graph.add("ukc_min", lambda scenario: (scenario["min_ukc"], scenario["min_ukc_time"]),
+              ("scenario",))
+    graph.add("slack_index", slack_index, ("t", "tide", "scenario"))
+    graph.add("keel_line", lambda tide, tkt_series: [w - t for w, t in zip(tide, tkt_series)],
+              ("tide", "tkt_series_list"))
+    graph.add("keep", critical_indices, ("ukc_actual_list", "ukc_req_list"))
+    graph.add("fig1", lambda hours, ukc_actual, ukc_req, keep, ukc_min:
+              figure_ukc_area(hours, ukc_actual, ukc_req, keep, *ukc_min),
+              ("hours", "ukc_actual_list", "ukc_req_list", "keep", "ukc_min"), shared=True)
+    graph.add("fig2", figure_overview, ("hours", "tide", "keel_line", "bottom"), shared=True)
+    graph.add("fig3", figure_ukc_bars, ("hours", "ukc_actual_list", "ukc_req_list", "keep"),
+              shared=True)
+    graph.add("fig4", figure_draft_ukc,
+              ("hours", "tkt_series_list", "ukc_actual_list", "ukc_req_list", "keep"), shared=True)
+    graph.add("fig1_mc", figure_monte_carlo, ("fig1", "mc"))
+    return graph
+
+def get_graph():
+    if "ukc_graph" not in st.session_state:
+        st.session_state["ukc_graph"] = build_graph(get_scenario_store(), get_shared_cache())
+    return st.session_state["ukc_graph"]
+
+timer.lap("setup")
 
 # =============================================================================
 # SIDEBAR
@@ -331,16 +251,17 @@ with col_o1:
 with col_o2:
     cranes = st.sidebar.number_input("Số cẩu", value=DEFAULTS["cranes"], step=1, min_value=1)
 
-throughput = crane_rate * cranes
-unload_time = round(import_cont / throughput, 2) if throughput > 0 else 0
-load_time = round(export_cont / throughput, 2) if throughput > 0 else 0
-
 aux_time = st.sidebar.number_input("Thao tác phụ (h)", value=DEFAULTS["aux_time"], step=0.25)
 wait_time = st.sidebar.number_input("Thời gian chờ (h)", value=DEFAULTS["wait_time"], step=0.25)
 draft_change = st.sidebar.number_input("ΔTkt /h (m)", value=DEFAULTS["draft_change_rate"], step=0.01, format="%.4f",
                                         help="Mớn nước khai thác thay đổi mỗi giờ")
 
-berth_time = round(wait_time + aux_time + unload_time + load_time, 2)
+graph = get_graph()
+graph.reset_stats()
+graph.set(import_cont=import_cont, export_cont=export_cont, crane_rate=crane_rate, cranes=cranes,
+          wait_time=wait_time, aux_time=aux_time, draft_change=draft_change)
+throughput, unload_time, load_time, berth_time = (
+    graph[k] for k in ("throughput", "unload_time", "load_time", "berth_time"))
 
 st.sidebar.markdown("---")
 st.sidebar.markdown("📐 **Kết quả tính toán:**")
@@ -357,34 +278,116 @@ st.sidebar.markdown(f"""
 
 st.sidebar.markdown("---")
 st.sidebar.header("🌊 IV. Cảng & Luồng")
-bottom = st.sidebar.number_input("Cao độ đáy (m, HĐ)", value=DEFAULTS["bottom_elevation"], step=0.1, format="%.2f")
+bottom = None
+bottom_source = (st.sidebar.selectbox("Nguồn cao độ đáy", BOTTOM_SOURCES)
+                 if len(BOTTOM_SOURCES) > 1 else BOTTOM_MANUAL)
+if bottom_source == BOTTOM_RASTER:
+    raster = get_berth_raster(BATHYMETRY_PATH, os.path.getmtime(BATHYMETRY_PATH))
+    x_min, x_max, _, _ = raster.extent
+    col_b1, col_b2 = st.sidebar.columns(2)
+    with col_b1:
+        berth_position = st.sidebar.number_input("Vị trí đuôi tàu (m dọc bến)", value=x_min, step=5.0,
+                                                 min_value=x_min, max_value=max(x_min, x_max - loa))
+    with col_b2:
+        beam = st.sidebar.number_input("B (m)", value=DEFAULTS["bt"], step=0.1, format="%.1f")
+    berth_offset = st.sidebar.number_input("Cách mép bến (m)", value=0.0, step=0.5, min_value=0.0)
+    try:
+        cell = raster.controlling_cell(berth_position, loa, beam, berth_offset)
+    except ValueError as exc:
+        st.sidebar.error(f"Không lấy được cao độ từ bản đồ: {exc}")
+    else:
+        bottom = round(cell["bottom"], 2)
+        st.sidebar.caption(f"Cao độ đáy khống chế **{bottom:.2f} m** tại x = {cell['x']:.1f} m, "
+                           f"cách mép bến {cell['y']:.1f} m")
+if bottom is None:
+    bottom = st.sidebar.number_input("Cao độ đáy (m, HĐ)", value=DEFAULTS["bottom_elevation"], step=0.1, format="%.2f")
 op_water = st.sidebar.number_input("MN khai thác (m)", value=DEFAULTS["op_water_level"], step=0.1, format="%.2f")
-total_hours = st.sidebar.number_input("Tổng giờ mô phỏng", value=DEFAULTS["total_hours"], step=1, min_value=10, max_value=96)
+total_hours = st.sidebar.number_input("Tổng giờ mô phỏng", value=DEFAULTS["total_hours"], step=1, min_value=10, max_value=744)
+step_minutes = st.sidebar.selectbox("Bước thời gian", STEP_MINUTES, format_func=lambda m: f"{m} phút",
+                                    help="Bước nhỏ hơn 1 giờ: bảng mẫu được nội suy tuyến tính")
+tide_source = st.sidebar.selectbox("Nguồn thủy triều", TIDE_SOURCES,
+                                   help="Dự báo điều hòa dùng hằng số trong data/namdinhvu_constituents.csv")
+live_enabled = st.sidebar.toggle("📡 Mực nước thực đo (trạm triều)", value=False,
+                                 help=f"Nhận số liệu trạm triều từ {GAUGE_ADDRESS} (biến môi trường UKC_GAUGE)")
+tide_start = None
+if tide_source in (TIDE_HARMONIC, TIDE_FILE):
+    col_t1, col_t2 = st.sidebar.columns(2)
+    with col_t1:
+        tide_date = st.sidebar.date_input("Ngày bắt đầu", value=datetime.date.today())
+    with col_t2:
+        tide_hour = st.sidebar.number_input("Giờ bắt đầu", value=0, step=1, min_value=0, max_value=23)
+    tide_start = f"{tide_date.isoformat()}T{tide_hour:02d}:00"
+if tide_source == TIDE_FILE:
+    import numpy as np
+    tide_store = get_tide_store()
+    try:
+        tide_every = tide_store.stride(np.timedelta64(step_minutes, "m"))
+    except ValueError:
+        st.error(f"Bảng thủy triều có bước {tide_store.step}, không dùng được bước {step_minutes} phút.")
+        st.stop()
+    if not tide_store.covers(tide_start_utc(tide_start), total_hours * 60 // step_minutes,
+                             every=tide_every):
+        st.error(f"Bảng thủy triều chỉ có dữ liệu từ {tide_store.start} đến {tide_store.end} (UTC).")
+        st.stop()
+
+st.sidebar.markdown("---")
+st.sidebar.header("🎲 V. Bất định (Monte Carlo)")
+mc_enabled = st.sidebar.checkbox("Bật mô phỏng Monte Carlo", value=False,
+                                 help="Lấy mẫu công suất cẩu, TG chờ, ΔTkt và sai số dự báo triều")
+if mc_enabled:
+    from ukc.montecarlo import DISTRIBUTIONS
+    col_m1, col_m2 = st.sidebar.columns(2)
+    with col_m1:
+        mc_samples = st.sidebar.selectbox("Số mẫu", [10_000, 50_000, 100_000],
+                                          format_func=lambda n: f"{n:,}")
+        sd_crane = st.sidebar.number_input("σ công suất (cont/h)", value=3.0, step=0.5, min_value=0.0)
+        sd_draft = st.sidebar.number_input("σ ΔTkt /h (m)", value=0.02, step=0.01, min_value=0.0,
+                                           format="%.3f")
+        tide_corr = st.sidebar.number_input("Tương quan sai số triều", value=0.9, step=0.05,
+                                            min_value=0.0, max_value=0.99)
+    with col_m2:
+        mc_distribution = st.sidebar.selectbox("Phân phối", DISTRIBUTIONS,
+                                               help="σ là độ lệch chuẩn (normal) hoặc nửa biên độ")
+        sd_wait = st.sidebar.number_input("σ TG chờ (h)", value=0.5, step=0.25, min_value=0.0)
+        tide_sigma = st.sidebar.number_input("σ sai số triều (m)", value=0.10, step=0.05,
+                                             min_value=0.0, format="%.2f")
+
+st.sidebar.markdown("---")
+with st.sidebar.expander("🛠️ Chẩn đoán hiệu năng"):
+    st.checkbox("⏱️ Đo thời gian từng bước", value=PROFILE_DEFAULT, key="profile_enabled")
+    if st.session_state["profile_enabled"]:
+        st.checkbox("Ghi log JSONL", key="profile_log",
+                    help=f"Ghi thêm vào {os.path.join(PROFILE_DIR, 'timings.jsonl')}")
+        st.checkbox("Ghi cProfile (.prof)", key="profile_cprofile",
+                    help=f"Mỗi lần chạy một file trong {PROFILE_DIR}")
 
 st.sidebar.markdown("---")
 if st.sidebar.button("🔄 Reset tất cả về mặc định", use_container_width=True):
     st.rerun()
+timer.lap("sidebar")
 
 # =============================================================================
 # CALCULATIONS
 # =============================================================================
-hours = list(range(total_hours))
-
-tide_data = DEFAULT_TIDE.copy()
-while len(tide_data) < total_hours:
-    tide_data.extend(DEFAULT_TIDE)
-tide_data = tide_data[:total_hours]
-
-tkt_series = calculate_tkt_series(tkt1, unload_time, load_time, wait_time, aux_time,
-                                   draft_change, total_hours, berth_time)
-ukc_actual = calculate_ukc(tide_data, tkt_series, bottom)
-ukc_req = calculate_ukc_required(tide_data, tkt_series, bottom, berth_time, total_hours)
-cd_ukc_actual = [bottom + u for u in ukc_actual]
-keel_line = [w - t for w, t in zip(tide_data, tkt_series)]
-
-min_ukc = min(ukc_actual)
-max_ukc = max(ukc_actual)
-violations = sum(1 for a, r in zip(ukc_actual, ukc_req) if a < r)
+with timer.stage("tide"):
+    try:
+        graph.set(tide=build_tide(tide_source, tide_start, total_hours, step_minutes))
+    except ValueError as exc:
+        st.error(str(exc))
+        st.stop()
+graph.set(tkt1=tkt1, bottom=bottom, total_hours=total_hours, step_minutes=step_minutes)
+with timer.stage("engine"):
+    scenario = graph["scenario"]
+hours = graph["hours"]
+tide_data = graph["tide"]
+tkt_series = graph["tkt_series_list"]
+ukc_actual = graph["ukc_actual_list"]
+ukc_req = graph["ukc_req_list"]
+min_ukc = scenario["min_ukc"]
+max_ukc = scenario["max_ukc"]
+violations = scenario["violations"]
+violation_hours = scenario["violation_hours"]
+exact = graph["exact_results"]
 
 # =============================================================================
 # HEADER
@@ -403,18 +406,26 @@ st.markdown(f"""
 # =============================================================================
 # STATUS BANNER
 # =============================================================================
-if violations == 0:
+if violations == 0 and exact["violation_hours"] == 0:
     st.markdown(f"""
     <div class="status-safe">
         ✅ AN TOÀN — UKC min ({min_ukc:.2f}m) luôn ≥ UKC yêu cầu trong toàn bộ {total_hours} giờ
         &nbsp;&nbsp;|&nbsp;&nbsp; Tổng hàng: {import_cont + export_cont} cont
         &nbsp;&nbsp;|&nbsp;&nbsp; Thời gian tại cầu: {berth_time:.1f}h
     </div>""", unsafe_allow_html=True)
+elif violations == 0:
+    st.markdown(f"""
+    <div class="status-danger">
+        ❌ CẢNH BÁO — UKC giảm dưới yêu cầu giữa các mốc giờ: {len(exact["intervals"])} khoảng,
+        tổng {exact["violation_hours"]:.2f}h
+        &nbsp;&nbsp;|&nbsp;&nbsp; UKC min thực: {exact["min_ukc"]:.2f}m lúc {exact["min_ukc_time"]:.2f}h
+    </div>""", unsafe_allow_html=True)
 else:
     st.markdown(f"""
     <div class="status-danger">
-        ❌ CẢNH BÁO — Có {violations}/{total_hours} giờ UKC thực tế < UKC yêu cầu!
+        ❌ CẢNH BÁO — Có {violation_hours:g}/{total_hours} giờ UKC thực tế < UKC yêu cầu!
         &nbsp;&nbsp;|&nbsp;&nbsp; UKC min: {min_ukc:.2f}m
+        &nbsp;&nbsp;|&nbsp;&nbsp; Vi phạm liên tục: {exact["violation_hours"]:.2f}h
         &nbsp;&nbsp;|&nbsp;&nbsp; Cần kiểm tra lại thông số!
     </div>""", unsafe_allow_html=True)
 
@@ -427,7 +438,7 @@ metrics = [
     ("UKC MAX", f"{max_ukc:.2f} m", "safe"),
     ("CAO ĐỘ ĐÁY", f"{bottom:.2f} m", "info"),
     ("CÔNG SUẤT", f"{throughput} c/h", "info"),
-    ("VI PHẠM", f"{violations}/{total_hours}", "danger" if violations > 0 else "safe"),
+    ("VI PHẠM", f"{violation_hours:g}/{total_hours}", "danger" if violations > 0 else "safe"),
 ]
 for col, (label, value, style) in zip(cols, metrics):
     with col:
@@ -439,77 +450,115 @@ for col, (label, value, style) in zip(cols, metrics):
 
 st.markdown("<br>", unsafe_allow_html=True)
 
+# =============================================================================
+# LIVE GAUGE PANEL (fragment, refreshed every LIVE_REFRESH_SECONDS)
+# =============================================================================
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def live_panel(anchor, t, tide, draft, ukc_req, bottom):
+    import plotly.graph_objects as go
+
+    from charts import CHART_LAYOUT, COLORS, line_trace
+    from ukc.gauge import LiveUKC
+
+    feed = get_gauge_feed(GAUGE_ADDRESS)
+    live = st.session_state.get("live_ukc")
+    if live is None or not live.matches(anchor, t, draft, ukc_req, bottom):
+        live = st.session_state["live_ukc"] = LiveUKC(anchor, t, draft, ukc_req, bottom)
+    with timer.stage("live"):
+        live.update(feed.buffer)
+    st.markdown("#### 📡 Mực nước thực đo")
+    if not feed.status["connected"]:
+        st.warning(f"Chưa kết nối trạm triều {GAUGE_ADDRESS}: {feed.status['error'] or 'đang kết nối'}. "
+                   f"Trạm mô phỏng: `python -m ukc.gauge serve`")
+    i = live.latest()
+    if i is None:
+        st.info(f"Chưa có số liệu thực đo trong khoảng tính (giờ 0 = {anchor}).")
+        return
+    margin = live.ukc[i] - ukc_req[i]
+    cols = st.columns(4)
+    cards = [
+        (f"THỰC ĐO GIỜ {t[i]:.2f}", f"{live.level[i]:.2f} m", "info"),
+        ("LỆCH DỰ BÁO", f"{live.level[i] - tide[i]:+.2f} m", "info"),
+        ("UKC THỰC ĐO", f"{live.ukc[i]:.2f} m", "safe" if margin >= 0 else "danger"),
+        ("DƯ UKC", f"{margin:+.2f} m", "safe" if margin >= 0 else "danger"),
+    ]
+    for col, (label, value, style) in zip(cols, cards):
+        with col:
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="label">{label}</div>
+                <div class="value {style}">{value}</div>
+            </div>""", unsafe_allow_html=True)
+    fig_live = go.Figure([
+        line_trace(t, tide, name="Dự báo", line=dict(color=COLORS["ocean"], width=1, dash="dot")),
+        line_trace(t[:live.filled], live.level[:live.filled], name="Thực đo",
+                   line=dict(color=COLORS["teal"], width=2)),
+        line_trace(t[:live.filled], live.ukc[:live.filled] - ukc_req[:live.filled], name="Dư UKC",
+                   line=dict(color=COLORS["amber"], width=2)),
+    ])
+    fig_live.add_hline(y=0, line=dict(color=COLORS["coral"], dash="dash", width=1))
+    fig_live.update_layout(**CHART_LAYOUT, height=260, xaxis_title="Giờ", yaxis_title="m")
+    st.plotly_chart(fig_live, use_container_width=True)
+
+if live_enabled:
+    import numpy as np
+    live_panel(tide_start or f"{datetime.date.today().isoformat()}T00:00", graph["t"],
+               np.asarray(tide_data), graph["draft"], graph["ukc_req"], bottom)
+
 # =============================================================================
 # DATA TABLE (Expandable)
 # =============================================================================
+# Nội dung expander luôn được chạy, nên bảng (và pandas) chỉ nạp khi bật
 with st.expander("📝 Xem bảng dữ liệu chi tiết", expanded=False):
-    table_df = pd.DataFrame({
-        "Giờ": hours, "Mực nước (m)": tide_data, "Tkt (m)": tkt_series,
-        "UKC thực tế (m)": ukc_actual, "UKC yêu cầu (m)": ukc_req,
-    })
-    st.dataframe(table_df, use_container_width=True, hide_index=True)
+    if st.toggle("Hiển thị bảng", key="show_table"):
+        with timer.stage("dataframe"):
+            import pandas as pd
+            table_df = pd.DataFrame({
+                "Giờ": hours, "Mực nước (m)": tide_data, "Tkt (m)": tkt_series,
+                "UKC thực tế (m)": ukc_actual, "UKC yêu cầu (m)": ukc_req,
+            })
+        st.dataframe(table_df, use_container_width=True, hide_index=True)
+
+# =============================================================================
+# OPTIONAL PANELS (panels.py, mỗi panel chỉ tính khi bật)
+# =============================================================================
+tide_for = functools.partial(build_tide, tide_source, tide_start)
+berth_window_panel(graph, tide_for)
+safe_limits_panel(graph, timer)
+slack_panel(graph)
+schedule_panel(tide_for, timer)
+transit_panel(graph, timer)
+
+figures = []
+for i in range(1, 5):
+    with timer.stage(f"fig{i}"):
+        figures.append(graph[f"fig{i}"])
+fig1, fig2, fig3, fig4 = figures
 
 # =============================================================================
 # CHART 1: UKC ACTUAL AREA
 # =============================================================================
 st.markdown('<div class="chart-section"><div class="chart-title">📈 BIỂU ĐỒ 1 — Vùng Dự Phòng An Toàn (UKC Area)</div>', unsafe_allow_html=True)
-
-fig1 = go.Figure()
-
-# Danger zone (below required)
-fig1.add_trace(go.Scatter(x=hours, y=ukc_req, mode='lines', name='Vùng nguy hiểm',
-    line=dict(width=0), showlegend=False))
-fig1.add_trace(go.Scatter(x=hours, y=[0]*total_hours, mode='lines', name='Vùng nguy hiểm',
-    line=dict(width=0), fill='tonexty',
-    fillcolor='rgba(255, 82, 82, 0.08)', showlegend=False))
-
-# Safe zone (UKC actual)
-fig1.add_trace(go.Scatter(x=hours, y=ukc_actual, mode='lines', name='UKC Thực tế',
-    line=dict(color=COLORS["teal"], width=2.5, shape='spline'),
-    fill='tozeroy', fillcolor='rgba(0, 212, 170, 0.1)'))
-
-# Required line
-fig1.add_trace(go.Scatter(x=hours, y=ukc_req, mode='lines', name='UKC Yêu cầu',
-    line=dict(color=COLORS["amber"], width=2, dash='dash')))
-
-# Annotations for min/max
-min_idx = ukc_actual.index(min_ukc)
-fig1.add_annotation(x=min_idx, y=min_ukc, text=f"Min: {min_ukc:.2f}m",
-    showarrow=True, arrowhead=2, arrowcolor=COLORS["coral"],
-    font=dict(color=COLORS["coral"], size=11), bgcolor=COLORS["navy_card"],
-    bordercolor=COLORS["coral"], borderwidth=1)
-
-fig1.update_layout(**CHART_LAYOUT, height=320,
-    xaxis_title="Thời gian (giờ)", yaxis_title="UKC (m)")
-st.plotly_chart(fig1, use_container_width=True)
+if mc_enabled:
+    mc_args = (tide_source, tide_start, tkt1, import_cont, export_cont, crane_rate, cranes,
+               wait_time, aux_time, draft_change, bottom, total_hours, mc_samples,
+               mc_distribution, sd_crane, sd_wait, sd_draft, tide_sigma, tide_corr)
+    with timer.stage("monte_carlo"):
+        mc = compute_monte_carlo(*mc_args)
+        graph.set(mc=mc)
+        fig1 = graph["fig1_mc"]
+    st.caption(f"Monte Carlo {mc['n_samples']:,} mẫu — xác suất có giờ vi phạm: "
+               f"**{mc['p_any_violation']:.1%}**, trung bình **{mc['mean_violation_hours']:.1f}** giờ vi phạm")
+with timer.stage("plotly_chart 1"):
+    st.plotly_chart(fig1, use_container_width=True)
 st.markdown('</div>', unsafe_allow_html=True)
 
 # =============================================================================
 # CHART 2: OVERVIEW (Water Level - Keel - Bottom)
 # =============================================================================
 st.markdown('<div class="chart-section"><div class="chart-title">🌊 BIỂU ĐỒ 2 — Tổng Quát (Thủy Triều – Keel – Đáy)</div>', unsafe_allow_html=True)
-
-fig2 = go.Figure()
-
-# Water surface area
-fig2.add_trace(go.Scatter(x=hours, y=tide_data, mode='lines', name='Mực nước',
-    line=dict(color=COLORS["ocean"], width=2, shape='spline'),
-    fill='tozeroy', fillcolor='rgba(0, 153, 255, 0.08)'))
-
-# Keel line
-fig2.add_trace(go.Scatter(x=hours, y=keel_line, mode='lines', name='Keel tàu',
-    line=dict(color=COLORS["coral"], width=2, shape='spline')))
-
-# Seabed
-fig2.add_trace(go.Scatter(x=hours, y=[bottom]*total_hours, mode='lines',
-    name=f'Đáy biển ({bottom:.2f}m)',
-    line=dict(color='#8B6914', width=2.5),
-    fill='tozeroy', fillcolor='rgba(139, 105, 20, 0.1)'))
-
-fig2.update_layout(**CHART_LAYOUT, height=320,
-    xaxis_title="Thời gian (giờ)", yaxis_title="Cao độ (m, HĐ)",
-    yaxis_range=[-12, 5])
-st.plotly_chart(fig2, use_container_width=True)
+with timer.stage("plotly_chart 2"):
+    st.plotly_chart(fig2, use_container_width=True)
 st.markdown('</div>', unsafe_allow_html=True)
 
 # =============================================================================
@@ -520,39 +569,35 @@ col_left, col_right = st.columns(2)
 # --- CHART 3: BAR CHART ---
 with col_left:
     st.markdown('<div class="chart-section"><div class="chart-title">📊 BIỂU ĐỒ 3 — UKC Theo Giờ</div>', unsafe_allow_html=True)
-    
-    bar_colors = [COLORS["coral"] if u < r else COLORS["teal"] for u, r in zip(ukc_actual, ukc_req)]
-    
-    fig3 = go.Figure()
-    fig3.add_trace(go.Bar(x=hours, y=ukc_actual, name='UKC',
-        marker_color=bar_colors, marker_line_width=0, opacity=0.85))
-    fig3.add_trace(go.Scatter(x=hours, y=ukc_req, mode='lines', name='Required',
-        line=dict(color=COLORS["amber"], width=2.5, dash='dash')))
-    
-    fig3.update_layout(**CHART_LAYOUT, height=350,
-        xaxis_title="Giờ", yaxis_title="UKC (m)", bargap=0.12)
-    st.plotly_chart(fig3, use_container_width=True)
+    with timer.stage("plotly_chart 3"):
+        st.plotly_chart(fig3, use_container_width=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
 # --- CHART 4: TKT + UKC ---
 with col_right:
     st.markdown('<div class="chart-section"><div class="chart-title">⚓ BIỂU ĐỒ 4 — Mớn Nước & UKC</div>', unsafe_allow_html=True)
-    
-    fig4 = go.Figure()
-    fig4.add_trace(go.Scatter(x=hours, y=tkt_series, mode='lines+markers',
-        name='Tkt Thực Tế', line=dict(color=COLORS["ocean"], width=2.5, shape='spline'),
-        marker=dict(size=4, color=COLORS["ocean"])))
-    fig4.add_trace(go.Scatter(x=hours, y=ukc_actual, mode='lines',
-        name='UKC Thực Tế', line=dict(color=COLORS["teal"], width=2, shape='spline')))
-    fig4.add_trace(go.Scatter(x=hours, y=ukc_req, mode='lines',
-        name='UKC Required', line=dict(color=COLORS["coral"], width=2, dash='dash')))
-    
-    fig4.update_layout(**CHART_LAYOUT, height=350,
-        xaxis_title="Thời gian (giờ)", yaxis_title="Tkt(m) / UKC(m)",
-        yaxis_range=[0, max(tkt_series) + 1])
-    st.plotly_chart(fig4, use_container_width=True)
+    with timer.stage("plotly_chart 4"):
+        st.plotly_chart(fig4, use_container_width=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
+# =============================================================================
+# PROFILING PANEL (opt-in)
+# =============================================================================
+if timer.enabled:
+    with st.expander("⏱️ Thời gian xử lý từng bước", expanded=True):
+        st.markdown("| Bước | ms | Tỷ lệ |\n|------|---:|------:|\n" + "\n".join(
+            f"| {name} | {ms:.1f} | {share:.0%} |" for name, ms, share in timer.rows())
+            + f"\n| **Tổng** | **{1e3 * timer.total:.1f}** | |")
+        st.caption("Nút tính lại: " + (", ".join(graph.recomputed) or "không có"))
+        if st.session_state.get("profile_log"):
+            timer.write_jsonl(os.path.join(PROFILE_DIR, "timings.jsonl"),
+                              total_hours=total_hours, step_minutes=step_minutes,
+                              recomputed=graph.recomputed)
+        prof_path = timer.stop_profile(
+            os.path.join(PROFILE_DIR, time.strftime("run-%Y%m%d-%H%M%S.prof")))
+        if prof_path:
+            st.caption(f"cProfile: `{prof_path}` (xem bằng `python -m pstats` hoặc snakeviz)")
+
 # =============================================================================
 # FOOTER
 # =============================================================================
@@ -0,0 +1,7 @@
+"""Reproducible benchmarks for the UKC engine and the dashboard page.
+
+Run from the repository root::
+
+    python -m benchmarks.run                  # compare against benchmarks/baseline.json
+    python -m benchmarks.run --save-baseline  # refresh the stored baseline
+"""
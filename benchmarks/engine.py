@@ -0,0 +1,65 @@
+"""Engine benchmark cases: draft, UKC, required UKC and tide construction.
+
+Hourly cases go through the list API the dashboard used originally
+(``calculate_*``); minute cases use the array functions on a 1-minute grid,
+since the list API is hourly only.
+"""
+import os
+
+import numpy as np
+
+from ukc.defaults import DEFAULTS, default_tide
+from ukc.engine import (calculate_tkt_series, calculate_ukc, calculate_ukc_required, draft_curve,
+                        operation_times, round_values, simulate_chunks, summarize_stream,
+                        time_grid, ukc_array, ukc_required_array)
+from ukc.tide import load_constituents, predict_range
+
+HORIZONS = {"48h": 48, "1wk": 168, "1mo": 720, "1yr": 8760}
+STEPS = {"1h": 60, "1m": 1}
+CONSTITUENTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 "data", "namdinhvu_constituents.csv")
+TIDE_START = "2026-01-01T00:00"
+
+
+def _vessel():
+    d = DEFAULTS
+    _, unload_time, load_time, berth_time = (v.item() for v in operation_times(
+        d["import_cont"], d["export_cont"], d["crane_rate"], d["cranes"], d["wait_time"],
+        d["aux_time"]))
+    return (d["tkt1"], unload_time, load_time, d["wait_time"], d["aux_time"],
+            d["draft_change_rate"]), berth_time
+
+
+def cases(horizons=HORIZONS, steps=STEPS):
+    """Yield ``(name, func)`` pairs; every ``func`` takes no arguments."""
+    params, berth_time = _vessel()
+    bottom = DEFAULTS["bottom_elevation"]
+    constituents = load_constituents(CONSTITUENTS_PATH)
+
+    for h_name, hours in horizons.items():
+        for s_name, step in steps.items():
+            tag = f"{s_name}.{h_name}"
+            tide = default_tide(hours, step)
+            yield f"engine.tide_table.{tag}", lambda h=hours, s=step: default_tide(h, s)
+            yield (f"engine.tide_harmonic.{tag}",
+                   lambda h=hours, s=step: predict_range(constituents, TIDE_START, h, s))
+            if step == 60:
+                tkt = calculate_tkt_series(*params, hours, berth_time)
+                yield (f"engine.tkt_series.{tag}",
+                       lambda h=hours: calculate_tkt_series(*params, h, berth_time))
+                yield (f"engine.ukc.{tag}",
+                       lambda tide=tide, tkt=tkt: calculate_ukc(tide, tkt, bottom))
+                yield (f"engine.ukc_required.{tag}",
+                       lambda tide=tide, tkt=tkt, h=hours:
+                       calculate_ukc_required(tide, tkt, bottom, berth_time, h))
+            else:
+                t = time_grid(hours, step)
+                water = np.asarray(tide)
+                tkt = round_values(draft_curve(t, *params))
+                yield f"engine.tkt_series.{tag}", lambda t=t: round_values(draft_curve(t, *params))
+                yield f"engine.ukc.{tag}", lambda w=water, tkt=tkt: ukc_array(w, tkt, bottom)
+                yield (f"engine.ukc_required.{tag}",
+                       lambda tkt=tkt, t=t: ukc_required_array(tkt, berth_time, t=t))
+            yield (f"engine.stream.{tag}",
+                   lambda tide=tide, h=hours, s=step: summarize_stream(
+                       simulate_chunks(tide, *params, bottom, berth_time, h, s), s))
@@ -0,0 +1,289 @@
+"""Concurrent-session load test: many simulated planners on one replica.
+
+Each simulated session is a worker process that opens app.py through
+Streamlit's ``AppTest`` and then reruns it ``reruns`` times, each time
+changing one or two sidebar inputs at random (horizon, time step, draft,
+cargo, cranes, bottom, tide source...), optionally pausing for an
+exponential think time in between. ``AppTest`` installs a process-global
+runtime, so sessions cannot share a process; one process per session also
+gives clean per-session CPU time and peak RSS from ``resource.getrusage``.
+
+All sessions of a level wait on a barrier and start together, as at shift
+change (``--ramp`` spreads the starts instead). ``--cpus`` pins every worker
+to the same CPUs, so the sessions compete for exactly what one replica has.
+Streamlit caches are per process here, i.e. sessions do not reuse each
+other's ``st.cache_data`` entries; ``--store shared`` gives all of them one
+scenario store on disk, which they do share on a real replica.
+
+    python -m benchmarks.load --sessions 1,2,4,8 --reruns 10 --cpus 0
+    python -m benchmarks.load --sessions 1,2,4,8 --cpus 0 --baseline load-before.json
+
+The report (JSON and Markdown) has, per session count, the first-load and
+rerun latency percentiles, CPU seconds per rerun, peak memory per session
+and the rerun throughput. The capacity is the largest session count whose
+rerun p95 (and that of every smaller count) stays under ``--target``
+seconds without errors.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from benchmarks.page import APP_PATH
+from ukc.engine import STEP_MINUTES
+
+DEFAULT_SESSIONS = (1, 2, 4, 8)
+DEFAULT_RERUNS = 10
+DEFAULT_TARGET = 2.0          # seconds, rerun p95
+PERCENTILES = (50, 90, 95, 99)
+STARTUP_TIMEOUT = 300.0       # seconds for every worker to import Streamlit
+
+# (widget, label, sampler(rng, widget)); 1-minute steps are left to benchmarks.page
+INPUTS = (
+    ("number_input", "Tkt đến (m)", lambda rng, w: round(rng.uniform(7.0, 11.0), 2)),
+    ("number_input", "Import (cont)", lambda rng, w: 10 * rng.randint(0, 100)),
+    ("number_input", "Export (cont)", lambda rng, w: 10 * rng.randint(0, 100)),
+    ("number_input", "Số cẩu", lambda rng, w: rng.randint(1, 4)),
+    ("number_input", "Thời gian chờ (h)", lambda rng, w: 0.25 * rng.randint(0, 16)),
+    ("number_input", "Cao độ đáy (m, HĐ)", lambda rng, w: round(rng.uniform(-12.0, -9.0), 2)),
+    ("number_input", "Tổng giờ mô phỏng", lambda rng, w: rng.choice((48, 72, 168, 336))),
+    ("selectbox", "Bước thời gian", lambda rng, w: rng.choice(STEP_MINUTES[:-1])),
+    ("selectbox", "Nguồn thủy triều", lambda rng, w: rng.choice(w.options)),
+)
+
+
+def _cpu_seconds():
+    import resource
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _peak_rss_mib():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1 << 20 if sys.platform == "darwin" else 1 << 10)
+
+
+def randomize(at, rng):
+    """Change one or two sidebar inputs; returns the labels changed."""
+    changed = []
+    for widget, label, sample in rng.sample(INPUTS, rng.choice((1, 2))):
+        found = [w for w in getattr(at, widget) if w.label == label]
+        if not found:
+            continue
+        found[0].set_value(sample(rng, found[0]))
+        changed.append(label)
+    return changed
+
+
+def run_session(index, config, barrier, results):
+    """One simulated planner; puts its measurements on ``results``."""
+    if config["cpus"] and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, config["cpus"])
+    os.environ["UKC_STORE_PATH"] = config["store"]
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(config["seed"] * 1000 + index)
+    at = AppTest.from_file(APP_PATH, default_timeout=600)
+    result = {"session": index, "first": None, "reruns": [], "errors": []}
+    try:
+        barrier.wait()
+        time.sleep(config["ramp"] * index / max(config["sessions"], 1))
+        cpu = _cpu_seconds()
+        started = time.perf_counter()
+        at.run()
+        result["first"] = time.perf_counter() - started
+        if at.exception:
+            result["errors"].append(f"first run: {at.exception[0].message}")
+        for _ in range(config["reruns"]):
+            if config["think"]:
+                time.sleep(rng.expovariate(1 / config["think"]))
+            changed = randomize(at, rng)
+            started = time.perf_counter()
+            at.run()
+            result["reruns"].append(time.perf_counter() - started)
+            if at.exception:
+                result["errors"].append(f"{changed}: {at.exception[0].message}")
+        result["cpu"] = _cpu_seconds() - cpu
+    except Exception as exc:
+        result["errors"].append(repr(exc))
+        result.setdefault("cpu", None)
+    result["peak_rss_mib"] = _peak_rss_mib()
+    results.put(result)
+
+
+def _percentiles(values):
+    if not values:
+        return {}
+    return {f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))} | {
+        "max": float(max(values))}
+
+
+def run_level(sessions, config):
+    """Run ``sessions`` concurrent sessions and summarize them."""
+    ctx = multiprocessing.get_context("spawn")
+    barrier, results = ctx.Barrier(sessions + 1), ctx.Queue()
+    config = dict(config, sessions=sessions)
+    workers = [ctx.Process(target=run_session, args=(i, config, barrier, results), daemon=True)
+               for i in range(sessions)]
+    for w in workers:
+        w.start()
+    try:
+        barrier.wait(STARTUP_TIMEOUT)       # every session has imported Streamlit
+    except threading.BrokenBarrierError:
+        for w in workers:
+            w.terminate()
+        raise RuntimeError(f"{sessions} sessions did not start within {STARTUP_TIMEOUT:g} s")
+    started = time.perf_counter()
+    per_session = [results.get() for _ in workers]
+    wall = time.perf_counter() - started
+    for w in workers:
+        w.join()
+
+    per_session.sort(key=lambda r: r["session"])
+    reruns = [s for r in per_session for s in r["reruns"]]
+    cpu = [r["cpu"] for r in per_session if r["cpu"] is not None]
+    rss = [r["peak_rss_mib"] for r in per_session]
+    return {
+        "sessions": sessions,
+        "wall": wall,
+        "first": _percentiles([r["first"] for r in per_session if r["first"] is not None]),
+        "rerun": _percentiles(reruns),
+        "reruns_per_second": len(reruns) / wall if wall else 0.0,
+        "cpu_per_session": float(np.mean(cpu)) if cpu else None,
+        "cpu_per_rerun": sum(cpu) / (len(reruns) + sessions) if cpu else None,
+        "peak_rss_mib": {"mean": float(np.mean(rss)), "max": float(max(rss))},
+        "errors": [e for r in per_session for e in r["errors"]],
+        "per_session": per_session,
+    }
+
+
+def capacity(levels, target=DEFAULT_TARGET):
+    """Largest session count whose rerun p95, and every smaller count's, is
+    within ``target`` without errors."""
+    held = 0
+    for lv in sorted(levels, key=lambda lv: lv["sessions"]):
+        if lv["errors"] or not lv["rerun"] or lv["rerun"]["p95"] > target:
+            break
+        held = lv["sessions"]
+    return held
+
+
+def run(sessions=DEFAULT_SESSIONS, reruns=DEFAULT_RERUNS, think=0.0, ramp=0.0, cpus=None,
+        store="", seed=0, target=DEFAULT_TARGET):
+    shared = None
+    if store == "shared":
+        shared = tempfile.TemporaryDirectory(prefix="ukc-load-")
+        store = os.path.join(shared.name, "scenarios.sqlite")
+    config = {"reruns": reruns, "think": think, "ramp": ramp, "cpus": cpus, "store": store,
+              "seed": seed}
+    levels = []
+    try:
+        for n in sessions:
+            level = run_level(n, config)
+            levels.append(level)
+            r = level["rerun"]
+            print(f"{n:>4} sessions  first p95 {level['first'].get('p95', float('nan')):7.3f} s  "
+                  f"rerun p50 {r.get('p50', float('nan')):7.3f} s  p95 {r.get('p95', float('nan')):7.3f} s  "
+                  f"{level['reruns_per_second']:6.2f} reruns/s  "
+                  f"peak {level['peak_rss_mib']['max']:6.0f} MiB  errors {len(level['errors'])}",
+                  flush=True)
+    finally:
+        if shared is not None:
+            shared.cleanup()
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "cpus": cpus,
+            "reruns": reruns, "think": think, "ramp": ramp, "store": bool(store), "seed": seed,
+            "target": target,
+        },
+        "capacity": capacity(levels, target),
+        "levels": levels,
+    }
+
+
+def markdown(report, baseline=None):
+    """Report as a Markdown table, with the baseline's rerun p95 when given."""
+    before = {lv["sessions"]: lv for lv in baseline["levels"]} if baseline else {}
+    meta = report["meta"]
+    lines = [
+        f"# Load test {meta['created']}",
+        "",
+        f"{meta['reruns']} reruns per session, think {meta['think']:g} s, ramp {meta['ramp']:g} s, "
+        f"CPUs {meta['cpus'] or 'all'} of {meta['cpu_count']}, "
+        f"shared store {'on' if meta['store'] else 'off'}.",
+        "",
+        "| sessions | first p50 (s) | first p95 (s) | rerun p50 (s) | rerun p90 (s) | rerun p95 (s) "
+        "| rerun p99 (s) | reruns/s | CPU/rerun (s) | peak RSS (MiB) | errors |"
+        + (" baseline p95 (s) |" if before else ""),
+        "|" + "---:|" * (11 + bool(before)),
+    ]
+    for lv in report["levels"]:
+        f, r = lv["first"], lv["rerun"]
+        row = [lv["sessions"], f.get("p50"), f.get("p95"), r.get("p50"), r.get("p90"), r.get("p95"),
+               r.get("p99"), lv["reruns_per_second"], lv["cpu_per_rerun"], lv["peak_rss_mib"]["max"],
+               len(lv["errors"])]
+        if before:
+            row.append(before.get(lv["sessions"], {}).get("rerun", {}).get("p95"))
+        lines.append("| " + " | ".join("–" if v is None else f"{v:.3f}" if isinstance(v, float) else str(v)
+                                       for v in row) + " |")
+    lines += ["", f"Capacity (rerun p95 ≤ {meta['target']:g} s): **{report['capacity']} sessions**"
+              + (f" (baseline {baseline['capacity']})" if baseline else "")]
+    errors = [e for lv in report["levels"] for e in lv["errors"]]
+    if errors:
+        lines += ["", "Errors:", ""] + [f"- {e}" for e in errors[:20]]
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test of app.py.")
+    parser.add_argument("--sessions", default=",".join(map(str, DEFAULT_SESSIONS)),
+                        help="comma-separated concurrent session counts (default %(default)s)")
+    parser.add_argument("--reruns", type=int, default=DEFAULT_RERUNS, help="reruns per session")
+    parser.add_argument("--think", type=float, default=0.0,
+                        help="mean think time between reruns, seconds (default none)")
+    parser.add_argument("--ramp", type=float, default=0.0,
+                        help="spread session starts over this many seconds (default all at once)")
+    parser.add_argument("--cpus", help="comma-separated CPU ids every session is pinned to")
+    parser.add_argument("--store", choices=("off", "shared"), default="off",
+                        help="scenario store: off, or one shared by all sessions")
+    parser.add_argument("--target", type=float, default=DEFAULT_TARGET,
+                        help="rerun p95 that defines capacity, seconds (default %(default)s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="load-report.json")
+    parser.add_argument("--baseline", help="earlier load report to compare against")
+    args = parser.parse_args(argv)
+
+    cpus = [int(c) for c in args.cpus.split(",")] if args.cpus else None
+    sessions = [int(n) for n in args.sessions.split(",")]
+    report = run(sessions, args.reruns, args.think, args.ramp, cpus,
+                 "shared" if args.store == "shared" else "", args.seed, args.target)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=1)
+    text = markdown(report, baseline)
+    with open(os.path.splitext(args.output)[0] + ".md", "w") as fh:
+        fh.write(text)
+    print(text)
+    print(f"report -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
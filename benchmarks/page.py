@@ -0,0 +1,59 @@
+"""End-to-end page benchmark through Streamlit's ``AppTest``.
+
+Each scenario measures a first run with empty Streamlit caches, the median
+of a few reruns (widget values unchanged, as when another widget fires) and
+the serialized size of the Plotly figures sent to the browser.
+"""
+import os
+import statistics
+import time
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# name -> (total hours, step minutes)
+SCENARIOS = {
+    "page.48h.1h": (48, 60),
+    "page.1wk.15m": (168, 15),
+    "page.1mo.1m": (720, 1),
+}
+
+
+def _set(at, widget, label, value):
+    next(w for w in getattr(at, widget) if w.label == label).set_value(value)
+
+
+def figure_bytes(at):
+    return sum(len(e.proto.spec) for e in at.main
+               if hasattr(e, "proto") and hasattr(e.proto, "spec"))
+
+
+def run_scenario(total_hours, step_minutes, reruns=3):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    at = AppTest.from_file(APP_PATH, default_timeout=600)
+    started = time.perf_counter()
+    at.run()
+    if (total_hours, step_minutes) != (48, 60):
+        _set(at, "selectbox", "Bước thời gian", step_minutes)
+        _set(at, "number_input", "Tổng giờ mô phỏng", total_hours)
+        at.run()
+    cold = time.perf_counter() - started
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    times = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - started)
+    return {"cold": cold, "rerun": statistics.median(times), "figure_bytes": figure_bytes(at)}
+
+
+def cases(scenarios=SCENARIOS):
+    """Yield ``(name, result)`` pairs; scenarios run one after another."""
+    # A persistent scenario store would turn later runs into cache hits.
+    os.environ["UKC_STORE_PATH"] = ""
+    for name, (hours, step) in scenarios.items():
+        yield name, run_scenario(hours, step)
@@ -0,0 +1,124 @@
+"""Run the benchmarks, save JSON results and compare them with a baseline.
+
+Timings are the median of ``repeat`` runs (each run loops until it has taken
+at least ``min_time`` seconds). A case regresses when its median, or its
+figure size, exceeds the baseline by more than ``threshold`` (a ratio); the
+exit status is 1 when anything regressed.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(HERE, "baseline.json")
+DEFAULT_THRESHOLD = 1.5
+QUICK_HORIZONS = ("48h", "1wk")
+
+
+def measure(func, repeat=5, min_time=0.05):
+    """Median and minimum seconds per call of ``func``."""
+    per_call = []
+    for _ in range(repeat):
+        loops, elapsed = 0, 0.0
+        started = time.perf_counter()
+        while elapsed < min_time:
+            func()
+            loops += 1
+            elapsed = time.perf_counter() - started
+        per_call.append(elapsed / loops)
+    return {"median": statistics.median(per_call), "min": min(per_call)}
+
+
+def run(engine=True, page=True, startup=True, quick=False, repeat=5):
+    results = {}
+    if engine:
+        from benchmarks import engine as engine_bench
+        horizons = ({k: engine_bench.HORIZONS[k] for k in QUICK_HORIZONS} if quick
+                    else engine_bench.HORIZONS)
+        for name, func in engine_bench.cases(horizons):
+            results[name] = measure(func, repeat)
+            print(f"{name:<40} {results[name]['median'] * 1e3:10.3f} ms", flush=True)
+    if page:
+        from benchmarks import page as page_bench
+        scenarios = ({k: v for k, v in page_bench.SCENARIOS.items() if v[0] <= 168} if quick
+                     else page_bench.SCENARIOS)
+        for name, result in page_bench.cases(scenarios):
+            results[f"{name}.cold"] = {"median": result["cold"], "min": result["cold"]}
+            results[f"{name}.rerun"] = {"median": result["rerun"], "min": result["rerun"]}
+            results[f"{name}.figure_bytes"] = {"bytes": result["figure_bytes"]}
+            print(f"{name:<40} cold {result['cold']:.3f} s  rerun {result['rerun']:.3f} s  "
+                  f"figures {result['figure_bytes'] / 1024:.0f} KiB", flush=True)
+    if startup:
+        from benchmarks import startup as startup_bench
+        for name, result in startup_bench.cases():
+            results[name] = result
+            print(f"{name:<40} {result['median'] * 1e3:10.1f} ms", flush=True)
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """``(name, baseline, current, ratio)`` for every case over ``threshold``."""
+    regressions = []
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        key = "bytes" if "bytes" in now else "median"
+        if before[key] and now[key] / before[key] > threshold:
+            regressions.append((name, before[key], now[key], now[key] / before[key]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="UKC engine and page benchmarks.")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed current/baseline ratio (default %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write the results to the baseline file instead of comparing")
+    parser.add_argument("--engine-only", action="store_true")
+    parser.add_argument("--page-only", action="store_true")
+    parser.add_argument("--startup-only", action="store_true",
+                        help="import times and first page run in fresh processes")
+    parser.add_argument("--quick", action="store_true", help="skip the 1-month and 1-year cases")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    only = {"engine": args.engine_only, "page": args.page_only, "startup": args.startup_only}
+    selected = {k: v or not any(only.values()) for k, v in only.items()}
+    current = run(**selected, quick=args.quick, repeat=args.repeat)
+    target = args.baseline if args.save_baseline else args.output
+    with open(target, "w") as fh:
+        json.dump(current, fh, indent=1, sort_keys=True)
+    print(f"results -> {target}")
+    if args.save_baseline or not os.path.exists(args.baseline):
+        return 0
+
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    regressions = compare(current, baseline, args.threshold)
+    for name, before, now, ratio in regressions:
+        print(f"REGRESSION {name}: {before:.6g} -> {now:.6g} ({ratio:.2f}x)")
+    if not regressions:
+        print(f"no regressions over {args.threshold}x against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
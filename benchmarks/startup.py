@@ -0,0 +1,78 @@
+"""Cold-start benchmark: module import times and the first page run.
+
+Every case runs in a fresh interpreter, since imports are cached for the
+life of a process. ``startup.import.*`` times one import statement;
+``startup.first_run`` is the first ``AppTest`` run of app.py in a new
+process (what the first visitor of a new container waits for, after
+Streamlit itself is loaded) and ``startup.first_run.prewarmed`` the same
+after ``serve.prewarm()``, whose own time is ``startup.prewarm``.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORTS = ("streamlit", "numpy", "plotly.graph_objects", "pandas", "ukc")
+
+# Modules app.py must not load on a default first run (all optional panels off)
+DEFERRED = ("pandas", "ukc.bathymetry", "ukc.gauge", "ukc.inverse", "ukc.montecarlo",
+            "ukc.optimizer", "ukc.schedule", "ukc.slack", "ukc.tide", "ukc.tide_store",
+            "ukc.transit")
+
+_IMPORT_CODE = """
+import json, time
+started = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - started}}))
+"""
+
+_FIRST_RUN_CODE = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+prewarm = 0.0
+if {prewarm}:
+    import serve
+    prewarm = serve.prewarm()
+at = AppTest.from_file({app!r}, default_timeout=120)
+warm = set(sys.modules)
+started = time.perf_counter()
+at.run()
+seconds = time.perf_counter() - started
+if at.exception:
+    raise SystemExit(at.exception[0].message)
+print(json.dumps({{"seconds": seconds, "prewarm": prewarm,
+                  "loaded": [m for m in {deferred!r} if m in sys.modules and m not in warm]}}))
+"""
+
+
+def _fresh(code):
+    # A persistent scenario store would turn later runs into cache hits.
+    env = dict(os.environ, PYTHONPATH=ROOT, UKC_STORE_PATH="")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _summary(values):
+    return {"median": statistics.median(values), "min": min(values)}
+
+
+def cases(repeat=3):
+    """Yield ``(name, result)`` pairs, each the summary of ``repeat`` processes."""
+    for module in IMPORTS:
+        runs = [_fresh(_IMPORT_CODE.format(module=module))["seconds"] for _ in range(repeat)]
+        yield f"startup.import.{module}", _summary(runs)
+    app = os.path.join(ROOT, "app.py")
+    for prewarm in (False, True):
+        runs = [_fresh(_FIRST_RUN_CODE.format(prewarm=prewarm, app=app, deferred=DEFERRED))
+                for _ in range(repeat)]
+        loaded = sorted({m for r in runs for m in r["loaded"]})
+        if loaded:
+            raise RuntimeError(f"first run of app.py imported {', '.join(loaded)}")
+        name = "startup.first_run.prewarmed" if prewarm else "startup.first_run"
+        yield name, _summary([r["seconds"] for r in runs])
+        if prewarm:
+            yield "startup.prewarm", _summary([r["prewarm"] for r in runs])
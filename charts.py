@@ -0,0 +1,190 @@
+"""Chart palette, layout and Plotly figure builders of the dashboard.
+
+Kept out of app.py so the page script stays small: Streamlit recompiles the
+script on every rerun but imports this module once per process. Nothing here
+touches Streamlit, so the figures can be built by graph nodes and shared
+between sessions.
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+from ukc.render import WEBGL_THRESHOLD, bucket_min, downsample
+
+
+# =============================================================================
+# MARITIME COLOR PALETTE (for charts)
+# =============================================================================
+COLORS = {
+    "ocean":       "#0099ff",   # Xanh biển chính
+    "teal":        "#00d4aa",   # Xanh ngọc (safe/positive)
+    "coral":       "#ff5252",   # Đỏ san hô (danger)
+    "amber":       "#ffb74d",   # Cam hổ phách (warning/required)
+    "navy_bg":     "#0a1628",   # Nền tối navy
+    "navy_card":   "#0d1e33",   # Nền card
+    "navy_light":  "#132d4a",   # Navy nhạt
+    "text_primary":"#e8f4f8",   # Chữ chính
+    "text_muted":  "#5a8a9e",   # Chữ phụ
+    "grid":        "rgba(0, 153, 255, 0.06)",  # Grid lines
+    "gridline":    "rgba(0, 153, 255, 0.08)",
+}
+
+# Plotly chart template
+CHART_LAYOUT = dict(
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(10, 22, 40, 0.5)',
+    font=dict(family='Inter', color=COLORS["text_muted"], size=12),
+    margin=dict(l=50, r=20, t=10, b=45),
+    legend=dict(
+        bgcolor='rgba(13, 30, 51, 0.8)',
+        bordercolor='rgba(0, 153, 255, 0.15)',
+        borderwidth=1,
+        font=dict(color=COLORS["text_primary"], size=11),
+        x=0.01, y=0.99
+    ),
+    xaxis=dict(
+        gridcolor=COLORS["gridline"],
+        zerolinecolor=COLORS["gridline"],
+        title_font=dict(color=COLORS["text_muted"], size=12),
+        tickfont=dict(color=COLORS["text_muted"], size=10),
+    ),
+    yaxis=dict(
+        gridcolor=COLORS["gridline"],
+        zerolinecolor=COLORS["gridline"],
+        title_font=dict(color=COLORS["text_muted"], size=12),
+        tickfont=dict(color=COLORS["text_muted"], size=10),
+    ),
+    hoverlabel=dict(
+        bgcolor=COLORS["navy_light"],
+        font_size=13,
+        font_family='Inter',
+        bordercolor=COLORS["ocean"]
+    ),
+)
+
+
+# =============================================================================
+# TRACES & FIGURES
+# =============================================================================
+# Chuỗi dài (bước phút, nhiều tuần) được rút gọn trước khi gửi lên trình duyệt:
+# LTTB cho đường, min theo nhóm cho cột, WebGL khi nhiều điểm.
+def line_trace(x, y, keep=(), **kwargs):
+    if len(y) <= WEBGL_THRESHOLD:
+        return go.Scatter(x=x, y=y, **kwargs)
+    idx = downsample(x, y, keep=keep)
+    line = {k: v for k, v in kwargs.pop("line", {}).items() if k != "shape"}  # WebGL: no spline
+    return go.Scattergl(x=np.take(x, idx).tolist(), y=np.take(y, idx).tolist(), line=line, **kwargs)
+
+def bar_trace(x, y, violation, **kwargs):
+    starts, y = bucket_min(y)
+    if len(starts) < len(x):
+        # Nhóm có bất kỳ điểm vi phạm nào → cột đỏ
+        violation = np.maximum.reduceat(np.asarray(violation, dtype=float), starts) > 0
+    colors = [COLORS["coral"] if v else COLORS["teal"] for v in violation]
+    return go.Bar(x=np.take(x, starts).tolist(), y=np.asarray(y).tolist(), marker_color=colors,
+                  **kwargs)
+
+# --- FIGURES (mỗi biểu đồ là một nút của đồ thị tính toán) ---
+def figure_ukc_area(hours, ukc_actual, ukc_req, keep, min_ukc, min_ukc_time):
+    # --- CHART 1: UKC ACTUAL AREA ---
+    fig1 = go.Figure()
+
+    # Danger zone (below required)
+    fig1.add_trace(line_trace(hours, ukc_req, keep, mode='lines', name='Vùng nguy hiểm',
+        line=dict(width=0), fill='tozeroy',
+        fillcolor='rgba(255, 82, 82, 0.08)', showlegend=False))
+
+    # Safe zone (UKC actual)
+    fig1.add_trace(line_trace(hours, ukc_actual, keep, mode='lines', name='UKC Thực tế',
+        line=dict(color=COLORS["teal"], width=2.5, shape='spline'),
+        fill='tozeroy', fillcolor='rgba(0, 212, 170, 0.1)'))
+
+    # Required line
+    fig1.add_trace(line_trace(hours, ukc_req, keep, mode='lines', name='UKC Yêu cầu',
+        line=dict(color=COLORS["amber"], width=2, dash='dash')))
+
+    # Annotations for min/max
+    fig1.add_annotation(x=min_ukc_time, y=min_ukc, text=f"Min: {min_ukc:.2f}m",
+        showarrow=True, arrowhead=2, arrowcolor=COLORS["coral"],
+        font=dict(color=COLORS["coral"], size=11), bgcolor=COLORS["navy_card"],
+        bordercolor=COLORS["coral"], borderwidth=1)
+
+    fig1.update_layout(**CHART_LAYOUT, height=320,
+        xaxis_title="Thời gian (giờ)", yaxis_title="UKC (m)")
+
+    return fig1
+
+def figure_overview(hours, tide_data, keel_line, bottom):
+    # --- CHART 2: OVERVIEW (Water Level - Keel - Bottom) ---
+    fig2 = go.Figure()
+
+    # Water surface area
+    fig2.add_trace(line_trace(hours, tide_data, mode='lines', name='Mực nước',
+        line=dict(color=COLORS["ocean"], width=2, shape='spline'),
+        fill='tozeroy', fillcolor='rgba(0, 153, 255, 0.08)'))
+
+    # Keel line
+    fig2.add_trace(line_trace(hours, keel_line, mode='lines', name='Keel tàu',
+        line=dict(color=COLORS["coral"], width=2, shape='spline')))
+
+    # Seabed (constant: shapes, not a full-length trace)
+    fig2.add_shape(type='rect', xref='paper', x0=0, x1=1, y0=bottom, y1=0, layer='below',
+        fillcolor='rgba(139, 105, 20, 0.1)', line_width=0)
+    fig2.add_shape(type='line', xref='paper', x0=0, x1=1, y0=bottom, y1=bottom,
+        name=f'Đáy biển ({bottom:.2f}m)', showlegend=True,
+        line=dict(color='#8B6914', width=2.5))
+
+    fig2.update_layout(**CHART_LAYOUT, height=320,
+        xaxis_title="Thời gian (giờ)", yaxis_title="Cao độ (m, HĐ)",
+        yaxis_range=[-12, 5])
+
+    return fig2
+
+def figure_ukc_bars(hours, ukc_actual, ukc_req, keep):
+    # --- CHART 3: BAR CHART ---
+    violation = [u < r for u, r in zip(ukc_actual, ukc_req)]
+
+    fig3 = go.Figure()
+    fig3.add_trace(bar_trace(hours, ukc_actual, violation, name='UKC',
+        marker_line_width=0, opacity=0.85))
+    fig3.add_trace(line_trace(hours, ukc_req, keep, mode='lines', name='Required',
+        line=dict(color=COLORS["amber"], width=2.5, dash='dash')))
+
+    fig3.update_layout(**CHART_LAYOUT, height=350,
+        xaxis_title="Giờ", yaxis_title="UKC (m)", bargap=0.12)
+
+    return fig3
+
+def figure_draft_ukc(hours, tkt_series, ukc_actual, ukc_req, keep):
+    # --- CHART 4: TKT + UKC ---
+    fig4 = go.Figure()
+    fig4.add_trace(line_trace(hours, tkt_series, mode='lines+markers',
+        name='Tkt Thực Tế', line=dict(color=COLORS["ocean"], width=2.5, shape='spline'),
+        marker=dict(size=4, color=COLORS["ocean"])))
+    fig4.add_trace(line_trace(hours, ukc_actual, keep, mode='lines',
+        name='UKC Thực Tế', line=dict(color=COLORS["teal"], width=2, shape='spline')))
+    fig4.add_trace(line_trace(hours, ukc_req, keep, mode='lines',
+        name='UKC Required', line=dict(color=COLORS["coral"], width=2, dash='dash')))
+
+    fig4.update_layout(**CHART_LAYOUT, height=350,
+        xaxis_title="Thời gian (giờ)", yaxis_title="Tkt(m) / UKC(m)",
+        yaxis_range=[0, max(tkt_series) + 1])
+
+    return fig4
+
+def figure_monte_carlo(fig1, mc):
+    fig = go.Figure(fig1)   # bản sao, không sửa hình của nút fig1
+    mc_hours = list(range(len(mc["p_violation"])))
+    p5, p50, p95 = (mc["bands"][q].tolist() for q in (5, 50, 95))
+    fig.add_trace(go.Scatter(x=mc_hours, y=p95, mode='lines', name='P95',
+        line=dict(color=COLORS["ocean"], width=0), showlegend=False))
+    fig.add_trace(go.Scatter(x=mc_hours, y=p5, mode='lines', name='UKC P5–P95',
+        line=dict(color=COLORS["ocean"], width=0), fill='tonexty',
+        fillcolor='rgba(0, 153, 255, 0.15)'))
+    fig.add_trace(go.Scatter(x=mc_hours, y=p50, mode='lines', name='UKC P50',
+        line=dict(color=COLORS["ocean"], width=1.5, dash='dot')))
+    fig.add_trace(go.Bar(x=mc_hours, y=(100 * mc["p_violation"]).tolist(), name='P(vi phạm) %',
+        marker_color=COLORS["coral"], opacity=0.35, yaxis='y2'))
+    fig.update_layout(yaxis2=dict(title="P(vi phạm) %", overlaying='y', side='right',
+        range=[0, 100], showgrid=False, tickfont=dict(color=COLORS["text_muted"], size=10),
+        title_font=dict(color=COLORS["text_muted"], size=12)))
+    return fig
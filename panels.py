@@ -0,0 +1,262 @@
+"""Optional dashboard panels.
+
+Each panel draws one expander; the work behind it runs only when its toggle
+is on, since Streamlit executes expander bodies even when collapsed. The
+panels live outside app.py so the page script Streamlit recompiles on every
+rerun stays small. They read the current inputs from the session's
+calculation graph (``graph["tkt1"]``, ``graph["tide"]``...); ``tide_for(hours)``
+builds an hourly tide of another length from the selected tide source.
+
+NumPy, Plotly and the solver modules are imported inside the panels, past
+their toggles, so a page with every panel off does not load them.
+"""
+import io
+
+import streamlit as st
+
+from ukc.defaults import DEFAULTS
+
+
+def _inputs(graph, *names):
+    return [graph[name] for name in names]
+
+
+# =============================================================================
+# BERTH WINDOW OPTIMIZER
+# =============================================================================
+def berth_window_panel(graph, tide_for):
+    with st.expander("🔍 Tìm cửa sổ cập cầu an toàn", expanded=False):
+        if not st.toggle("Tìm cửa sổ cập cầu", key="show_window"):
+            return
+        col_s1, col_s2 = st.columns(2)
+        with col_s1:
+            search_hours = st.number_input("Khoảng tìm kiếm (giờ)", value=168, step=24, min_value=24,
+                                           max_value=744, help="Số giờ thủy triều để dò thời điểm đến")
+        with col_s2:
+            max_wait = st.number_input("TG chờ tối đa (h)", value=6.0, step=0.25, min_value=0.0)
+        if not st.button("Tìm thời điểm đến sớm nhất", use_container_width=True):
+            return
+        import numpy as np
+
+        from ukc.optimizer import find_berth_window
+
+        tkt1, import_cont, export_cont, crane_rate, cranes, aux_time, draft_change, bottom, total_hours = (
+            _inputs(graph, "tkt1", "import_cont", "export_cont", "crane_rate", "cranes", "aux_time",
+                    "draft_change", "bottom", "total_hours"))
+        try:
+            search_tide = tide_for(search_hours + total_hours)
+        except (ValueError, IndexError) as exc:   # IndexError: ngoài phạm vi bảng thủy triều
+            st.error(f"Không lấy được thủy triều cho khoảng tìm kiếm: {exc}")
+            return
+        window = find_berth_window(
+            search_tide, tkt1, import_cont, export_cont, crane_rate,
+            cranes, DEFAULTS["spare_cranes"], aux_time, draft_change, bottom, total_hours,
+            wait_times=np.arange(0.0, max_wait + 0.125, 0.25))
+        if window["arrival"] is None:
+            st.error(f"Không có thời điểm đến an toàn trong {search_hours} giờ với tối đa "
+                     f"{cranes + DEFAULTS['spare_cranes']} cẩu.")
+        else:
+            st.success(f"Đến sớm nhất: giờ **{window['arrival']}** — **{window['cranes']}** cẩu, "
+                       f"chờ **{window['wait_time']:.2f}** h, tại cầu **{window['berth_time']:.2f}** h")
+            st.markdown("| Số cẩu | Giờ đến sớm nhất |\n|-------:|-----------------:|\n" + "\n".join(
+                f"| {c} | {'—' if o is None else o} |" for c, o in window["earliest_by_cranes"].items()))
+
+
+# =============================================================================
+# SAFE LIMITS
+# =============================================================================
+def safe_limits_panel(graph, timer):
+    with st.expander("🎯 Giới hạn an toàn (xếp thêm / mớn đến tối đa)", expanded=False):
+        if not st.toggle("Tính giới hạn an toàn", key="show_limits"):
+            return
+        st.caption("Mỗi giới hạn giữ nguyên các thông số còn lại ở sidebar; UKC thực tế ≥ "
+                   "UKC yêu cầu tại mọi thời điểm trong khoảng tính.")
+        if not st.button("Tính giới hạn", use_container_width=True):
+            return
+        from ukc.inverse import LIMITS, solve_limits
+
+        tkt1, export_cont, bottom = _inputs(graph, "tkt1", "export_cont", "bottom")
+        with timer.stage("inverse"):
+            limits = solve_limits(*_inputs(graph, "tide", "tkt1", "import_cont", "export_cont",
+                                           "crane_rate", "cranes", "wait_time", "aux_time",
+                                           "draft_change", "bottom", "step_minutes"))
+        max_export, max_tkt1, min_bottom = (limits[k] for k in LIMITS)
+
+        def fmt(value, current, unit, digits=2):
+            if value is None:
+                return "—", "không có giá trị an toàn"
+            delta = value - current
+            return f"{value:.{digits}f} {unit}", f"{delta:+.{digits}f} {unit} so với hiện tại"
+
+        rows = [("Cont xuất tối đa", *fmt(max_export, export_cont, "cont", 0)),
+                ("Mớn nước đến tối đa", *fmt(max_tkt1, tkt1, "m")),
+                ("Cao độ đáy nông nhất", *fmt(min_bottom, bottom, "m"))]
+        st.markdown("| Giới hạn | Giá trị | Chênh lệch |\n|----------|--------:|-----------:|\n" +
+                    "\n".join(f"| {name} | **{value}** | {delta} |" for name, value, delta in rows))
+
+
+# =============================================================================
+# WINDOW / TIDE-CYCLE SUMMARY
+# =============================================================================
+# Chỉ mục range-minimum (ukc/slack.py): mỗi khoảng giờ chỉ vài phép tra, không quét lại chuỗi.
+def slack_panel(graph):
+    with st.expander("🌊 UKC theo khoảng giờ & chu kỳ triều", expanded=False):
+        if not st.toggle("Tính theo khoảng giờ & chu kỳ", key="show_slack"):
+            return
+        slack_index = graph["slack_index"]
+        last_hour = float(slack_index.t[-1])
+        col_w1, col_w2 = st.columns(2)
+        with col_w1:
+            window_from = st.number_input("Từ giờ", value=0.0, step=1.0, min_value=0.0,
+                                          max_value=last_hour)
+        with col_w2:
+            window_to = st.number_input("Đến giờ", value=last_hour, step=1.0, min_value=0.0,
+                                        max_value=last_hour)
+        try:
+            w = slack_index.window(window_from, window_to)
+        except ValueError:
+            st.warning("Khoảng giờ không chứa điểm tính nào.")
+        else:
+            st.markdown(f"UKC min **{w['min_ukc']:.2f} m** lúc {w['min_ukc_time']:.2f}h &nbsp;|&nbsp; "
+                        f"Dư UKC min **{w['min_slack']:+.2f} m** lúc {w['min_slack_time']:.2f}h &nbsp;|&nbsp; "
+                        f"Dưới yêu cầu **{w['below_hours']:.2f} h**")
+        cycles = slack_index.cycles()
+        st.markdown("| Chu kỳ | Từ (h) | Đến (h) | Nước lớn (m) | Lúc (h) | UKC min (m) | Dư UKC min (m) "
+                    "| Lúc (h) | Dưới yêu cầu (h) |\n|---|---:|---:|---:|---:|---:|---:|---:|---:|\n" + "\n".join(
+            f"| {k + 1}{'' if done else '*'} | {start:.2f} | {end:.2f} | {hw:.2f} | {hw_t:.2f} | {lo:.2f} "
+            f"| {'🔴 ' if sl < 0 else ''}{sl:+.2f} | {sl_t:.2f} | {below:.2f} |"
+            for k, (done, start, end, hw, hw_t, lo, sl, sl_t, below) in enumerate(zip(*(
+                cycles[c].tolist() for c in ("complete", "start", "end", "high_water", "high_water_time",
+                                             "min_ukc", "min_slack", "min_slack_time", "below_hours"))))))
+        st.caption("Chu kỳ tính từ nước ròng đến nước ròng kế tiếp; "
+                   "* = chu kỳ dở dang ở đầu/cuối khoảng tính.")
+
+
+# =============================================================================
+# MULTI-VESSEL SCHEDULE
+# =============================================================================
+@st.cache_resource(max_entries=8)
+def get_schedule_calls(data):
+    from ukc.schedule import read_schedule_calls
+    return read_schedule_calls(io.StringIO(data.decode("utf-8-sig")))
+
+def schedule_panel(tide_for, timer):
+    with st.expander("🗓️ Lập lịch nhiều tàu (chung cầu bến & cẩu)", expanded=False):
+        if not st.toggle("Lập lịch cho danh sách tàu", key="show_schedule"):
+            return
+        calls_file = st.file_uploader("Danh sách tàu (CSV: call_id, eta, loa, tkt1, import_cont, "
+                                      "export_cont, crane_rate, cranes, ...)", type="csv",
+                                      help="eta: giờ tàu đến tính từ thời điểm bắt đầu thủy "
+                                           "triều; cranes: số cẩu tối đa tàu làm được; cột "
+                                           "thiếu lấy giá trị mặc định")
+        col_q1, col_q2, col_q3 = st.columns(3)
+        with col_q1:
+            quay_length = st.number_input("Chiều dài cầu bến (m)", value=900.0, step=50.0, min_value=50.0)
+        with col_q2:
+            crane_pool = st.number_input("Tổng số cẩu bờ", value=6, step=1, min_value=1)
+        with col_q3:
+            schedule_hours = st.number_input("Khoảng lập lịch (giờ)", value=168, step=24, min_value=24,
+                                             max_value=744)
+        if calls_file is None or not st.button("Lập lịch", use_container_width=True):
+            return
+        import numpy as np
+        import plotly.graph_objects as go
+
+        from charts import CHART_LAYOUT, COLORS
+        from ukc.schedule import schedule_calls
+
+        with timer.stage("schedule"):
+            try:
+                calls = get_schedule_calls(calls_file.getvalue())
+                plan = schedule_calls(calls, tide_for(schedule_hours), quay_length, crane_pool)
+            except (ValueError, IndexError) as exc:   # IndexError: ngoài phạm vi bảng thủy triều
+                st.error(f"Không lập được lịch: {exc}")
+                return
+        fcfs = f"đến trước làm trước: {plan['fcfs_wait']:.2f} h"
+        if plan["optimal"]:
+            st.success(f"Tổng thời gian chờ **{plan['total_wait']:.2f} h** (tối ưu); {fcfs}")
+        else:   # dừng theo giới hạn thời gian: lịch tốt nhất tìm được, chưa chứng minh tối ưu
+            st.warning(f"Tổng thời gian chờ **{plan['total_wait']:.2f} h**: lời giải gần đúng, "
+                       f"có thể hơn tối ưu tới {plan['total_wait'] - plan['lower_bound']:.2f} h "
+                       f"(cận dưới {plan['lower_bound']:.2f} h, dừng sau {plan['nodes']} nút); {fcfs}")
+        if plan["unscheduled"].size:
+            st.warning(f"Không xếp được trong {schedule_hours} giờ: "
+                       f"{', '.join(map(str, plan['unscheduled']))}")
+        placed = np.flatnonzero(~np.isnan(plan["start"]))
+        fig_schedule = go.Figure(go.Scatter(
+            x=(plan["start"][placed] + plan["end"][placed]) / 2,
+            y=plan["position"][placed] + calls["loa"][placed] / 2,
+            text=[f"{plan['call_id'][i]} · {plan['cranes'][i]} cẩu" for i in placed],
+            mode="text", textfont=dict(color=COLORS["text_primary"], size=10),
+            hovertext=[f"{plan['call_id'][i]}: giờ {plan['start'][i]:.0f} → {plan['end'][i]:.2f}, "
+                       f"chờ {plan['wait'][i]:.2f} h" for i in placed], hoverinfo="text"))
+        for i in placed:
+            fig_schedule.add_shape(type="rect", x0=plan["start"][i], x1=plan["end"][i],
+                                   y0=plan["position"][i], y1=plan["position"][i] + calls["loa"][i],
+                                   line=dict(color=COLORS["ocean"]),
+                                   fillcolor="rgba(0, 153, 255, 0.25)")
+        fig_schedule.update_layout(**CHART_LAYOUT, height=320, xaxis_title="Giờ",
+                                   yaxis_title="Vị trí dọc cầu bến (m)", showlegend=False)
+        fig_schedule.update_yaxes(range=[0, quay_length])
+        st.plotly_chart(fig_schedule, use_container_width=True)
+
+
+# =============================================================================
+# CHANNEL TRANSIT
+# =============================================================================
+@st.cache_resource(max_entries=8)
+def get_channel_profile(data):
+    from ukc.transit import ChannelProfile
+    return ChannelProfile.from_csv(io.StringIO(data.decode("utf-8-sig")))
+
+def transit_panel(graph, timer):
+    with st.expander("🚢 Hành trình qua luồng (độ sâu thay đổi)", expanded=False):
+        if not st.toggle("Tính hành trình", key="show_transit"):
+            return
+        import numpy as np
+        import plotly.graph_objects as go
+
+        from charts import CHART_LAYOUT, COLORS, line_trace
+        from ukc.transit import DEFAULT_SPEED, plan_transit, transit_grid
+
+        profile_file = st.file_uploader("Mặt cắt tim luồng (CSV: chainage, depth[, speed])", type="csv",
+                                        help="chainage (m từ cửa luồng), depth (m dưới hệ cao độ, "
+                                             "dương hoặc âm), speed (hải lý/h, tùy chọn)")
+        tide, tkt1, total_hours, step_minutes = _inputs(graph, "tide", "tkt1", "total_hours",
+                                                        "step_minutes")
+        col_t1, col_t2 = st.columns(2)
+        with col_t1:
+            departure = st.number_input("Giờ xuất phát", value=0.0, step=0.25, min_value=0.0,
+                                        max_value=float(total_hours))
+        with col_t2:
+            transit_speed = st.number_input("Tốc độ (hải lý/h)", value=DEFAULT_SPEED, step=0.5,
+                                            min_value=0.5, help="Dùng khi file không có cột speed")
+        if profile_file is None:
+            return
+        with timer.stage("transit"):
+            try:
+                profile = get_channel_profile(profile_file.getvalue())
+                speed = None if np.ndim(profile.speed) else transit_speed
+                plan = plan_transit(profile, tide, departure, tkt1, speed, step_minutes)
+            except ValueError as exc:
+                st.error(f"Không tính được hành trình: {exc}")
+                return
+        shoal = plan["shoal"]
+        text = (f"Điểm khống chế: km **{shoal['chainage'] / 1000:.3f}** (sâu {shoal['depth']:.2f} m), "
+                f"giờ {shoal['time']:.2f} — UKC **{shoal['ukc']:.2f}** m / yêu cầu "
+                f"{shoal['ukc_req']:.2f} m. Thời gian hành trình {plan['passage_hours']:.2f} h.")
+        (st.success if shoal["safe"] else st.error)(text)
+        if plan["earliest_departure"] is None:
+            st.warning("Không có giờ xuất phát an toàn trong khoảng thủy triều đang xét.")
+        else:
+            st.markdown(f"Cửa sổ xuất phát an toàn: giờ **{plan['earliest_departure']:.2f}** → "
+                        f"muộn nhất giờ **{plan['latest_departure']:.2f}**")
+        grid = transit_grid(profile, tide, departure, tkt1, speed, step_minutes)
+        fig_transit = go.Figure(line_trace(
+            profile.chainage / 1000, grid["ukc"], keep=(shoal["index"],), name="UKC",
+            line=dict(color=COLORS["teal"], width=2)))
+        fig_transit.add_shape(type='line', xref='paper', x0=0, x1=1, y0=grid["ukc_req"],
+                              y1=grid["ukc_req"], line=dict(color=COLORS["amber"], dash='dash'))
+        fig_transit.update_layout(**CHART_LAYOUT, height=260, xaxis_title="Km luồng",
+                                  yaxis_title="UKC (m)", showlegend=False)
+        st.plotly_chart(fig_transit, use_container_width=True)
@@ -0,0 +1,58 @@
+"""Start the dashboard with shared resources warmed before the first session.
+
+``streamlit run app.py`` imports NumPy, Plotly and the ``ukc`` package on the
+first script run, i.e. while the first visitor waits. This launcher does that
+work (and builds one throwaway figure so Plotly loads its trace validators)
+in the server process before Streamlit starts listening, so every session
+only pays for its own script run:
+
+    python serve.py [streamlit run options...]
+"""
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def prewarm():
+    """Import and exercise everything the first app run would; returns seconds."""
+    started = time.perf_counter()
+    import numpy as np
+    import plotly.graph_objects as go
+
+    from ukc.defaults import DEFAULTS, default_tide
+    from ukc.graph import ukc_graph
+    from ukc.tide import load_constituents, predict_range
+    import charts   # noqa: F401  app.py's figure builders
+    import panels   # noqa: F401  app.py's optional panels
+
+    fig = go.Figure([go.Scatter(x=[0, 1], y=[0, 1]), go.Scattergl(x=[0, 1], y=[0, 1]),
+                     go.Bar(x=[0, 1], y=[0, 1])])
+    fig.add_shape(type="line", xref="paper", x0=0, x1=1, y0=0, y1=0)
+    fig.add_annotation(x=0, y=0, text="warm-up")
+    fig.to_json()
+
+    d = DEFAULTS
+    graph = ukc_graph()
+    graph.set(tide=default_tide(d["total_hours"]), tkt1=d["tkt1"], import_cont=d["import_cont"],
+              export_cont=d["export_cont"], crane_rate=d["crane_rate"], cranes=d["cranes"],
+              wait_time=d["wait_time"], aux_time=d["aux_time"],
+              draft_change=d["draft_change_rate"], bottom=d["bottom_elevation"],
+              total_hours=d["total_hours"], step_minutes=60)
+    graph["scenario"]
+    constituents = load_constituents(os.path.join(HERE, "data", "namdinhvu_constituents.csv"))
+    predict_range(constituents, np.datetime64("today", "D"), d["total_hours"])
+    return time.perf_counter() - started
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    print(f"pre-warmed in {prewarm():.2f} s", flush=True)
+    from streamlit.web import cli
+    sys.argv = ["streamlit", "run", os.path.join(HERE, "app.py"), *argv]
+    return cli.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from ukc.batch import CALL_COLUMNS, DEFAULT_CONSTITUENTS, call_tides, evaluate_calls
+from ukc.defaults import DEFAULTS, default_tide
+from ukc.engine import evaluate_batch, operation_times, simulate_chunks, summarize_stream
+from ukc.tide_store import write_tide_store
+
+
+def test_store_calls_with_gaps_or_outside_the_store_are_reported_per_call(tmp_path):
+    path = str(tmp_path / "tide.ukt")
+    levels = np.full(72, 3.5)
+    levels[40] = np.nan                       # one missing sample
+    write_tide_store(path, "2026-01-01T00:00", 3600, levels)
+    arrivals = np.array(["2026-01-01T07:00", "2026-01-02T07:00", "2026-01-05T07:00"],
+                        dtype="datetime64[s]")   # local UTC+7: ok, gap, outside
+    calls = {c: np.full(3, d, dtype=float) for c, d in CALL_COLUMNS.items()}
+    calls.update(call_id=np.arange(3), arrival=arrivals)
+    summary, series = evaluate_calls(calls, ("store", path), 24, series=True)
+    assert summary["tide_error"][0] == ""
+    assert "missing" in summary["tide_error"][1] and "outside" in summary["tide_error"][2]
+    assert list(summary["safe"]) == [summary["violation_hours"][0] == 0, False, False]
+    assert np.isnan(summary["violation_hours"][1:]).all() and np.isnan(summary["min_ukc"][1:]).all()
+    assert set(series["call_id"]) == {0} and series["hour"].size == 24
+    streamed, _ = evaluate_calls(calls, ("store", path), 24)
+    assert streamed["tide_error"].tolist() == summary["tide_error"].tolist()
+    np.testing.assert_array_equal(streamed["violation_hours"], summary["violation_hours"])
+    with pytest.raises(ValueError, match="missing"):
+        call_tides(("store", path), arrivals[:2], 24)
+
+
+def test_streamed_summaries_match_the_batch_engine():
+    calls = {c: np.full(4, d, dtype=float) for c, d in CALL_COLUMNS.items()}
+    calls.update(call_id=np.arange(4), tkt1=np.array([9.0, 9.5, 10.0, 10.5]),
+                 arrival=np.array(["2026-01-01T07:00"] * 4, dtype="datetime64[s]"))
+    params = {c: calls[c] for c in CALL_COLUMNS}
+    for tide in (("table",), ("harmonic", DEFAULT_CONSTITUENTS)):
+        summary, _ = evaluate_calls(calls, tide, 96)
+        res = evaluate_batch(call_tides(tide, calls["arrival"], 96), **params)
+        np.testing.assert_array_equal(summary["min_ukc"], res["min_ukc"])
+        np.testing.assert_array_equal(summary["min_ukc_hour"], res["ukc_actual"].argmin(axis=1))
+        np.testing.assert_array_equal(summary["violation_hours"], res["violation_hours"])
+
+
+def test_sub_hourly_summaries_match_per_call_streams(tmp_path):
+    path = str(tmp_path / "tide.ukt")
+    write_tide_store(path, "2026-01-01T00:00", 300, np.asarray(default_tide(96, 5)))
+    calls = {c: np.full(3, d, dtype=float) for c, d in CALL_COLUMNS.items()}
+    calls.update(call_id=np.arange(3), bottom=np.array([-9.0, -9.5, -11.0]),
+                 arrival=np.array(["2026-01-01T07:00"] * 3, dtype="datetime64[s]"))
+    summary, _ = evaluate_calls(calls, ("store", path), 48, step_minutes=5)
+    _, unload, load, berth = operation_times(DEFAULTS["import_cont"], DEFAULTS["export_cont"],
+                                             DEFAULTS["crane_rate"], DEFAULTS["cranes"],
+                                             DEFAULTS["wait_time"], DEFAULTS["aux_time"])
+    for i, bottom in enumerate(calls["bottom"]):
+        expected = summarize_stream(simulate_chunks(
+            default_tide(48, 5), DEFAULTS["tkt1"], unload, load, DEFAULTS["wait_time"],
+            DEFAULTS["aux_time"], DEFAULTS["draft_change_rate"], bottom, berth, 48, 5), 5)
+        assert summary["min_ukc"][i] == expected["min_ukc"]
+        assert summary["min_ukc_hour"][i] == expected["min_ukc_time"]
+        assert summary["violation_hours"][i] == expected["violation_hours"]
+    assert summary["safe"].tolist() == [False, False, True]
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from ukc.bathymetry import BerthRaster, write_bathymetry
+
+
+def test_band_indexes_are_bounded_least_recently_used(tmp_path):
+    path = tmp_path / "berth.ukb"
+    write_bathymetry(path, -10.0 - np.arange(40.0).reshape(8, 5), x0=0.0, y0=0.0, cell=1.0)
+    raster = BerthRaster(path, max_bands=2)
+    first = raster.band(0, 2)
+    raster.band(1, 3)
+    assert raster.band(0, 2) is first     # hit: (0, 2) is now the most recent
+    raster.band(2, 4)                     # evicts (1, 3)
+    assert list(raster._bands) == [(0, 2), (2, 4)]
+    assert raster.footprint_bottom(0.0, 5.0, 2.0) == -10.0
+
+
+def test_partially_surveyed_column_is_a_gap(tmp_path):
+    path = tmp_path / "berth.ukb"
+    grid = np.full((4, 6), -12.0)
+    grid[1, 2] = np.nan                   # one unsurveyed cell under the hull
+    write_bathymetry(path, grid, x0=0.0, y0=0.0, cell=1.0)
+    raster = BerthRaster(path)
+    assert np.isnan(raster.footprint_bottom(0.0, 4.0, 3.0))
+    assert raster.footprint_bottom(3.0, 3.0, 3.0) == -12.0
+    assert raster.footprint_bottom(0.0, 4.0, 1.0) == -12.0   # band misses the gap row
+    with pytest.raises(ValueError, match="unsurveyed"):
+        raster.controlling_cell(0.0, 4.0, 3.0)
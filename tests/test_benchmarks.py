@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from benchmarks import load  # noqa: E402
+
+
+def test_load_smoke_run_reports_every_metric(tmp_path, capsys):
+    output = tmp_path / "load.json"
+    assert load.main(["--sessions", "1,2", "--reruns", "2", "--store", "shared",
+                      "--target", "600", "--output", str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert set(report) == {"meta", "capacity", "levels"}
+    assert report["meta"]["reruns"] == 2 and report["meta"]["store"] is True
+    assert [lv["sessions"] for lv in report["levels"]] == [1, 2]
+    for lv in report["levels"]:
+        assert lv["errors"] == []
+        assert len(lv["per_session"]) == lv["sessions"]
+        assert all(len(s["reruns"]) == 2 and s["first"] > 0 for s in lv["per_session"])
+        assert set(lv["first"]) == set(lv["rerun"]) == {"p50", "p90", "p95", "p99", "max"}
+        assert lv["rerun"]["p50"] <= lv["rerun"]["p95"] <= lv["rerun"]["max"]
+        assert lv["reruns_per_second"] > 0 and lv["cpu_per_rerun"] > 0
+        assert lv["peak_rss_mib"]["max"] >= lv["peak_rss_mib"]["mean"] > 0
+    assert report["capacity"] == 2
+    text = (tmp_path / "load.md").read_text()
+    assert "| 1 |" in text and "| 2 |" in text and "**2 sessions**" in text
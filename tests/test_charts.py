@@ -0,0 +1,38 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from charts import COLORS, bar_trace, figure_overview, line_trace
+from ukc.render import BAR_BUDGET, WEBGL_THRESHOLD
+
+
+def test_long_lines_use_webgl_and_keep_the_requested_samples():
+    x = np.arange(20_000.0)
+    y = np.cos(x / 50.0)
+    y[12_345] = -5.0
+    trace = line_trace(x, y, keep=[7_777], mode="lines", line=dict(width=2, shape="spline"))
+    assert isinstance(trace, go.Scattergl) and trace.line.shape is None
+    assert 7_777.0 in trace.x and 12_345.0 in trace.x
+    short = line_trace(x[:WEBGL_THRESHOLD], y[:WEBGL_THRESHOLD], mode="lines")
+    assert isinstance(short, go.Scatter) and len(short.x) == WEBGL_THRESHOLD
+
+
+def test_bar_buckets_with_any_violating_sample_are_red():
+    y = np.full(10_000, 2.0)
+    y[5_001] = 0.5
+    violation = y < 1.0
+    trace = bar_trace(np.arange(y.size), y, violation)
+    assert len(trace.x) == BAR_BUDGET
+    colors = np.array(trace.marker.color)
+    red = np.flatnonzero(colors == COLORS["coral"])
+    assert red.size == 1 and trace.y[red[0]] == 0.5
+    assert trace.x[red[0]] <= 5_001 < trace.x[red[0] + 1]
+
+
+def test_constant_seabed_is_drawn_as_shapes_not_traces():
+    hours = np.arange(5_000) / 60.0
+    tide = 2.0 + np.sin(hours)
+    fig = figure_overview(hours, tide, tide - 12.0, -9.5)
+    assert len(fig.data) == 2 and all(len(t.x) <= len(hours) for t in fig.data)
+    assert not any(np.all(np.asarray(t.y) == -9.5) for t in fig.data)
+    assert {s.type for s in fig.layout.shapes} == {"rect", "line"}
+    assert all(s.y0 == -9.5 and s.xref == "paper" for s in fig.layout.shapes)
@@ -0,0 +1,88 @@
+import numpy as np
+
+from ukc.defaults import default_tide
+from ukc.engine import (calculate_tkt_series, calculate_ukc, calculate_ukc_required,
+                        evaluate_batch, operation_times, round_values)
+
+
+# The dashboard's original list implementations, kept as the reference.
+def _tkt_series_loop(tkt1, unload_time, load_time, wait_time, aux_time, draft_change_rate,
+                     total_hours):
+    tkt = []
+    t_phase_a_end = wait_time + aux_time / 2
+    t_phase_b_end = t_phase_a_end + unload_time
+    t_phase_c_end = t_phase_b_end + load_time
+    tkt_min = tkt1 - (unload_time * draft_change_rate)
+    for h in range(total_hours):
+        t = float(h)
+        if t < t_phase_a_end:
+            tkt.append(round(tkt1, 2))
+        elif t < t_phase_b_end:
+            tkt.append(round(tkt1 - ((t - t_phase_a_end) * draft_change_rate), 2))
+        elif t < t_phase_c_end:
+            tkt.append(round(tkt_min + ((t - t_phase_b_end) * draft_change_rate), 2))
+        else:
+            tkt.append(round(tkt_min + (load_time * draft_change_rate), 2))
+    return tkt
+
+
+def _ukc_loop(tide_list, tkt_list, bottom):
+    return [round((w + abs(bottom)) - t, 2) for w, t in zip(tide_list, tkt_list)]
+
+
+def _ukc_required_loop(tkt_list, berth_time, total_hours):
+    return [round(0.1 * tkt_list[h] if h < berth_time else 0.2 * tkt_list[h], 2)
+            for h in range(total_hours)]
+
+
+def test_round_values_matches_builtin_round():
+    rng = np.random.default_rng(1)
+    values = np.concatenate([rng.uniform(-20, 20, 20_000),
+                             0.1 * np.arange(0, 2000) / 100,   # e.g. 0.1 * 9.45 sits on a half step
+                             np.arange(-2000, 2000) / 1000 + 0.005])
+    assert round_values(values, block=4096).tolist() == [round(v, 2) for v in values.tolist()]
+
+
+def test_array_chain_matches_the_original_loops():
+    rng = np.random.default_rng(2)
+    for _ in range(200):
+        tkt1, rate = round(rng.uniform(6, 14), 2), round(rng.uniform(0, 0.5), 2)
+        unload, load = round(rng.uniform(0, 20), 2), round(rng.uniform(0, 20), 2)
+        wait, aux = round(rng.uniform(0, 6), 2), round(rng.uniform(0, 3), 2)
+        bottom, hours = round(rng.uniform(-14, -8), 2), int(rng.integers(1, 96))
+        berth = round(wait + aux + unload + load, 2)
+        tide = default_tide(hours)
+
+        tkt = calculate_tkt_series(tkt1, unload, load, wait, aux, rate, hours, berth)
+        assert tkt == _tkt_series_loop(tkt1, unload, load, wait, aux, rate, hours)
+        assert calculate_ukc(tide, tkt, bottom) == _ukc_loop(tide, tkt, bottom)
+        assert (calculate_ukc_required(tide, tkt, bottom, berth, hours)
+                == _ukc_required_loop(tkt, berth, hours))
+
+
+def test_batch_rows_match_single_vessel_runs():
+    rng = np.random.default_rng(3)
+    n, hours = 40, 60
+    calls = dict(tkt1=rng.uniform(8, 12, n).round(2), import_cont=rng.integers(0, 800, n),
+                 export_cont=rng.integers(0, 800, n), crane_rate=rng.uniform(20, 35, n).round(1),
+                 cranes=rng.integers(0, 4, n), wait_time=rng.uniform(0, 4, n).round(2),
+                 aux_time=rng.uniform(0, 2, n).round(2),
+                 draft_change_rate=rng.uniform(0, 0.4, n).round(2),
+                 bottom=rng.uniform(-13, -9, n).round(2))
+    tides = default_tide(hours) + rng.normal(0, 0.3, (n, hours)).round(2)
+    for tide in (np.asarray(default_tide(hours)), tides):
+        res = evaluate_batch(tide, **calls)
+        for i in range(n):
+            c = {k: float(v[i]) for k, v in calls.items()}
+            _, unload, load, berth = (float(x) for x in operation_times(
+                c["import_cont"], c["export_cont"], c["crane_rate"], c["cranes"], c["wait_time"],
+                c["aux_time"]))
+            row = tide if tide.ndim == 1 else tide[i]
+            tkt = calculate_tkt_series(c["tkt1"], unload, load, c["wait_time"], c["aux_time"],
+                                       c["draft_change_rate"], hours, berth)
+            ukc = calculate_ukc(row.tolist(), tkt, c["bottom"])
+            req = calculate_ukc_required(row.tolist(), tkt, c["bottom"], berth, hours)
+            assert res["draft"][i].tolist() == tkt
+            assert res["ukc_actual"][i].tolist() == ukc
+            assert res["ukc_req"][i].tolist() == req
+            assert res["violation_hours"][i] == sum(u < r for u, r in zip(ukc, req))
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from ukc.defaults import default_tide
+from ukc.engine import draft_curve
+from ukc.events import solve_violations
+
+DT = 1e-4   # dense sampling step (h)
+
+
+def _hermite(tide, t):
+    """Catmull-Rom cubic Hermite interpolation of hourly samples."""
+    tide = np.asarray(tide, dtype=float)
+    slope = np.gradient(tide)
+    j = np.minimum(t.astype(int), tide.size - 2)
+    s = t - j
+    h00, h10 = 2 * s**3 - 3 * s**2 + 1, s**3 - 2 * s**2 + s
+    h01, h11 = -2 * s**3 + 3 * s**2, s**3 - s**2
+    return h00 * tide[j] + h10 * slope[j] + h01 * tide[j + 1] + h11 * slope[j + 1]
+
+
+@pytest.mark.parametrize("interp", ["linear", "spline"])
+@pytest.mark.parametrize("bottom", [-9.0, -9.6, -10.5, -11.5])
+def test_matches_dense_sampling(interp, bottom):
+    tide = default_tide(48)
+    ops = dict(tkt1=9.5, unload_time=6.25, load_time=6.5, wait_time=2.25, aux_time=1.0,
+               draft_change_rate=0.28)
+    berth_time = 16.0
+    res = solve_violations(tide, **ops, bottom=bottom, berth_time=berth_time, interp=interp)
+
+    t = np.arange(0.0, 47.0 + DT / 2, DT)
+    water = np.interp(t, np.arange(48.0), tide) if interp == "linear" else _hermite(tide, t)
+    draft = draft_curve(t, **ops)
+    ukc = water + abs(bottom) - draft
+    slack = ukc - np.where(t < berth_time, 0.1, 0.2) * draft
+    below = slack < 0
+
+    tolerance = 4 * DT * (len(res["intervals"]) + 1)
+    assert res["violation_hours"] == pytest.approx(below.sum() * DT, abs=tolerance)
+    assert res["min_ukc"] == pytest.approx(ukc.min(), abs=1e-6)
+    assert res["min_slack"] == pytest.approx(slack.min(), abs=1e-6)
+    assert res["min_ukc"] <= ukc.min() + 1e-12
+    inside = np.zeros_like(below)
+    for a, b in res["intervals"]:
+        inside |= (t > a + 2 * DT) & (t < b - 2 * DT)
+    assert not (inside & ~below).any()     # every interval is really below the requirement
+    edge = np.zeros_like(below)
+    for a, b in res["intervals"]:
+        edge |= (np.abs(t - a) <= 2 * DT) | (np.abs(t - b) <= 2 * DT)
+    assert not (below & ~inside & ~edge).any()   # and no violation is missed
@@ -0,0 +1,76 @@
+import numpy as np
+
+from ukc.gauge import MAX_GAP_HOURS, LiveUKC, RingBuffer
+
+START = np.datetime64("2026-10-18T00:00:00", "s")
+MINUTE = np.timedelta64(60, "s")
+
+
+def _live(hours=3.0, bottom=-9.5):
+    t = np.arange(0, hours, 1 / 60)
+    draft = np.full(t.size, 9.0)
+    return LiveUKC(START, t, draft, np.full(t.size, 0.5), bottom)
+
+
+def test_ring_buffer_wraps_and_skips_overwritten_observations():
+    buf = RingBuffer(capacity=4)
+    for i in range(6):
+        assert buf.append(START + i * MINUTE, float(i))
+    assert len(buf) == 4 and buf.count == 6
+    times, levels, count = buf.snapshot()
+    assert levels.tolist() == [2.0, 3.0, 4.0, 5.0] and count == 6
+    assert times.tolist() == (START + np.arange(2, 6) * MINUTE).tolist()
+    assert buf.snapshot(1)[1].tolist() == [2.0, 3.0, 4.0, 5.0]     # 1 was overwritten
+    assert buf.snapshot(4)[1].tolist() == [4.0, 5.0]
+    assert buf.snapshot(6)[1].size == 0
+
+
+def test_ring_buffer_drops_out_of_order_and_repeated_times():
+    buf = RingBuffer(capacity=8)
+    assert buf.append(START + MINUTE, 1.0)
+    assert not buf.append(START + MINUTE, 9.0)
+    assert not buf.append(START, 9.0)
+    assert buf.append(START + 2 * MINUTE, 2.0)
+    assert buf.count == 2 and buf.snapshot()[1].tolist() == [1.0, 2.0]
+
+
+def test_update_computes_only_the_new_tail():
+    live, buf = _live(), RingBuffer()
+    for i in range(31):
+        buf.append(START + i * MINUTE, 2.0 + 0.01 * i)
+    assert live.update(buf) == slice(0, 31)
+    np.testing.assert_allclose(live.level[:31], 2.0 + 0.01 * np.arange(31))
+    np.testing.assert_allclose(live.ukc[:31], np.round(live.level[:31] + 9.5 - 9.0, 2))
+    assert np.isnan(live.ukc[31:]).all() and live.latest() == 30
+    live.level[:31] = live.ukc[:31] = -99.0     # would be overwritten by a full recompute
+    for i in range(31, 46):
+        buf.append(START + i * MINUTE, 2.0 + 0.01 * i)
+    assert live.update(buf) == slice(31, 46)
+    assert (live.ukc[:31] == -99.0).all()
+    np.testing.assert_allclose(live.level[31:46], 2.0 + 0.01 * np.arange(31, 46))
+    assert live.update(buf) == slice(46, 46) and live.latest() == 45
+
+
+def test_points_inside_long_outages_stay_nan():
+    live, buf = _live(), RingBuffer()
+    gap = int(MAX_GAP_HOURS * 60) + 5     # minutes without data
+    buf.append(START, 2.0)
+    buf.append(START + 10 * MINUTE, 2.1)      # short gap: interpolated
+    live.update(buf)
+    buf.append(START + (10 + gap) * MINUTE, 2.4)
+    filled = live.update(buf)
+    assert filled == slice(11, 11 + gap)
+    np.testing.assert_allclose(live.level[:11], np.round(np.linspace(2.0, 2.1, 11), 2))
+    assert np.isnan(live.level[11:10 + gap]).all() and np.isnan(live.ukc[11:10 + gap]).all()
+    assert live.level[10 + gap] == 2.4 and live.latest() == 10 + gap
+
+
+def test_matches_needs_the_same_scenario_arrays():
+    live = _live()
+    args = (START, live.t, live.draft, live.ukc_req, live.bottom)
+    assert live.matches(*args)
+    assert not live.matches(START + MINUTE, *args[1:])
+    assert not live.matches(START, live.t.copy(), *args[2:])
+    assert not live.matches(START, live.t, live.draft.copy(), *args[3:])
+    assert not live.matches(START, live.t, live.draft, live.ukc_req + 0.1, live.bottom)
+    assert not live.matches(*args[:4], -10.0)
@@ -0,0 +1,25 @@
+from ukc.defaults import default_tide
+from ukc.graph import SharedCache, ukc_graph
+
+INPUTS = dict(tkt1=9.5, import_cont=350, export_cont=364, crane_rate=28, cranes=2,
+              wait_time=2.25, aux_time=1.0, draft_change=0.28, bottom=-9.5, total_hours=48,
+              step_minutes=60)
+
+
+def test_shared_cache_evicts_least_recently_used():
+    cache, computed = SharedCache(max_entries=2), []
+    get = lambda key: cache.get_or_compute(key, lambda: computed.append(key) or key)
+    for key in "abacb":
+        get(key)
+    assert computed == ["a", "b", "c", "b"]
+    assert len(cache) == 2
+
+
+def test_sessions_share_scenarios_through_the_cache():
+    cache = SharedCache()
+    graphs = [ukc_graph(cache=cache) for _ in range(2)]
+    for g in graphs:
+        g.set(tide=default_tide(48), **INPUTS)
+    first = graphs[0]["scenario"]
+    assert graphs[1]["scenario"] is first
+    assert "summary" not in graphs[1].recomputed
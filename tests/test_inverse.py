@@ -0,0 +1,53 @@
+import numpy as np
+
+from ukc.defaults import default_tide
+from ukc.engine import evaluate_batch
+from ukc.inverse import solve_limit
+
+HOURS = 48
+
+
+def _safe(tide, **call):
+    res = evaluate_batch(tide, **call)
+    return (res["violation_hours"] == 0) & (res["berth_time"] <= HOURS)
+
+
+def _largest(values, ok):
+    return values[ok].max() if ok.any() else None
+
+
+def test_limits_match_a_brute_force_scan():
+    rng = np.random.default_rng(5)
+    tide = np.asarray(default_tide(HOURS))
+    for _ in range(12):
+        call = dict(tkt1=round(rng.uniform(8.5, 10.5), 2), import_cont=int(rng.integers(100, 600)),
+                    export_cont=int(rng.integers(100, 600)), crane_rate=int(rng.integers(20, 35)),
+                    cranes=int(rng.integers(1, 4)), wait_time=round(rng.uniform(0, 4), 2),
+                    aux_time=1.0, draft_change_rate=round(rng.uniform(0.01, 0.4), 2),
+                    bottom=round(rng.uniform(-11, -9), 2))
+
+        boxes = np.arange(0, 5001)
+        expected = _largest(boxes, _safe(tide, **{**call, "export_cont": boxes}))
+        assert solve_limit("export_cont", tide, **call) == expected
+
+        drafts = np.round(np.arange(0, 1601) * 0.01, 2)
+        expected = _largest(drafts, _safe(tide, **{**call, "tkt1": drafts}))
+        assert solve_limit("tkt1", tide, **call) == expected
+
+        depths = np.round(np.arange(0, 2001) * 0.01, 2)
+        ok = _safe(tide, **{**call, "bottom": -depths})
+        assert solve_limit("bottom", tide, **call) == (-depths[ok].min() if ok.any() else None)
+
+
+def test_stays_past_the_tide_series_have_no_limit():
+    tide = np.asarray(default_tide(HOURS))
+    call = dict(tkt1=9.0, import_cont=600, export_cont=600, crane_rate=20, cranes=1,
+                wait_time=2.0, aux_time=1.0, draft_change_rate=0.05, bottom=-11.0)
+    assert evaluate_batch(tide, **call)["berth_time"][0] > HOURS     # a 63 h stay
+    assert not _safe(tide, **{**call, "tkt1": np.round(np.arange(0, 1601) * 0.01, 2)}).any()
+    assert solve_limit("tkt1", tide, **call) is None
+    assert solve_limit("bottom", tide, **call) is None
+    # Loading fewer boxes shortens the stay, so export_cont still has a limit
+    boxes = np.arange(0, 1201)
+    assert solve_limit("export_cont", tide, **call) == _largest(
+        boxes, _safe(tide, **{**call, "export_cont": boxes}))
@@ -0,0 +1,38 @@
+import numpy as np
+
+from ukc.defaults import default_tide
+from ukc.engine import evaluate_batch
+from ukc.montecarlo import monte_carlo
+
+CALL = dict(tkt1=9.5, import_cont=350, export_cont=364, crane_rate=28, cranes=2, wait_time=2.25,
+            aux_time=1.0, draft_change_rate=0.28, bottom=-9.6)
+
+
+def _same(a, b):
+    assert a.keys() == b.keys()
+    for key in a:
+        if key == "bands":
+            for q in a[key]:
+                np.testing.assert_array_equal(a[key][q], b[key][q])
+        else:
+            np.testing.assert_array_equal(a[key], b[key])
+
+
+def test_fixed_seed_is_deterministic_across_batches_and_workers():
+    tide = default_tide(48)
+    first = monte_carlo(tide, **CALL, n_samples=3000, seed=7, batch_size=1000)
+    _same(first, monte_carlo(tide, **CALL, n_samples=3000, seed=7, batch_size=1000))
+    _same(first, monte_carlo(tide, **CALL, n_samples=3000, seed=7, batch_size=1000, workers=2))
+    other = monte_carlo(tide, **CALL, n_samples=3000, seed=8, batch_size=1000)
+    assert not np.array_equal(first["p_violation"], other["p_violation"])
+    assert 0 < first["p_any_violation"] <= 1
+
+
+def test_without_uncertainty_matches_the_deterministic_run():
+    tide = default_tide(48)
+    mc = monte_carlo(tide, **CALL, n_samples=200, spread={}, tide_sigma=0.0, batch_size=64)
+    res = evaluate_batch(tide, **CALL)
+    np.testing.assert_array_equal(mc["p_violation"], res["violation"][0].astype(float))
+    for q in (5, 50, 95):
+        np.testing.assert_allclose(mc["bands"][q], res["ukc_actual"][0], atol=1e-9)
+    assert mc["mean_violation_hours"] == res["violation_hours"][0]
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from ukc.batch import CALL_COLUMNS, call_tides, evaluate_calls
+from ukc.defaults import default_tide
+from ukc.engine import evaluate_batch, summarize_batch
+from ukc.events import solve_violations
+from ukc.graph import ukc_graph
+from ukc.moves import move_draft, season_drafts
+
+ARRIVAL = np.datetime64("2026-01-01T07:00", "s")
+OPS = (9.5, 350, 364, 28, 2, 2.25, 1.0, 0.28, -9.6)
+
+
+def _moves(call_ids, n=400, seed=5):
+    rng = np.random.default_rng(seed)
+    return {
+        "call_id": rng.choice(call_ids, n),
+        "time": ARRIVAL + (rng.uniform(2, 20, n) * 3600).astype("timedelta64[s]"),
+        "weight": rng.uniform(5, 30, n) * rng.choice([-1.0, 1.0], n),
+        "bay": rng.integers(1, 40, n).astype(float),
+    }
+
+
+def test_season_drafts_with_no_calls_drops_every_move():
+    calls = {"call_id": np.array([], dtype=int), "arrival": np.array([], dtype="datetime64[s]"),
+             "tkt1": np.array([])}
+    res = season_drafts([_moves([1, 2])], calls, 24)
+    assert res["draft"].shape == (0, 24) and res["dropped"] == 400
+
+
+def test_season_drafts_match_per_call_drafts():
+    moves = _moves([1, 2, 3])
+    calls = {"call_id": np.array([3, 1, 2]), "arrival": np.full(3, ARRIVAL),
+             "tkt1": np.array([9.0, 9.5, 10.0])}
+    res = season_drafts([moves], calls, 24, step_minutes=15)
+    for row, (call, tkt1) in enumerate(zip(calls["call_id"], calls["tkt1"])):
+        own = {k: v[moves["call_id"] == call] for k, v in moves.items()}
+        single = move_draft(own, tkt1, 24, step_minutes=15, start=ARRIVAL)
+        np.testing.assert_array_equal(res["draft"][row], single["draft"])
+
+
+def test_a_given_draft_replaces_the_draft_curve():
+    tide = default_tide(48)
+    res = evaluate_batch(tide, *OPS)
+    given = evaluate_batch(tide, *OPS, draft=res["draft"][0])
+    for key in ("draft", "ukc_actual", "ukc_req", "violation_hours", "min_ukc"):
+        np.testing.assert_array_equal(given[key], res[key])
+    summary = summarize_batch(tide, *OPS, total_hours=48, draft=res["draft"], chunk_size=7)
+    assert summary["violations"][0] == res["violation_hours"][0]
+    assert summary["min_ukc"][0] == res["min_ukc"][0]
+
+    deeper = res["draft"][0] + 0.5
+    assert (evaluate_batch(tide, *OPS, draft=deeper)["ukc_actual"][0]
+            == pytest.approx(res["ukc_actual"][0] - 0.5))
+
+
+def test_exact_solver_interpolates_a_given_draft():
+    tide = default_tide(48)
+    draft = 9.5 + 0.4 * np.sin(np.arange(48) / 3)
+    res = solve_violations(tide, *OPS[:1], 6.25, 6.5, 2.25, 1.0, 0.28, -9.6, 16.0, draft=draft)
+    t = np.arange(0.0, 47.0, 1e-4)
+    d = np.interp(t, np.arange(48.0), draft)
+    ukc = np.interp(t, np.arange(48.0), tide) + 9.6 - d
+    slack = ukc - np.where(t < 16.0, 0.1, 0.2) * d
+    assert res["min_ukc"] == pytest.approx(ukc.min(), abs=1e-6)
+    assert res["violation_hours"] == pytest.approx((slack < 0).sum() * 1e-4, abs=1e-2)
+
+
+def test_graph_uses_the_move_draft():
+    g = ukc_graph()
+    g.set(tide=default_tide(48), tkt1=9.5, import_cont=350, export_cont=364, crane_rate=28,
+          cranes=2, wait_time=2.25, aux_time=1.0, draft_change=0.28, bottom=-9.6,
+          total_hours=48, step_minutes=60)
+    curve = g["scenario"]
+    draft = np.full(48, 9.8)
+    g.set(move_draft=draft)
+    moved = g["scenario"]
+    np.testing.assert_array_equal(moved["tkt_series"], draft)
+    res = evaluate_batch(default_tide(48), *OPS, draft=draft)
+    np.testing.assert_array_equal(moved["ukc_actual"], res["ukc_actual"][0])
+    assert moved["violations"] == res["violation_hours"][0]
+    assert moved["exact_min_ukc"] == pytest.approx(res["ukc_actual"].min())
+    g.set(move_draft=None)
+    np.testing.assert_array_equal(g["scenario"]["tkt_series"], curve["tkt_series"])
+
+
+def test_batch_checks_the_move_list_drafts(tmp_path):
+    import pandas as pd
+
+    moves = _moves([0, 1])
+    path = str(tmp_path / "moves.csv")
+    pd.DataFrame({**moves, "time": moves["time"].astype(str)}).to_csv(path, index=False)
+    calls = {c: np.full(3, d, dtype=float) for c, d in CALL_COLUMNS.items()}
+    calls.update(call_id=np.arange(3), arrival=np.full(3, ARRIVAL))
+    summary, series = evaluate_calls(calls, ("table",), 24, series=True, moves=path)
+    drafts = season_drafts([moves], calls, 24)["draft"]
+    np.testing.assert_array_equal(drafts[2], calls["tkt1"][2])      # no moves: tkt1 throughout
+    params = {c: calls[c] for c in CALL_COLUMNS}
+    res = evaluate_batch(call_tides(("table",), calls["arrival"], 24), **params, draft=drafts)
+    np.testing.assert_array_equal(series["draft"], drafts.ravel())
+    np.testing.assert_array_equal(summary["min_ukc"], res["min_ukc"])
+    np.testing.assert_array_equal(summary["violation_hours"], res["violation_hours"])
+    with pytest.raises(ValueError, match="arrival"):
+        evaluate_calls({k: v for k, v in calls.items() if k != "arrival"}, ("table",), 24,
+                       moves=path)
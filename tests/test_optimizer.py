@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from ukc.defaults import default_tide
+from ukc.engine import evaluate_batch
+from ukc.optimizer import find_berth_window
+
+WAITS = (0.0, 2.25, 6.0)
+
+
+def _brute_force(tide, total_hours, crane_counts, max_offset, **params):
+    """Earliest ``(arrival, wait)`` per crane count, one candidate at a time."""
+    found = {}
+    for o in range(max_offset + 1):
+        for c in crane_counts:
+            for w in WAITS:
+                res = evaluate_batch(tide[o:o + total_hours], cranes=c, wait_time=w,
+                                     total_hours=total_hours, **params)
+                if res["violation_hours"][0] == 0:
+                    found.setdefault(c, (o, w))
+    return found
+
+
+@pytest.mark.parametrize("tkt1, bottom, max_offset", [
+    (9.0, -9.5, None), (9.0, -10.0, None), (9.5, -9.5, None), (10.0, -10.0, 12),
+    (10.5, -10.0, None),     # unsafe at every arrival
+])
+def test_berth_window_matches_brute_force(tkt1, bottom, max_offset):
+    tide, total_hours = np.asarray(default_tide(96), dtype=float), 36
+    params = dict(tkt1=tkt1, import_cont=350, export_cont=364, crane_rate=28, aux_time=1.0,
+                  draft_change_rate=0.28, bottom=bottom)
+    res = find_berth_window(tide, cranes=2, spare_cranes=1, total_hours=total_hours,
+                            wait_times=WAITS, max_offset=max_offset, batch_size=7, **params)
+    last = tide.size - total_hours if max_offset is None else max_offset
+    found = _brute_force(tide, total_hours, (1, 2, 3), last, **params)
+    assert res["earliest_by_cranes"] == {c: found[c][0] if c in found else None
+                                         for c in (1, 2, 3)}
+    assert res["min_cranes"] == (min(found) if found else None)
+    if not found:
+        assert res["arrival"] is res["cranes"] is res["wait_time"] is None
+        return
+    arrival, cranes = min((o, c) for c, (o, _) in found.items())
+    assert (res["arrival"], res["cranes"], res["wait_time"]) == (
+        arrival, cranes, found[cranes][1])
+
+
+def test_berth_window_longer_than_the_tide_has_no_arrival():
+    res = find_berth_window(default_tide(24), 9.0, 350, 364, 28, 2, 1, 1.0, 0.28, -10.0, 36)
+    assert res["arrival"] is None and res["evaluated"] == 0
+    assert res["earliest_by_cranes"] == {1: None, 2: None, 3: None}
@@ -0,0 +1,16 @@
+import subprocess
+import sys
+
+import ukc
+
+
+def test_import_loads_no_submodules():
+    code = "import sys, ukc; print(sorted(m for m in sys.modules if m.startswith('ukc.')))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_public_names_resolve_lazily():
+    from ukc.engine import evaluate_batch
+    assert ukc.evaluate_batch is evaluate_batch
+    assert all(hasattr(ukc, name) for name in ukc.__all__)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from ukc.defaults import default_tide
+from ukc.engine import evaluate_batch
+from ukc.rangemin import RangeMin
+from ukc.slack import SlackIndex
+
+
+def test_range_minimum_matches_brute_force():
+    rng = np.random.default_rng(11)
+    for n in (1, 2, 7, 64, 1000):
+        values = rng.integers(0, 20, n).astype(float)     # many ties
+        index = RangeMin(values)
+        lo = rng.integers(0, n, 500)
+        hi = lo + 1 + rng.integers(0, n - lo)
+        expected = [lo_ + int(np.argmin(values[lo_:hi_])) for lo_, hi_ in zip(lo, hi)]
+        assert index.argmin(lo, hi).tolist() == expected      # first minimum on ties
+        np.testing.assert_array_equal(index.min(lo, hi), values[expected])
+        assert index.argmin(0, n) == int(np.argmin(values))
+    with pytest.raises(ValueError):
+        RangeMin([1.0, 2.0]).argmin(1, 1)
+
+
+def test_slack_windows_match_brute_force():
+    tide = np.asarray(default_tide(200))
+    res = evaluate_batch(tide, 9.5, 350, 364, 28, 2, 2.25, 1.0, 0.28, -9.6)
+    t = np.arange(200.0)
+    ukc, req = res["ukc_actual"][0], res["ukc_req"][0]
+    index = SlackIndex(t, ukc, req, tide)
+    slack = np.round(ukc - req, 2)
+    rng = np.random.default_rng(12)
+    a = rng.uniform(0, 199, 300)
+    b = a + rng.uniform(0, 199 - a)
+    a, b = a[np.ceil(a) <= b], b[np.ceil(a) <= b]      # windows holding a grid point
+    w = index.window(a, b)
+    for k, (a_, b_) in enumerate(zip(a, b)):
+        inside = np.flatnonzero((t >= a_) & (t <= b_))
+        i, j = inside[np.argmin(ukc[inside])], inside[np.argmin(slack[inside])]
+        assert (w["min_ukc"][k], w["min_ukc_time"][k]) == (ukc[i], t[i])
+        assert (w["min_slack"][k], w["min_slack_time"][k]) == (slack[j], t[j])
+        assert w["below_hours"][k] == np.count_nonzero(ukc[inside] < req[inside])
+    cycles = index.cycles()
+    assert cycles["below_hours"].sum() == res["violation_hours"][0]
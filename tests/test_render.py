@@ -0,0 +1,49 @@
+import numpy as np
+
+from ukc.render import POINT_BUDGET, bucket_min, critical_indices, downsample, lttb
+
+
+def _month():
+    """A minute-step month with one short dip below the requirement."""
+    t = np.arange(30 * 24 * 60) / 60.0
+    ukc_actual = 2.0 + np.sin(2 * np.pi * t / 12.42)
+    ukc_actual[20_000:20_007] -= 1.9      # 7-minute violation, deepest at 20_003
+    ukc_actual[20_003] -= 0.1
+    return t, ukc_actual, np.full(t.size, 0.9)
+
+
+def test_lttb_keeps_the_ends_and_returns_sorted_unique_indices():
+    x = np.arange(1000.0)
+    y = np.sin(x / 7.0)
+    idx = lttb(x, y, 50)
+    assert idx.size == 50 and idx[0] == 0 and idx[-1] == 999
+    assert (np.diff(idx) > 0).all()
+    np.testing.assert_array_equal(lttb(x, y, 1000), np.arange(1000))
+    np.testing.assert_array_equal(lttb(x, y, 2), np.arange(1000))
+
+
+def test_minimum_and_violation_edges_survive_downsampling():
+    t, ukc_actual, ukc_req = _month()
+    keep = critical_indices(ukc_actual, ukc_req)
+    violating = np.flatnonzero(ukc_actual < ukc_req)
+    assert violating.tolist() == list(range(20_000, 20_007))
+    edges = [19_999, 20_000, 20_006, 20_007]     # last safe / first and last bad / first safe
+    assert set(edges) | {20_003} <= set(keep.tolist())
+    idx = downsample(t, ukc_actual, keep=keep)
+    assert idx.size < POINT_BUDGET + keep.size and (np.diff(idx) > 0).all()
+    assert set(edges) | {int(np.argmin(ukc_actual))} <= set(idx.tolist())
+    assert critical_indices([], []).size == 0
+
+
+def test_bucket_min_flags_a_bucket_with_one_violating_sample():
+    y = np.full(10_000, 3.0)
+    y[4321] = -1.0
+    starts, minima = bucket_min(y, budget=100)
+    assert starts.size == 100 and starts[0] == 0
+    bucket = np.searchsorted(starts, 4321, side="right") - 1
+    assert minima[bucket] == -1.0
+    assert (np.delete(minima, bucket) == 3.0).all()
+    short = np.arange(5.0)
+    starts, minima = bucket_min(short, budget=100)
+    np.testing.assert_array_equal(starts, np.arange(5))
+    np.testing.assert_array_equal(minima, short)
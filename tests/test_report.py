@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from ukc.batch import CALL_COLUMNS
+from ukc.report import render_calls, violation_spans
+from ukc.tide_store import write_tide_store
+
+
+def test_violation_spans_merge_runs_including_the_series_ends():
+    t = np.arange(10.0)
+    v = np.array([1, 1, 0, 0, 1, 1, 1, 0, 1, 1], dtype=bool)
+    np.testing.assert_array_equal(violation_spans(v, t),
+                                  [[-0.5, 1.5], [3.5, 6.5], [7.5, 9.5]])
+    np.testing.assert_array_equal(violation_spans(np.ones(4, bool), t[:4], step=2.0),
+                                  [[-1.0, 4.0]])
+    np.testing.assert_array_equal(violation_spans([0, 1, 0], [0.0, 0.5, 1.0], step=0.5),
+                                  [[0.25, 0.75]])
+    assert violation_spans(np.zeros(5, bool), t[:5]).shape == (0, 2)
+
+
+def test_store_gaps_skip_only_their_own_calls(tmp_path):
+    pytest.importorskip("matplotlib")
+    path = str(tmp_path / "tide.ukt")
+    levels = np.full(72, 3.5)
+    levels[40] = np.nan
+    write_tide_store(path, "2026-01-01T00:00", 3600, levels)
+    arrivals = np.array(["2026-01-01T07:00", "2026-01-02T07:00", "2026-01-05T07:00"],
+                        dtype="datetime64[s]")   # local UTC+7: ok, gap, outside
+    calls = {c: np.full(3, d, dtype=float) for c, d in CALL_COLUMNS.items()}
+    calls.update(call_id=np.array(["A", "B", "C"]), arrival=arrivals)
+    paths, skipped = render_calls(calls, ("store", path), 24, str(tmp_path))
+    assert paths == [str(tmp_path / "A.png")] and (tmp_path / "A.png").exists()
+    assert "missing" in skipped["B"] and "outside" in skipped["C"]
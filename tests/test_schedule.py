@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from ukc.schedule import busy_time_bound, feasibility_windows, schedule_calls
+
+
+def _calls(n, **columns):
+    calls = {"call_id": np.arange(n), "eta": np.zeros(n), "loa": np.full(n, 200.0),
+             "tkt1": np.full(n, 9.0), "import_cont": np.full(n, 300.0),
+             "export_cont": np.full(n, 300.0), "crane_rate": np.full(n, 25.0),
+             "cranes": np.full(n, 2.0), "wait_time": np.zeros(n), "aux_time": np.ones(n),
+             "draft_change_rate": np.zeros(n), "bottom": np.full(n, -12.0)}
+    calls.update({k: np.asarray(v, dtype=float) for k, v in columns.items()})
+    return calls
+
+
+def test_splits_crane_pool_when_that_removes_waiting():
+    # One 2-crane gang each would make the second vessel wait for the first;
+    # one crane each lets both work from their ETA.
+    plan = schedule_calls(_calls(2), np.full(72, 10.0), quay_length=900, crane_pool=2)
+    assert plan["total_wait"] == 0.0
+    assert plan["optimal"] and plan["lower_bound"] == 0.0
+    assert plan["fcfs_wait"] > 0.0
+    assert list(plan["cranes"]) == [1, 1]
+    assert list(plan["start"]) == [0.0, 0.0]
+
+
+def test_uses_full_gang_when_the_quay_is_the_constraint():
+    # Only one vessel fits alongside, so the fastest stay minimizes the wait.
+    plan = schedule_calls(_calls(2), np.full(72, 10.0), quay_length=300, crane_pool=2)
+    assert plan["optimal"]
+    assert list(plan["cranes"]) == [2, 2]
+    assert plan["total_wait"] == plan["lower_bound"] == min(plan["end"])
+
+
+def test_capacity_bound_is_tight_for_a_single_berth():
+    # Three identical calls queue for a quay that takes one vessel: waits 0, B and 2B.
+    windows = feasibility_windows(_calls(3), np.full(96, 10.0), 2)
+    stay = windows["berth_time"].min()
+    starts = busy_time_bound(np.zeros(3), np.full(3, stay), np.ones(3), 96)
+    assert starts == pytest.approx(3 * stay)
+    plan = schedule_calls(_calls(3), np.full(96, 10.0), quay_length=215, crane_pool=2,
+                          windows=windows)
+    assert plan["optimal"] and plan["lower_bound"] == plan["total_wait"] == round(3 * stay, 2)
+
+
+def test_lower_bound_holds_and_reports_heuristic_stops():
+    rng = np.random.default_rng(3)
+    for _ in range(5):
+        calls = _calls(5, eta=rng.uniform(0, 12, 5), loa=rng.uniform(150, 300, 5),
+                       cranes=rng.integers(1, 3, 5), import_cont=rng.uniform(100, 400, 5))
+        plan = schedule_calls(calls, np.full(120, 10.0), quay_length=500, crane_pool=3)
+        assert plan["optimal"]
+        # The root bound never exceeds the proven optimum
+        root = schedule_calls(calls, np.full(120, 10.0), quay_length=500, crane_pool=3,
+                              max_nodes=1)
+        assert root["lower_bound"] <= plan["total_wait"] + 1e-9
+    busy = _calls(12, eta=np.arange(12.0))
+    plan = schedule_calls(busy, np.full(168, 10.0), quay_length=450, crane_pool=2, max_nodes=50)
+    assert not plan["optimal"]
+    # The pool works one crane-stay at a time, so the queue must build up
+    assert 0 < plan["lower_bound"] < plan["total_wait"]
@@ -0,0 +1,76 @@
+import itertools
+from contextlib import closing
+
+import numpy as np
+import pytest
+
+import ukc.store
+from ukc.engine import RunningSummary
+from ukc.store import ScenarioStore, scenario_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Strictly increasing ``time.time`` so LRU order never ties."""
+    ticks = itertools.count(1000.0)
+    monkeypatch.setattr(ukc.store, "time", type("Clock", (), {"time": lambda: next(ticks)}))
+
+
+def _noise(seed, n=1000):
+    return np.random.default_rng(seed).random(n)    # incompressible payload
+
+
+def test_round_trip_keeps_arrays_scalars_and_none(tmp_path):
+    store = ScenarioStore(str(tmp_path / "s.db"))
+    value = {"ukc": np.arange(6.0).reshape(2, 3), "flags": np.array([True, False]),
+             "violations": 3, "min_ukc": 1.25,
+             "min_ukc_time": RunningSummary().result()["min_ukc_time"]}   # no samples
+    assert value["min_ukc_time"] is None
+    store.put("k", value)
+    back = store.get("k")
+    assert back.keys() == value.keys() and back["min_ukc_time"] is None
+    np.testing.assert_array_equal(back["ukc"], value["ukc"])
+    np.testing.assert_array_equal(back["flags"], value["flags"])
+    assert back["violations"] == 3 and back["min_ukc"] == 1.25
+    assert isinstance(back["violations"], int) and isinstance(back["min_ukc"], float)
+    assert store.get("missing") is None
+    with pytest.raises(TypeError, match="object"):
+        store.put("bad", {"x": np.array([1, "a", None], dtype=object)})
+
+
+def test_get_or_compute_only_computes_on_a_miss(tmp_path):
+    store, calls = ScenarioStore(str(tmp_path / "s.db")), []
+
+    def compute():
+        calls.append(1)
+        return {"x": np.arange(3), "t": None}
+
+    first = store.get_or_compute("k", compute)
+    second = ScenarioStore(store.path).get_or_compute("k", compute)
+    assert len(calls) == 1 and first["t"] is None and second["t"] is None
+    np.testing.assert_array_equal(first["x"], second["x"])
+
+
+def test_keys_are_stable_and_normalise_numbers():
+    tide = np.arange(3.0)
+    key = scenario_key({"tkt1": 9.5, "cranes": 2}, tide)
+    assert key == "cbdf4b3ded0067883f9d4284dc962579b158cb13f10fb2a5dae939519cd68367"
+    assert scenario_key({"cranes": 2.0, "tkt1": np.float32(9.5)}, [0, 1, 2]) == key
+    assert scenario_key({"tkt1": 9.5, "cranes": 3}, tide) != key
+    assert scenario_key({"tkt1": 9.5, "cranes": 2}, tide + 0.01) != key
+
+
+def test_least_recently_used_rows_go_first_under_the_byte_cap(tmp_path, clock):
+    size = len(ukc.store._pack({"x": _noise(0)}))
+    store = ScenarioStore(str(tmp_path / "s.db"), max_bytes=int(2.5 * size))
+    store.put("a", {"x": _noise(1)})
+    store.put("b", {"x": _noise(2)})
+    assert store.get("a") is not None     # "b" is now the least recently used
+    store.put("c", {"x": _noise(3)})
+    assert len(store) == 2 and store.get("b") is None
+    assert store.get("a") is not None and store.get("c") is not None
+    store.put("d", {"x": _noise(4)})      # "a" was read before "c"
+    assert store.get("a") is None and store.get("c") is not None
+    with closing(store._connect()) as conn:
+        total = conn.execute("SELECT SUM(nbytes) FROM scenarios").fetchone()[0]
+    assert total <= store.max_bytes
@@ -0,0 +1,54 @@
+import numpy as np
+
+from ukc.defaults import default_tide
+from ukc.engine import evaluate_batch, simulate_chunks, summarize_batch, summarize_stream
+
+OPS = dict(tkt1=9.5, unload_time=6.25, load_time=6.5, wait_time=2.25, aux_time=1.0,
+           draft_change_rate=0.28, bottom=-9.5, berth_time=16.0)
+
+
+def _concat(chunks):
+    chunks = list(chunks)
+    return {k: np.concatenate([c[k] for c in chunks]) for k in chunks[0]}
+
+
+def test_hourly_chunks_equal_the_batch_engine():
+    tide = default_tide(200)
+    full = _concat(simulate_chunks(tide, **OPS, total_hours=200, chunk_size=17))
+    res = evaluate_batch(tide, OPS["tkt1"], 350, 364, 28, 2, 2.25, 1.0, 0.28, -9.5)
+    assert res["berth_time"][0] == OPS["berth_time"]
+    for key in ("draft", "ukc_actual", "ukc_req"):
+        np.testing.assert_array_equal(full[key], res[key][0])
+    summary = summarize_stream(simulate_chunks(tide, **OPS, total_hours=200, chunk_size=17))
+    assert summary["violations"] == res["violation_hours"][0]
+    assert summary["min_ukc"] == res["min_ukc"][0]
+
+
+def test_chunk_size_and_tide_callable_do_not_change_sub_hourly_results():
+    tide = np.asarray(default_tide(72, 5))
+    one = _concat(simulate_chunks(tide, **OPS, total_hours=72, step_minutes=5))
+    streamed = _concat(simulate_chunks(lambda t: tide[np.rint(t * 12).astype(int)], **OPS,
+                                       total_hours=72, step_minutes=5, chunk_size=100))
+    for key in one:
+        np.testing.assert_array_equal(one[key], streamed[key])
+    assert one["t"].size == 72 * 12 and one["t"][1] == 5 / 60
+    summary = summarize_stream(simulate_chunks(tide, **OPS, total_hours=72, step_minutes=5,
+                                               chunk_size=100), step_minutes=5)
+    assert summary["violation_hours"] == np.count_nonzero(one["ukc_actual"] < one["ukc_req"]) / 12
+
+
+def test_batch_summary_skips_nan_tide_samples():
+    tide = np.tile(np.asarray(default_tide(48), dtype=float), (3, 1))
+    tide[1, ::5] = np.nan          # a NaN in every block, some ahead of the block minimum
+    tide[2] = np.nan
+    call = dict(tkt1=np.full(3, 9.5), import_cont=350, export_cont=364, crane_rate=28, cranes=2,
+                wait_time=2.25, aux_time=1.0, draft_change_rate=0.28, bottom=-9.6)
+    full = evaluate_batch(tide, **call)
+    for chunk_size in (3 * 7, 3 * 48):      # blocks of 7 samples, then one block
+        res = summarize_batch(tide, **call, total_hours=48, chunk_size=chunk_size)
+        for row in (0, 1):
+            ukc = full["ukc_actual"][row]
+            k = np.nanargmin(ukc)
+            assert (res["min_ukc"][row], res["min_ukc_time"][row]) == (ukc[k], k)
+        assert np.isnan(res["min_ukc"][2]) and np.isnan(res["min_ukc_time"][2])
+        np.testing.assert_array_equal(res["violations"], full["violation_hours"])
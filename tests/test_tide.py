@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+
+from ukc.tide import DOODSON, _mean_longitudes, _nodal, load_constituents, predict, predict_range
+
+CONSTITUENTS = load_constituents(os.path.join(os.path.dirname(__file__), "..", "data",
+                                              "namdinhvu_constituents.csv"))
+
+
+def _level(c, t):
+    """Direct sum for one timestamp, with the nodal terms at ``t`` itself."""
+    year_start = t.astype("datetime64[Y]").astype("datetime64[s]")
+    tau, s, h, p, n, p1 = _mean_longitudes(year_start)
+    n_t = _mean_longitudes(t)[4]
+    dt = (t - year_start) / np.timedelta64(1, "h")
+    level = c["z0"]
+    for name, amp, phase, speed in zip(c["name"], c["amplitude"], c["phase"], c["speed"]):
+        v0, f, u = 0.0, 1.0, 0.0
+        if name in DOODSON:
+            numbers, offset = DOODSON[name]
+            v0 = np.dot(numbers, (tau, s, h, p, -n, p1)) + offset
+            f, u = _nodal(name, n_t)
+        level += f * amp * np.cos(np.radians(v0 + speed * dt + u - phase))
+    return level
+
+
+def test_matches_the_direct_harmonic_sum():
+    hours = np.arange(0, 24 * 400, 37) * np.timedelta64(1, "h")
+    times = np.datetime64("2026-03-01T00:00", "s") + hours
+    expected = [_level(CONSTITUENTS, t) for t in times]
+    # f and u are interpolated linearly through each year: a few mm at most
+    np.testing.assert_allclose(predict(CONSTITUENTS, times), expected, atol=5e-3)
+
+
+def test_is_continuous_across_a_year_boundary():
+    _, levels = predict_range(CONSTITUENTS, "2026-12-31T22:00", 4, step_minutes=1)
+    steps = np.abs(np.diff(levels))
+    assert steps[119] < 2 * np.median(steps[100:140]) + 1e-3     # 23:59 -> 00:00
+
+
+def test_keeps_the_shape_of_the_times():
+    hours = np.arange(48).reshape(2, 24) * np.timedelta64(1, "h")
+    times = np.datetime64("2026-12-31T12:00", "s") + hours
+    levels = predict(CONSTITUENTS, times)
+    assert levels.shape == (2, 24)
+    np.testing.assert_array_equal(levels.ravel(), predict(CONSTITUENTS, times.ravel()))
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from ukc.tide_store import TideStore, csv_to_tide_store, write_tide_store
+
+
+def test_one_row_csv_needs_an_explicit_step(tmp_path):
+    csv_path, path = tmp_path / "tide.csv", tmp_path / "tide.ukt"
+    csv_path.write_text("time,level\n2026-01-01T00:00,1.25\n")
+    with pytest.raises(ValueError, match="step"):
+        csv_to_tide_store(csv_path, path)
+    assert csv_to_tide_store(csv_path, path, step_seconds=3600) == 1
+    store = TideStore(path)
+    assert store.step == np.timedelta64(3600, "s") and store.values.tolist() == [1.25]
+
+
+def _store(tmp_path, levels, step_seconds=600):
+    path = tmp_path / "tide.ukt"
+    write_tide_store(path, "2026-01-01T00:00", step_seconds, levels)
+    return TideStore(path)
+
+
+def test_window_is_a_strided_view_of_the_map(tmp_path):
+    store = _store(tmp_path, np.arange(36.0))
+    assert len(store) == 36 and store.end == np.datetime64("2026-01-01T05:50")
+    window = store.window("2026-01-01T01:00", 4, every=3)
+    assert window.tolist() == [6.0, 9.0, 12.0, 15.0]
+    assert np.shares_memory(window, store.values)
+    assert store.window("2026-01-01T01:05", 2).tolist() == [6.0, 7.0]    # sample at or before
+    assert store.times("2026-01-01T01:00", 2, every=6).tolist() == [
+        np.datetime64("2026-01-01T01:00"), np.datetime64("2026-01-01T02:00")]
+    with pytest.raises(IndexError, match="outside"):
+        store.window("2026-01-01T05:00", 7)
+
+
+def test_covers_checks_both_ends_of_the_window(tmp_path):
+    store = _store(tmp_path, np.zeros(36))
+    assert store.covers("2026-01-01T00:00", 36)
+    assert not store.covers("2026-01-01T00:00", 37)
+    assert store.covers("2026-01-01T00:00", 6, every=7)      # last index 35
+    assert not store.covers("2026-01-01T00:00", 7, every=6)  # last index 36
+    assert not store.covers("2025-12-31T23:50", 1)
+    assert not store.covers("2026-01-01T06:00", 1)
+
+
+def test_stride_needs_a_whole_multiple_of_the_step(tmp_path):
+    store = _store(tmp_path, np.zeros(4))
+    assert store.stride(np.timedelta64(1, "h")) == 6
+    assert store.stride(np.timedelta64(10, "m")) == 1
+    for step in (np.timedelta64(15, "m"), np.timedelta64(5, "m")):
+        with pytest.raises(ValueError, match="multiple"):
+            store.stride(step)
+
+
+def test_missing_reports_positions_within_the_window(tmp_path):
+    levels = np.arange(36.0)
+    levels[[7, 13, 14]] = np.nan
+    store = _store(tmp_path, levels)
+    assert store.missing("2026-01-01T00:00", 36).tolist() == [7, 13, 14]
+    assert store.missing("2026-01-01T00:50", 5, every=2).tolist() == [1, 4]   # samples 7, 13
+    assert store.missing("2026-01-01T01:00", 4, every=2).size == 0           # 6, 8, 10, 12
+    assert store.missing("2026-01-01T02:30", 10).size == 0
+
+
+def test_csv_gap_round_trips_as_nan(tmp_path):
+    csv_path, path = tmp_path / "tide.csv", tmp_path / "tide.ukt"
+    times = ["2026-01-01T00:00", "2026-01-01T01:00", "2026-01-01T02:00",
+             "2026-01-01T05:00", "2026-01-01T06:00"]        # 03:00 and 04:00 missing
+    levels = [1.0, 1.5, 2.0, 3.5, 4.0]
+    csv_path.write_text("time,level\n" + "".join(f"{t},{v}\n" for t, v in zip(times, levels)))
+    assert csv_to_tide_store(csv_path, path, chunk_rows=2) == 7    # gap across a chunk edge
+    store = TideStore(path)
+    assert store.start == np.datetime64("2026-01-01T00:00") and store.step == np.timedelta64(1, "h")
+    np.testing.assert_array_equal(store.values, [1.0, 1.5, 2.0, np.nan, np.nan, 3.5, 4.0])
+    assert store.missing(store.start, 7).tolist() == [3, 4]
+    assert not store.missing("2026-01-01T05:00", 2).size
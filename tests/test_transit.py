@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from ukc.defaults import default_tide
+from ukc.transit import ChannelProfile, plan_transit, transit_grid, transit_safe
+
+
+def _profile(rng, n=600):
+    chainage = np.cumsum(rng.uniform(5, 40, n))
+    depth = 11.5 + rng.normal(0, 0.3, n)
+    for at in rng.integers(0, n, 4):          # a few shoals
+        depth[max(at - 10, 0):at + 10] -= rng.uniform(0.5, 1.5)
+    return ChannelProfile(chainage, depth.round(2), speed=rng.uniform(6, 11, n).round(1))
+
+
+@pytest.mark.parametrize("step_minutes", [60, 15])
+def test_safe_departures_match_the_full_grid(step_minutes):
+    rng = np.random.default_rng(step_minutes)
+    tide = default_tide(48, step_minutes)
+    for _ in range(5):
+        profile = _profile(rng)
+        draft = round(rng.uniform(8.5, 10.5), 2)
+        plan = plan_transit(profile, tide, 0.0, draft, step_minutes=step_minutes,
+                            departure_step_minutes=10)
+        grid = transit_grid(profile, tide, plan["candidates"], draft, step_minutes=step_minutes)
+        brute = (grid["ukc"] >= grid["ukc_req"]).all(axis=1)
+        np.testing.assert_array_equal(plan["safe"], brute)
+        np.testing.assert_array_equal(
+            transit_safe(profile, tide, plan["candidates"], draft, step_minutes=step_minutes),
+            brute)
+
+        ok = np.flatnonzero(brute)
+        if ok.size:
+            run = ok[0] + np.argmin(np.append(brute[ok[0]:], False)) - 1
+            assert plan["earliest_departure"] == plan["candidates"][ok[0]]
+            assert plan["latest_departure"] == plan["candidates"][run]
+        else:
+            assert plan["earliest_departure"] is plan["latest_departure"] is None
+        margin = grid["ukc"][0] - grid["ukc_req"]
+        assert plan["shoal"]["index"] == int(np.argmin(margin))
+        assert plan["shoal"]["safe"] == brute[0]
@@ -0,0 +1,60 @@
+"""Headless UKC calculation package used by the dashboard.
+
+The public names below are importable from ``ukc`` directly but are loaded
+on first use (PEP 562), so ``import ukc`` and ``python -m ukc.<module>``
+only pay for the submodule they actually need.
+"""
+import importlib
+
+_EXPORTS = {
+    "bathymetry": ("BerthRaster", "asc_to_bathymetry", "write_bathymetry"),
+    "batch": ("evaluate_calls", "run_batch"),
+    "defaults": ("DEFAULT_TIDE", "DEFAULTS", "default_tide"),
+    "engine": (
+        "calculate_tkt_series",
+        "calculate_ukc",
+        "calculate_ukc_required",
+        "draft_curve",
+        "evaluate_batch",
+        "operation_times",
+        "phase_times",
+        "RunningSummary",
+        "round_values",
+        "simulate_chunks",
+        "summarize_batch",
+        "summarize_stream",
+        "time_grid",
+        "tkt_series_array",
+        "ukc_array",
+        "ukc_required_array",
+    ),
+    "events": ("solve_violations",),
+    "graph": ("Graph", "ukc_graph"),
+    "inverse": ("safe_mask", "solve_limit", "solve_limits"),
+    "montecarlo": ("monte_carlo",),
+    "moves": ("move_draft", "read_moves", "season_drafts"),
+    "optimizer": ("find_berth_window",),
+    "rangemin": ("RangeMin",),
+    "render": ("bucket_min", "critical_indices", "downsample", "lttb"),
+    "schedule": ("feasibility_windows", "schedule_calls"),
+    "slack": ("SlackIndex",),
+    "store": ("ScenarioStore", "scenario_key"),
+    "tide": ("load_constituents", "predict", "predict_range"),
+    "tide_store": ("TideStore", "csv_to_tide_store", "write_tide_store"),
+    "transit": ("ChannelProfile", "plan_transit", "transit_grid", "transit_safe"),
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULES)
+
+
+def __getattr__(name):
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{_MODULES[name]}"), name)
+    globals()[name] = value      # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
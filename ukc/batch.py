@@ -0,0 +1,382 @@
+"""Batch runner for fleet-wide UKC checks (no Streamlit).
+
+Reads a CSV or Parquet file of vessel calls, evaluates them in chunks across
+a process pool and streams the results to CSV or Parquet as chunks complete
+(in input order), so memory stays bounded by ``chunk_rows`` x ``workers``
+whatever the number of calls. Summaries go through ``summarize_batch`` in
+blocks of time as well, so long horizons at 1-minute steps (``--step-minutes``)
+never hold a calls x samples array; the optional per-hour series is built
+with ``evaluate_batch``. With ``--moves`` the draft comes from the terminal's
+container move list (``ukc.moves``) instead of ``draft_change_rate``; the move
+file is streamed once per chunk of calls and the drafts take ``chunk_rows`` x
+samples memory.
+
+Input columns (missing ones take the dashboard defaults): ``call_id``,
+``arrival`` (local time, needed for harmonic / tide-store tides), ``tkt1``,
+``import_cont``, ``export_cont``, ``crane_rate``, ``cranes``, ``wait_time``,
+``aux_time``, ``draft_change_rate``, ``bottom``.
+
+    python -m ukc.batch calls.csv results.parquet --tide harmonic --workers 8 \\
+        --series series.parquet
+"""
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
+
+import numpy as np
+
+from ukc.defaults import DEFAULTS, default_tide
+from ukc.engine import STEP_MINUTES, evaluate_batch, round_values, summarize_batch
+
+CALL_COLUMNS = {
+    "tkt1": DEFAULTS["tkt1"],
+    "import_cont": DEFAULTS["import_cont"],
+    "export_cont": DEFAULTS["export_cont"],
+    "crane_rate": DEFAULTS["crane_rate"],
+    "cranes": DEFAULTS["cranes"],
+    "wait_time": DEFAULTS["wait_time"],
+    "aux_time": DEFAULTS["aux_time"],
+    "draft_change_rate": DEFAULTS["draft_change_rate"],
+    "bottom": DEFAULTS["bottom_elevation"],
+}
+TIDE_MODES = ("table", "harmonic", "store")
+DEFAULT_CONSTITUENTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    "data", "namdinhvu_constituents.csv")
+DEFAULT_CHUNK_ROWS = 2000
+
+
+# =============================================================================
+# TIDES (one series per call, built inside the worker)
+# =============================================================================
+@lru_cache(maxsize=4)
+def _constituents(path):
+    from ukc.tide import load_constituents
+    return load_constituents(path)
+
+
+@lru_cache(maxsize=4)
+def _tide_store(path):
+    from ukc.tide_store import TideStore
+    return TideStore(path)
+
+
+def _utc_starts(arrivals, utc_offset_hours):
+    return arrivals.astype("datetime64[s]") - np.timedelta64(int(utc_offset_hours * 3600), "s")
+
+
+def _sample_index(t, step_minutes):
+    return np.rint(np.asarray(t) * 60 / step_minutes).astype(np.intp)
+
+
+def _store_first(store, starts, n, every):
+    """Store index of each call's first sample (-1 if unusable) and the reasons."""
+    first = np.full(len(starts), -1, dtype=np.intp)
+    errors = np.full(len(starts), "", dtype=object)
+    for i, t in enumerate(starts):
+        if not store.covers(t, n, every):
+            errors[i] = f"outside the tide store ({store.start} .. {store.end} UTC)"
+            continue
+        gaps = store.missing(t, n, every)
+        if gaps.size:
+            errors[i] = f"{gaps.size} missing tide samples (first at sample {gaps[0]})"
+            continue
+        first[i] = store.index(t)
+    return first, errors
+
+
+def store_tides(path, starts, total_hours):
+    """Hourly tide-store windows per UTC start: ``(water, errors)``.
+
+    A call whose window runs outside the store or has missing samples gets
+    a NaN row and the reason in ``errors`` (``""`` for usable calls), so one
+    bad arrival does not abort the other calls.
+    """
+    store = _tide_store(path)
+    every = store.stride(np.timedelta64(1, "h"))
+    first, errors = _store_first(store, starts, total_hours, every)
+    water = np.full((len(starts), total_hours), np.nan)
+    for i in np.flatnonzero(first >= 0):
+        water[i] = store.window(starts[i], total_hours, every)
+    return round_values(water), errors
+
+
+def stream_tides(tide, arrivals, total_hours, step_minutes=60, utc_offset_hours=7):
+    """Tides for ``summarize_batch`` without an ``(N, T)`` array: ``(tide_at, errors)``.
+
+    ``tide_at(t)`` gives the levels at sample times ``t`` (h): ``(len(t),)``
+    for the sample table, else ``(N, len(t))``. ``errors`` is as for
+    ``store_tides`` with a tide store, else ``None``.
+    """
+    mode = tide[0]
+    if mode == "table":
+        levels = np.asarray(default_tide(total_hours, step_minutes), dtype=float)
+        return (lambda t: levels[_sample_index(t, step_minutes)]), None
+    if arrivals is None:
+        raise ValueError(f"Tide mode {mode!r} needs an 'arrival' column")
+    starts = _utc_starts(arrivals, utc_offset_hours)
+    step = np.timedelta64(int(step_minutes * 60), "s")
+    if mode == "harmonic":
+        from ukc.tide import predict
+        constituents = _constituents(tide[1])
+        return (lambda t: round_values(predict(
+            constituents, starts[:, None] + _sample_index(t, step_minutes) * step))), None
+    if mode == "store":
+        store = _tide_store(tide[1])
+        every = store.stride(step)
+        first, errors = _store_first(store, starts, int(round(total_hours * 60 / step_minutes)),
+                                     every)
+        bad = first[:, None] < 0
+
+        def tide_at(t):
+            idx = np.where(bad, 0, first[:, None] + _sample_index(t, step_minutes) * every)
+            return round_values(np.where(bad, np.nan, store.values[idx]))
+        return tide_at, errors
+    raise ValueError(f"Unknown tide mode: {mode!r}")
+
+
+def call_tides(tide, arrivals, total_hours, utc_offset_hours=7):
+    """Hourly tide per call: ``(T,)`` for the sample table, else ``(N, T)``.
+
+    ``tide`` is ``("table",)``, ``("harmonic", constituents_path)`` or
+    ``("store", tide_store_path)``; ``arrivals`` are local ``datetime64``.
+    A store window that is outside the store or has gaps raises
+    ``ValueError``; ``checked_tides`` reports those per call instead.
+    """
+    mode = tide[0]
+    if mode == "table":
+        return np.asarray(default_tide(total_hours), dtype=float)
+    if arrivals is None:
+        raise ValueError(f"Tide mode {mode!r} needs an 'arrival' column")
+    starts = _utc_starts(arrivals, utc_offset_hours)
+    if mode == "harmonic":
+        from ukc.tide import predict
+        times = starts[:, None] + np.arange(total_hours) * np.timedelta64(1, "h")
+        return round_values(predict(_constituents(tide[1]), times))
+    if mode == "store":
+        water, errors = store_tides(tide[1], starts, total_hours)
+        bad = np.flatnonzero(errors != "")
+        if bad.size:
+            raise ValueError(f"Arrival {arrivals[bad[0]]}: {errors[bad[0]]}")
+        return water
+    raise ValueError(f"Unknown tide mode: {mode!r}")
+
+
+def checked_tides(tide, arrivals, total_hours, utc_offset_hours=7):
+    """``call_tides`` that reports tide-store gaps per call: ``(water, errors)``.
+
+    ``errors`` is as for ``store_tides`` with a tide store, else ``None``.
+    """
+    if tide[0] == "store" and arrivals is not None:
+        return store_tides(tide[1], _utc_starts(arrivals, utc_offset_hours), total_hours)
+    return call_tides(tide, arrivals, total_hours, utc_offset_hours), None
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+def evaluate_calls(calls, tide, total_hours, utc_offset_hours=7, series=False, step_minutes=60,
+                   moves=None):
+    """Evaluate one chunk of calls (a dict of column arrays).
+
+    Returns ``(summary, series)`` dicts of column arrays; ``series`` is the
+    long-format per-hour table, or ``None`` when not requested. Without a
+    series the summary is streamed through ``summarize_batch``, so memory
+    does not grow with the horizon or the step; the series needs 60-minute
+    steps. With a tide store, calls without a complete tide window keep
+    their summary row with the reason in ``tide_error``, NaN results and
+    ``safe`` False, and are left out of ``series``. ``moves`` is the path of a
+    move list whose drafts replace ``draft_change_rate`` (calls with no
+    moves keep ``tkt1``).
+    """
+    arrivals = calls.get("arrival")
+    draft = None
+    if moves is not None:
+        if arrivals is None:
+            raise ValueError("A move list needs the calls' arrival times")
+        from ukc.moves import read_moves, season_drafts
+        draft = season_drafts(read_moves(moves), {"call_id": calls["call_id"], "arrival": arrivals,
+                                                  "tkt1": calls["tkt1"]},
+                              total_hours, step_minutes)["draft"]
+    if series:
+        if step_minutes != 60:
+            raise ValueError("The per-hour series needs 60-minute steps")
+        water, tide_error = checked_tides(tide, arrivals, total_hours, utc_offset_hours)
+        tide_at = water
+    else:
+        tide_at, tide_error = stream_tides(tide, arrivals, total_hours, step_minutes,
+                                           utc_offset_hours)
+    params = {c: calls[c] for c in CALL_COLUMNS}
+    res = summarize_batch(tide_at, **params, total_hours=total_hours, step_minutes=step_minutes,
+                          draft=draft)
+    n = res["min_ukc"].size
+    summary = {"call_id": calls["call_id"]}
+    if arrivals is not None:
+        summary["arrival"] = arrivals
+    summary.update(
+        throughput=res["throughput"],
+        unload_time=res["unload_time"],
+        load_time=res["load_time"],
+        berth_time=res["berth_time"],
+        min_ukc=res["min_ukc"],
+        min_ukc_hour=res["min_ukc_time"],
+        violation_hours=res["violation_hours"],
+        safe=res["violations"] == 0,
+    )
+    keep = np.ones(n, dtype=bool)
+    if tide_error is not None:
+        bad = tide_error != ""
+        summary.update(
+            violation_hours=np.where(bad, np.nan, summary["violation_hours"]),
+            safe=summary["safe"] & ~bad,
+            tide_error=tide_error,
+        )
+        keep = ~bad
+    if not series:
+        return summary, None
+    full = evaluate_batch(water, **params, total_hours=total_hours, draft=draft)
+    return summary, {
+        "call_id": np.repeat(calls["call_id"][keep], total_hours),
+        "hour": np.tile(np.arange(total_hours), int(keep.sum())),
+        "tide": np.broadcast_to(water, (n, total_hours))[keep].ravel(),
+        "draft": full["draft"][keep].ravel(),
+        "ukc_actual": full["ukc_actual"][keep].ravel(),
+        "ukc_req": full["ukc_req"][keep].ravel(),
+    }
+
+
+# =============================================================================
+# INPUT / OUTPUT
+# =============================================================================
+def read_calls(path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield chunks of ``path`` (CSV or Parquet) as dicts of column arrays."""
+    import pandas as pd
+
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        frames = (batch.to_pandas()
+                  for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows))
+    else:
+        frames = pd.read_csv(path, chunksize=chunk_rows)
+    offset = 0
+    for frame in frames:
+        calls = {c: frame[c].to_numpy(dtype=float) if c in frame else np.full(len(frame), d, float)
+                 for c, d in CALL_COLUMNS.items()}
+        calls["call_id"] = (frame["call_id"].to_numpy() if "call_id" in frame
+                            else np.arange(offset, offset + len(frame)))
+        if "arrival" in frame:
+            calls["arrival"] = pd.to_datetime(frame["arrival"]).to_numpy("datetime64[s]")
+        offset += len(frame)
+        yield calls
+
+
+class TableWriter:
+    """Append column dicts to a CSV or Parquet file as they arrive."""
+
+    def __init__(self, path):
+        self.path = path
+        self._parquet = path.endswith(".parquet")
+        self._writer = None
+        self._started = False
+
+    def write(self, columns):
+        import pandas as pd
+
+        frame = pd.DataFrame(columns)
+        if self._parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="a" if self._started else "w",
+                         header=not self._started, index=False)
+        self._started = True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# =============================================================================
+# DRIVER
+# =============================================================================
+def run_batch(calls_path, out_path, series_path=None, tide=("table",), total_hours=None,
+              utc_offset_hours=7, workers=None, chunk_rows=DEFAULT_CHUNK_ROWS, step_minutes=60,
+              moves_path=None):
+    """Evaluate every call in ``calls_path``; returns the number of calls.
+
+    ``workers=1`` runs in-process. Otherwise at most ``2 * workers`` chunks
+    are in flight, and results are written in input order.
+    """
+    total_hours = int(total_hours or DEFAULTS["total_hours"])
+    args = (tide, total_hours, utc_offset_hours, series_path is not None, step_minutes,
+            moves_path)
+    chunks = read_calls(calls_path, chunk_rows)
+    count = 0
+    with TableWriter(out_path) as out, (TableWriter(series_path) if series_path else nullcontext()) as series_out:
+        def emit(result):
+            nonlocal count
+            summary, series = result
+            out.write(summary)
+            if series is not None:
+                series_out.write(series)
+            count += len(summary["call_id"])
+
+        if workers == 1:
+            for calls in chunks:
+                emit(evaluate_calls(calls, *args))
+            return count
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            limit = 2 * (workers or os.cpu_count() or 1)
+            for calls in chunks:
+                pending.append(pool.submit(evaluate_calls, calls, *args))
+                if len(pending) >= limit:
+                    emit(pending.popleft().result())
+            while pending:
+                emit(pending.popleft().result())
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate UKC for a file of vessel calls.")
+    parser.add_argument("calls", help="CSV or Parquet of vessel calls")
+    parser.add_argument("out", help="summary output (.csv or .parquet)")
+    parser.add_argument("--series", help="optional per-hour series output (.csv or .parquet)")
+    parser.add_argument("--tide", choices=TIDE_MODES, default="table")
+    parser.add_argument("--constituents", default=DEFAULT_CONSTITUENTS)
+    parser.add_argument("--tide-store", default=os.path.join("data", "namdinhvu_tide.ukt"))
+    parser.add_argument("--hours", type=int, default=DEFAULTS["total_hours"])
+    parser.add_argument("--step-minutes", type=int, choices=STEP_MINUTES, default=60,
+                        help="sample step of the UKC check (the series needs 60)")
+    parser.add_argument("--moves", help="container move list (CSV or Parquet, see ukc.moves) "
+                                        "giving the draft instead of draft_change_rate")
+    parser.add_argument("--utc-offset", type=float, default=7.0,
+                        help="hours between local arrival times and UTC")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args(argv)
+    if args.series and args.step_minutes != 60:
+        parser.error("--series needs --step-minutes 60")
+    tide = {"table": ("table",), "harmonic": ("harmonic", args.constituents),
+            "store": ("store", args.tide_store)}[args.tide]
+    started = time.perf_counter()
+    count = run_batch(args.calls, args.out, args.series, tide, args.hours, args.utc_offset,
+                      args.workers, args.chunk_rows, args.step_minutes, args.moves)
+    print(f"{count} calls in {time.perf_counter() - started:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Memory-mapped berth bathymetry rasters and hull-footprint depth queries.
+
+A raster file is a 64-byte header followed by one fixed-dtype 2-D array of
+bed elevations (m, chart datum, negative like ``bottom``; NaN = no data)::
+
+    magic  8s   b"UKCBATH1"
+    dtype  8s   NumPy dtype string, e.g. b"<f4"
+    nrows  q    cells off the quay (y)
+    ncols  q    cells along the quay (x)
+    x0     d    x of the first column's left edge (m along the quay)
+    y0     d    y of the first row's near edge (m off the quay line)
+    cell   d    cell size (m)
+
+The grid is in the berth's local frame (x along the fender line, y away from
+it), so a vessel alongside covers a rectangle of rows ``y in [offset,
+offset + beam]`` and columns ``x in [position, position + loa]``. Rows are
+stored in order of increasing y, so a vessel's band of rows is one contiguous
+slice of the map.
+
+The controlling bottom under the hull is the highest bed elevation in that
+rectangle. For a band of rows, ``BerthRaster`` reduces every column to its
+highest cell once (reading only those rows) and indexes the result with a
+``RangeMin``. Any position and length along the quay is then answered in
+O(1), together with a running count of columns with any unsurveyed cell in
+the band, so that gaps are never mistaken for deep water. The last
+``max_bands`` band indexes are kept per raster object (least recently used
+dropped first), since one raster is shared by every session; the survey
+itself never becomes Python objects.
+
+Convert an ESRI ASCII grid (``.asc``) once with::
+
+    python -m ukc.bathymetry survey.asc data/berth.ukb [--depth-positive]
+"""
+import argparse
+import itertools
+import struct
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from ukc.rangemin import RangeMin
+
+MAGIC = b"UKCBATH1"
+HEADER = struct.Struct("<8s8sqqddd")
+HEADER_SIZE = 64
+DEFAULT_DTYPE = "<f4"
+MAX_BANDS = 32            # band indexes kept per raster (one per beam / offset in use)
+
+
+def _header(dtype, nrows, ncols, x0, y0, cell):
+    raw = HEADER.pack(MAGIC, np.dtype(dtype).str.encode().ljust(8, b"\0"),
+                      nrows, ncols, x0, y0, cell)
+    return raw.ljust(HEADER_SIZE, b"\0")
+
+
+# =============================================================================
+# WRITING
+# =============================================================================
+def write_bathymetry(path, values, x0, y0, cell, dtype=DEFAULT_DTYPE):
+    """Write a whole grid (``values[row, col]``, row 0 nearest the quay)."""
+    values = np.asarray(values, dtype=dtype)
+    if values.ndim != 2:
+        raise ValueError("values must be a 2-D grid")
+    with open(path, "wb") as fh:
+        fh.write(_header(dtype, *values.shape, x0, y0, cell))
+        fh.write(values.tobytes())
+
+
+def _asc_header(fh):
+    """Header keys (lower case) and the tokens of the first data line."""
+    meta = {}
+    for line in fh:
+        parts = line.split()
+        if parts and not parts[0][0].isalpha():
+            return meta, parts
+        if parts:
+            meta[parts[0].lower()] = float(parts[1])
+    return meta, []
+
+
+def asc_to_bathymetry(asc_path, path, dtype=DEFAULT_DTYPE, depth_positive=False):
+    """Stream an ESRI ASCII grid into a raster file; returns ``(nrows, ncols)``.
+
+    ASCII grids list the row farthest from the origin first, so rows are
+    written bottom-up. ``NODATA_value`` cells become NaN. With
+    ``depth_positive`` the values are depths and are negated into
+    elevations.
+    """
+    with open(asc_path, encoding="utf-8") as fh:
+        meta, first = _asc_header(fh)
+        nrows, ncols, cell = int(meta["nrows"]), int(meta["ncols"]), meta["cellsize"]
+        # *llcenter gives the centre of the corner cell, *llcorner its corner
+        x0 = meta["xllcorner"] if "xllcorner" in meta else meta["xllcenter"] - cell / 2
+        y0 = meta["yllcorner"] if "yllcorner" in meta else meta["yllcenter"] - cell / 2
+        nodata = meta.get("nodata_value")
+
+        with open(path, "wb") as out:
+            out.write(_header(dtype, nrows, ncols, x0, y0, cell))
+            out.truncate(HEADER_SIZE + nrows * ncols * np.dtype(dtype).itemsize)
+        grid = np.memmap(path, dtype=dtype, mode="r+", offset=HEADER_SIZE, shape=(nrows, ncols))
+        tokens = itertools.chain(first, (t for line in fh for t in line.split()))
+        for k in range(nrows):
+            row = np.fromiter(tokens, dtype=float, count=ncols)
+            if nodata is not None:
+                row[row == nodata] = np.nan
+            grid[nrows - 1 - k] = -row if depth_positive else row
+        grid.flush()
+        del grid
+    return nrows, ncols
+
+
+# =============================================================================
+# READING
+# =============================================================================
+class BerthRaster:
+    """Read-only view of a raster file with cached per-band footprint indexes."""
+
+    def __init__(self, path, max_bands=MAX_BANDS):
+        with open(path, "rb") as fh:
+            magic, dtype, nrows, ncols, x0, y0, cell = HEADER.unpack(fh.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a bathymetry raster file")
+        self.path = path
+        self.dtype = np.dtype(dtype.rstrip(b"\0").decode())
+        self.x0, self.y0, self.cell = x0, y0, cell
+        self.values = np.memmap(path, dtype=self.dtype, mode="r",
+                                offset=HEADER_SIZE, shape=(nrows, ncols))
+        self.max_bands = int(max_bands)
+        self._bands = OrderedDict()     # (r0, r1) -> (index, gaps), least recent first
+        self._lock = threading.Lock()
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @property
+    def extent(self):
+        """``(x_min, x_max, y_min, y_max)`` of the surveyed grid."""
+        nrows, ncols = self.shape
+        return (self.x0, self.x0 + ncols * self.cell, self.y0, self.y0 + nrows * self.cell)
+
+    def _cells(self, start, stop, origin, n, axis):
+        """Cells ``[i0, i1)`` touched by the interval ``[start, stop]``."""
+        i0 = np.floor((np.asarray(start, dtype=float) - origin) / self.cell + 1e-9).astype(np.intp)
+        i1 = np.ceil((np.asarray(stop, dtype=float) - origin) / self.cell - 1e-9).astype(np.intp)
+        i1 = np.maximum(i1, i0 + 1)
+        if np.any(i0 < 0) or np.any(i1 > n):
+            lo, hi = origin, origin + n * self.cell
+            raise ValueError(f"Footprint {axis} range is outside the survey ({lo:g}-{hi:g} m)")
+        return i0, i1
+
+    def band(self, r0, r1):
+        """Index for rows ``[r0, r1)``: shallowest cell per column, RangeMin, gap counts."""
+        key = (int(r0), int(r1))
+        with self._lock:
+            if key in self._bands:
+                self._bands.move_to_end(key)
+                return self._bands[key]
+        rows = self.values[key[0]:key[1]]
+        # a column is a gap if any cell under the hull is unsurveyed
+        gap = np.isnan(rows).any(axis=0)
+        top = np.fmax.reduce(rows, axis=0).astype(float)
+        band = RangeMin(np.where(gap, np.inf, -top)), np.concatenate([[0], np.cumsum(gap)])
+        with self._lock:
+            self._bands[key] = band
+            while len(self._bands) > self.max_bands:
+                self._bands.popitem(last=False)
+        return band
+
+    def footprint_bottom(self, position, loa, beam, offset=0.0):
+        """Highest bed elevation under the hull (controlling ``bottom``).
+
+        ``position`` is the x of the hull's quay-side end (e.g. the stern
+        mark on the fender line) and may be an array for many berth
+        positions at once; ``offset`` is the hull's distance off the quay
+        line. Footprints over any unsurveyed cell give NaN.
+        """
+        r0, r1 = self._cells(offset, offset + beam, self.y0, self.shape[0], "y")
+        index, gaps = self.band(r0, r1)
+        position = np.asarray(position, dtype=float)
+        c0, c1 = self._cells(position, position + loa, self.x0, self.shape[1], "x")
+        bottom = -index.min(c0, c1)
+        bottom = np.where(gaps[c1] - gaps[c0] > 0, np.nan, bottom)
+        return bottom if bottom.ndim else float(bottom)
+
+    def controlling_cell(self, position, loa, beam, offset=0.0):
+        """The shallowest cell under the hull: ``bottom`` and its cell centre."""
+        r0, r1 = self._cells(offset, offset + beam, self.y0, self.shape[0], "y")
+        index, gaps = self.band(r0, r1)
+        c0, c1 = self._cells(position, position + loa, self.x0, self.shape[1], "x")
+        if gaps[c1] - gaps[c0]:
+            raise ValueError("Footprint covers unsurveyed cells")
+        col = index.argmin(int(c0), int(c1))
+        row = r0 + int(np.nanargmax(self.values[r0:r1, col]))
+        return {"bottom": float(self.values[row, col]),
+                "x": float(self.x0 + (col + 0.5) * self.cell),
+                "y": float(self.y0 + (row + 0.5) * self.cell)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert an ESRI ASCII grid into a "
+                                                 "bathymetry raster file.")
+    parser.add_argument("asc_path")
+    parser.add_argument("path")
+    parser.add_argument("--dtype", default=DEFAULT_DTYPE)
+    parser.add_argument("--depth-positive", action="store_true",
+                        help="grid values are depths (positive down), not elevations")
+    args = parser.parse_args(argv)
+    nrows, ncols = asc_to_bathymetry(args.asc_path, args.path, args.dtype, args.depth_positive)
+    raster = BerthRaster(args.path)
+    x_min, x_max, y_min, y_max = raster.extent
+    print(f"{nrows} x {ncols} cells of {raster.cell:g} m, "
+          f"x {x_min:g}..{x_max:g}, y {y_min:g}..{y_max:g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Default vessel call and sample tide table (from the original Excel sheet)."""
+import numpy as np
+
+from ukc.engine import round_values, time_grid
+
+DEFAULTS = {
+    "vessel_name": "NORDSPRING", "imo": "9625346",
+    "port": "Namdinhvu Port", "cargo_type": "Container",
+    "loa": 208.0, "bt": 29.8, "tkt1": 9.5, "tkt2": 9.0, "dwt": 34800,
+    "import_cont": 350, "export_cont": 364,
+    "crane_rate": 28, "cranes": 2, "spare_cranes": 1,
+    "aux_time": 1.0, "wait_time": 2.25, "draft_change_rate": 0.28,
+    "bottom_elevation": -9.50, "op_water_level": 2.25, "total_hours": 48,
+}
+
+# Hourly water levels (m, chart datum) over 48 h; repeated for longer runs.
+DEFAULT_TIDE = [
+    2.8, 3.1, 3.3, 3.5, 3.5, 3.4, 3.2, 2.9, 2.6, 2.2,
+    1.8, 1.5, 1.2, 1.0, 0.8, 0.7, 0.6, 0.5, 0.6, 0.8,
+    1.0, 1.4, 1.8, 2.2, 2.6, 2.9, 3.2, 3.4, 3.5, 3.4,
+    3.3, 3.1, 2.8, 2.5, 2.1, 1.8, 1.6, 1.3, 1.2, 1.0,
+    0.9, 0.7, 0.6, 0.6, 0.7, 0.8, 0.9, 1.2,
+]
+
+# Tide gauge the dashboard subscribes to (host:port, see ukc.gauge)
+DEFAULT_GAUGE = "127.0.0.1:8765"
+
+
+def default_tide(total_hours, step_minutes=60):
+    """The sample table tiled to ``total_hours``.
+
+    Sub-hourly steps interpolate linearly between the hourly values and are
+    rounded to 2 decimals.
+    """
+    tide_data = DEFAULT_TIDE.copy()
+    while len(tide_data) <= total_hours:
+        tide_data.extend(DEFAULT_TIDE)
+    if step_minutes == 60:
+        return tide_data[:total_hours]
+    levels = np.interp(time_grid(total_hours, step_minutes), np.arange(len(tide_data)), tide_data)
+    return round_values(levels).tolist()
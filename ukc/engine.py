@@ -0,0 +1,360 @@
+"""Array-based UKC calculation engine.
+
+The draft curve is piecewise linear (wait, unload, load, final) and UKC is
+element-wise arithmetic, so every step works on whole NumPy arrays. The list
+functions at the bottom keep the original dashboard API as thin wrappers.
+"""
+import numpy as np
+
+
+# =============================================================================
+# ROUNDING
+# =============================================================================
+def round_values(values, decimals=2, block=1 << 15):
+    """Element-wise equivalent of the builtin ``round(x, decimals)``.
+
+    ``np.round`` scales by ``10**decimals`` before rounding, which flips the
+    few values sitting on a half step (e.g. ``0.1 * 9.45``). Those are
+    re-rounded with the builtin so results match the list API exactly.
+    Work is done in cache-sized blocks so long series stay memory-bound once.
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.empty_like(values)
+    flat_in, flat_out = values.reshape(-1), out.reshape(-1)
+    scale = 10.0 ** decimals
+    buf = np.empty(min(block, flat_in.size))
+    near_half = []
+    for start in range(0, flat_in.size, block):
+        v = flat_in[start:start + block]
+        o = flat_out[start:start + block]
+        b = buf[:v.size]
+        np.multiply(v, scale, out=b)
+        np.rint(b, out=o)
+        np.subtract(b, o, out=b)
+        np.abs(b, out=b)
+        o /= scale
+        tie = b > 0.5 - 1e-6
+        if tie.any():
+            near_half.append(np.flatnonzero(tie) + start)
+    if near_half:
+        idx = np.concatenate(near_half)
+        ties, inverse = np.unique(flat_in[idx], return_inverse=True)
+        fixed = np.array([round(float(v), decimals) for v in ties])
+        flat_out[idx] = fixed[inverse]
+    return out
+
+
+def _maybe_round(values, decimals):
+    return values if decimals is None else round_values(values, decimals)
+
+
+# =============================================================================
+# DRAFT CURVE
+# =============================================================================
+def phase_times(unload_time, load_time, wait_time, aux_time):
+    """End times (h) of the wait, unload and load phases."""
+    t_phase_a_end = wait_time + aux_time / 2
+    t_phase_b_end = t_phase_a_end + unload_time
+    t_phase_c_end = t_phase_b_end + load_time
+    return t_phase_a_end, t_phase_b_end, t_phase_c_end
+
+
+def draft_curve(t, tkt1, unload_time, load_time, wait_time, aux_time,
+                draft_change_rate):
+    """Unrounded draft (m) at times ``t`` (h). All arguments broadcast."""
+    t = np.asarray(t, dtype=float)
+    t_phase_a_end, t_phase_b_end, t_phase_c_end = phase_times(
+        unload_time, load_time, wait_time, aux_time)
+    tkt_min = tkt1 - (unload_time * draft_change_rate)
+    tkt_final = tkt_min + (load_time * draft_change_rate)
+    return np.where(
+        t < t_phase_a_end, tkt1,
+        np.where(
+            t < t_phase_b_end, tkt1 - ((t - t_phase_a_end) * draft_change_rate),
+            np.where(
+                t < t_phase_c_end, tkt_min + ((t - t_phase_b_end) * draft_change_rate),
+                tkt_final)))
+
+
+def tkt_series_array(tkt1, unload_time, load_time, wait_time, aux_time,
+                     draft_change_rate, total_hours, decimals=2):
+    """Hourly draft series for ``total_hours`` hours as a NumPy array.
+
+    Hours are sorted, so each phase is a contiguous slice and is filled
+    directly instead of going through ``draft_curve``'s nested ``where``.
+    """
+    hours = np.arange(total_hours, dtype=float)
+    t_phase_a_end, t_phase_b_end, t_phase_c_end = phase_times(
+        unload_time, load_time, wait_time, aux_time)
+    i_a, i_b, i_c = np.searchsorted(
+        hours, [t_phase_a_end, t_phase_b_end, t_phase_c_end], side="left")
+    i_b, i_c = max(i_a, i_b), max(i_a, i_b, i_c)
+    tkt_min = tkt1 - (unload_time * draft_change_rate)
+    tkt = np.empty(total_hours)
+    tkt[:i_a] = tkt1
+    tkt[i_a:i_b] = tkt1 - ((hours[i_a:i_b] - t_phase_a_end) * draft_change_rate)
+    tkt[i_b:i_c] = tkt_min + ((hours[i_b:i_c] - t_phase_b_end) * draft_change_rate)
+    tkt[i_c:] = tkt_min + (load_time * draft_change_rate)
+    return _maybe_round(tkt, decimals)
+
+
+# =============================================================================
+# UKC
+# =============================================================================
+def ukc_array(tide, tkt, bottom, decimals=2):
+    """Actual UKC = (water level + |bottom|) - draft."""
+    ukc = np.asarray(tide, dtype=float) + np.abs(bottom)
+    ukc -= np.asarray(tkt, dtype=float)
+    return _maybe_round(ukc, decimals)
+
+
+def ukc_required_array(tkt, berth_time, t=None, decimals=2):
+    """Required UKC: 10% of draft while at berth, 20% afterwards.
+
+    ``t`` defaults to integer hours ``0..len(tkt)-1`` along the last axis.
+    """
+    tkt = np.asarray(tkt, dtype=float)
+    if t is None and tkt.ndim == 1 and np.ndim(berth_time) == 0:
+        # Integer hours: the berth/after-berth split is a single index.
+        split = min(max(int(np.ceil(berth_time)), 0), tkt.size)
+        req = 0.2 * tkt
+        req[:split] = 0.1 * tkt[:split]
+        return _maybe_round(req, decimals)
+    if t is None:
+        t = np.arange(tkt.shape[-1], dtype=float)
+    req = np.where(np.asarray(t) < berth_time, 0.1, 0.2) * tkt
+    return _maybe_round(req, decimals)
+
+
+# =============================================================================
+# BATCH EVALUATION (N vessels / scenarios x T hours)
+# =============================================================================
+def operation_times(import_cont, export_cont, crane_rate, cranes, wait_time,
+                    aux_time):
+    """Throughput and unload/load/berth times, as derived in the sidebar.
+
+    Works on scalars or arrays; times are rounded to 2 decimals and are 0
+    when the throughput is not positive.
+    """
+    throughput = np.asarray(crane_rate) * np.asarray(cranes)
+    safe = np.where(throughput > 0, throughput, 1)
+    unload_time = np.where(throughput > 0, round_values(import_cont / safe), 0.0)
+    load_time = np.where(throughput > 0, round_values(export_cont / safe), 0.0)
+    berth_time = round_values(wait_time + aux_time + unload_time + load_time)
+    return throughput, unload_time, load_time, berth_time
+
+
+def evaluate_batch(tide, tkt1, import_cont, export_cont, crane_rate, cranes,
+                   wait_time, aux_time, draft_change_rate, bottom,
+                   total_hours=None, draft=None):
+    """Evaluate N scenarios at once by broadcasting.
+
+    Every vessel/operation argument is a scalar or a length-N array. ``tide``
+    is either one shared series ``(T,)`` or one series per scenario
+    ``(N, T)``. ``draft``, when given, is a measured draft series ``(T,)`` or
+    ``(N, T)`` (e.g. from ``ukc.moves``) used instead of ``draft_curve``; the
+    operation times still set the end of the berth stay. Returns a dict of
+    ``(N,)`` operation times and ``(N, T)`` draft, UKC, required UKC and
+    violation matrices, identical row by row to the single-vessel functions.
+    """
+    params = np.broadcast_arrays(*(np.atleast_1d(np.asarray(p, dtype=float)) for p in (
+        tkt1, import_cont, export_cont, crane_rate, cranes, wait_time, aux_time,
+        draft_change_rate, bottom)))
+    (tkt1, import_cont, export_cont, crane_rate, cranes, wait_time, aux_time,
+     draft_change_rate, bottom) = params
+    tide = np.asarray(tide, dtype=float)
+    if total_hours is None:
+        total_hours = tide.shape[-1]
+    tide = tide[..., :total_hours]
+
+    throughput, unload_time, load_time, berth_time = operation_times(
+        import_cont, export_cont, crane_rate, cranes, wait_time, aux_time)
+    hours = np.arange(total_hours, dtype=float)
+    col = (slice(None), None)
+    if draft is None:
+        draft = draft_curve(hours, tkt1[col], unload_time[col], load_time[col], wait_time[col],
+                            aux_time[col], draft_change_rate[col])
+    else:
+        draft = np.broadcast_to(np.asarray(draft, dtype=float)[..., :total_hours],
+                                (tkt1.size, total_hours))
+    draft = round_values(draft)
+    ukc_actual = ukc_array(tide, draft, bottom[col])
+    ukc_req = ukc_required_array(draft, berth_time[col], t=hours)
+    violation = ukc_actual < ukc_req
+    return {
+        "throughput": throughput,
+        "unload_time": unload_time,
+        "load_time": load_time,
+        "berth_time": berth_time,
+        "draft": draft,
+        "ukc_actual": ukc_actual,
+        "ukc_req": ukc_req,
+        "violation": violation,
+        "violation_hours": violation.sum(axis=1),
+        "min_ukc": ukc_actual.min(axis=1),
+    }
+
+
+# =============================================================================
+# STREAMING SIMULATION (sub-hourly steps, long horizons)
+# =============================================================================
+STEP_MINUTES = (60, 15, 5, 1)
+CHUNK_SIZE = 1 << 16
+
+
+def time_grid(total_hours, step_minutes=60, start=0, stop=None):
+    """Sample times (h) ``start, start + step, ...`` below ``total_hours``."""
+    n = int(round(total_hours * 60 / step_minutes))
+    stop = n if stop is None else min(stop, n)
+    return np.arange(start, stop) * (step_minutes / 60)
+
+
+def simulate_chunks(tide, tkt1, unload_time, load_time, wait_time, aux_time,
+                    draft_change_rate, bottom, berth_time, total_hours,
+                    step_minutes=60, chunk_size=CHUNK_SIZE):
+    """Run the engine over ``[0, total_hours)`` in chunks of ``chunk_size`` samples.
+
+    ``tide`` is either an array-like with one level per sample, or a
+    callable ``tide(t_hours)`` evaluated chunk by chunk so the whole series
+    never has to exist in memory. Yields dicts of ``t``, ``tide``, ``draft``,
+    ``ukc_actual`` and ``ukc_req`` arrays; at 60-minute steps they equal the
+    hourly functions above.
+    """
+    n = int(round(total_hours * 60 / step_minutes))
+    for start in range(0, n, chunk_size):
+        t = time_grid(total_hours, step_minutes, start, start + chunk_size)
+        water = tide(t) if callable(tide) else np.asarray(tide[start:start + t.size], dtype=float)
+        draft = round_values(draft_curve(t, tkt1, unload_time, load_time, wait_time, aux_time,
+                                         draft_change_rate))
+        yield {
+            "t": t,
+            "tide": water,
+            "draft": draft,
+            "ukc_actual": ukc_array(water, draft, bottom),
+            "ukc_req": ukc_required_array(draft, berth_time, t=t),
+        }
+
+
+class RunningSummary:
+    """Min/max UKC and violation count accumulated chunk by chunk."""
+
+    def __init__(self, step_minutes=60):
+        self.step_minutes = step_minutes
+        self.samples = 0
+        self.violations = 0
+        self.min_ukc = np.inf
+        self.min_ukc_time = None
+        self.max_ukc = -np.inf
+        self.max_ukc_time = None
+
+    def update(self, chunk):
+        ukc = chunk["ukc_actual"]
+        if ukc.size == 0:
+            return
+        i, j = int(np.argmin(ukc)), int(np.argmax(ukc))
+        if ukc[i] < self.min_ukc:
+            self.min_ukc, self.min_ukc_time = float(ukc[i]), float(chunk["t"][i])
+        if ukc[j] > self.max_ukc:
+            self.max_ukc, self.max_ukc_time = float(ukc[j]), float(chunk["t"][j])
+        self.violations += int(np.count_nonzero(ukc < chunk["ukc_req"]))
+        self.samples += ukc.size
+
+    def result(self):
+        return {
+            "samples": self.samples,
+            "violations": self.violations,
+            "violation_hours": self.violations * self.step_minutes / 60,
+            "min_ukc": self.min_ukc,
+            "min_ukc_time": self.min_ukc_time,
+            "max_ukc": self.max_ukc,
+            "max_ukc_time": self.max_ukc_time,
+        }
+
+
+def summarize_stream(chunks, step_minutes=60):
+    """Consume ``simulate_chunks`` output and return only the running summary."""
+    summary = RunningSummary(step_minutes)
+    for chunk in chunks:
+        summary.update(chunk)
+    return summary.result()
+
+
+def summarize_batch(tide, tkt1, import_cont, export_cont, crane_rate, cranes,
+                    wait_time, aux_time, draft_change_rate, bottom, total_hours,
+                    step_minutes=60, chunk_size=CHUNK_SIZE, draft=None):
+    """Per-scenario summary of N scenarios without their ``(N, T)`` matrices.
+
+    Arguments are as for ``evaluate_batch``, except that ``tide`` may also be
+    a callable ``tide(t_hours)`` returning ``(len(t),)`` or ``(N, len(t))``
+    levels, and ``draft`` has one value per sample of ``step_minutes``. Time
+    is processed in blocks of about ``chunk_size`` values in total, so
+    memory does not grow with the horizon or the step. Returns the
+    ``(N,)`` operation times, ``min_ukc`` / ``min_ukc_time`` (h),
+    ``violations`` (samples) and ``violation_hours``; at 60-minute steps
+    they equal ``evaluate_batch``.
+    """
+    params = np.broadcast_arrays(*(np.atleast_1d(np.asarray(p, dtype=float)) for p in (
+        tkt1, import_cont, export_cont, crane_rate, cranes, wait_time, aux_time,
+        draft_change_rate, bottom)))
+    (tkt1, import_cont, export_cont, crane_rate, cranes, wait_time, aux_time,
+     draft_change_rate, bottom) = params
+    throughput, unload_time, load_time, berth_time = operation_times(
+        import_cont, export_cont, crane_rate, cranes, wait_time, aux_time)
+    n_rows = tkt1.size
+    n = int(round(total_hours * 60 / step_minutes))
+    block = max(1, chunk_size // n_rows)
+    col = (slice(None), None)
+    rows = np.arange(n_rows)
+    min_ukc = np.full(n_rows, np.inf)
+    min_ukc_time = np.full(n_rows, np.nan)
+    violations = np.zeros(n_rows, dtype=np.int64)
+    if not callable(tide):
+        tide = np.asarray(tide, dtype=float)
+    if draft is not None:
+        draft = np.asarray(draft, dtype=float)
+    for start in range(0, n, block):
+        t = time_grid(total_hours, step_minutes, start, start + block)
+        water = tide(t) if callable(tide) else tide[..., start:start + t.size]
+        if draft is None:
+            block_draft = round_values(draft_curve(
+                t, tkt1[col], unload_time[col], load_time[col], wait_time[col], aux_time[col],
+                draft_change_rate[col]))
+        else:
+            block_draft = round_values(draft[..., start:start + t.size])
+        ukc = ukc_array(water, block_draft, bottom[col])
+        violations += np.count_nonzero(
+            ukc < ukc_required_array(block_draft, berth_time[col], t=t), axis=1)
+        ukc = np.where(np.isnan(ukc), np.inf, ukc)    # argmin would stop at the first NaN
+        i = ukc.argmin(axis=1)
+        lower = ukc[rows, i] < min_ukc
+        min_ukc = np.where(lower, ukc[rows, i], min_ukc)
+        min_ukc_time = np.where(lower, t[i], min_ukc_time)
+    nan = np.isnan(min_ukc_time)     # rows with no usable tide at all (NaN levels)
+    return {
+        "throughput": throughput,
+        "unload_time": unload_time,
+        "load_time": load_time,
+        "berth_time": berth_time,
+        "min_ukc": np.where(nan, np.nan, min_ukc),
+        "min_ukc_time": min_ukc_time,
+        "violations": violations,
+        "violation_hours": violations * (step_minutes / 60),
+    }
+
+
+# =============================================================================
+# LIST API (dashboard compatibility)
+# =============================================================================
+def calculate_tkt_series(tkt1, unload_time, load_time, wait_time, aux_time,
+                          draft_change_rate, total_hours, berth_time):
+    return tkt_series_array(tkt1, unload_time, load_time, wait_time, aux_time,
+                            draft_change_rate, total_hours).tolist()
+
+
+def calculate_ukc(tide_list, tkt_list, bottom):
+    n = min(len(tide_list), len(tkt_list))
+    return ukc_array(tide_list[:n], tkt_list[:n], bottom).tolist()
+
+
+def calculate_ukc_required(tide_list, tkt_list, bottom, berth_time, total_hours):
+    return ukc_required_array(tkt_list[:total_hours], berth_time).tolist()
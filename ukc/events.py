@@ -0,0 +1,197 @@
+"""Exact continuous-time UKC violation detection.
+
+The draft is piecewise linear (wait, unload, load, final) and the tide is
+interpolated between its samples either linearly or with a cubic Hermite
+(Catmull-Rom) spline. Splitting time at every tide sample, phase boundary and
+the end of the berth stay gives segments on which the UKC slack
+``tide + |bottom| - draft - required`` is a polynomial of degree <= 3. Each
+segment is cut at its stationary points so the slack is monotone between cut
+points, and sign changes are located by vectorized bisection. The cost is
+O(number of segments), independent of any output resolution.
+"""
+import numpy as np
+
+from ukc.engine import draft_curve, phase_times
+
+BISECT_ITERATIONS = 60
+
+
+# =============================================================================
+# PIECEWISE POLYNOMIALS
+# =============================================================================
+def tide_coefficients(tide_times, tide, interp="linear"):
+    """Per-interval cubic coefficients of the interpolated tide.
+
+    Row ``j`` holds ``(a0, a1, a2, a3)`` in ``u = t - tide_times[j]`` for
+    ``tide_times[j] <= t <= tide_times[j + 1]``.
+    """
+    tide_times = np.asarray(tide_times, dtype=float)
+    tide = np.asarray(tide, dtype=float)
+    h = np.diff(tide_times)
+    dy = np.diff(tide)
+    coef = np.zeros((h.size, 4))
+    coef[:, 0] = tide[:-1]
+    if interp == "linear":
+        coef[:, 1] = dy / h
+    elif interp == "spline":
+        slope = np.gradient(tide, tide_times)
+        m0, m1 = slope[:-1], slope[1:]
+        coef[:, 1] = m0
+        coef[:, 2] = (3 * dy / h - 2 * m0 - m1) / h
+        coef[:, 3] = (m0 + m1 - 2 * dy / h) / h ** 2
+    else:
+        raise ValueError(f"Unknown tide interpolation: {interp!r}")
+    return coef
+
+
+def _shift(coef, delta):
+    """Re-expand cubics in ``u`` around ``u = delta`` (Taylor shift)."""
+    a0, a1, a2, a3 = coef.T
+    return np.column_stack([
+        a0 + delta * (a1 + delta * (a2 + delta * a3)),
+        a1 + delta * (2 * a2 + 3 * delta * a3),
+        a2 + 3 * delta * a3,
+        a3,
+    ])
+
+
+def _polyval(coef, s):
+    return coef[:, [0]] + s * (coef[:, [1]] + s * (coef[:, [2]] + s * coef[:, [3]]))
+
+
+def _stationary_points(coef, length):
+    """Roots of the derivative inside ``(0, length)``, NaN where absent."""
+    a, b, c = 3 * coef[:, 3], 2 * coef[:, 2], coef[:, 1]
+    roots = np.full((coef.shape[0], 2), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        quad = np.abs(a) > 1e-12
+        disc = b * b - 4 * a * c
+        sq = np.sqrt(np.where(disc >= 0, disc, np.nan))
+        roots[:, 0] = np.where(quad, (-b - sq) / (2 * a), -c / b)
+        roots[:, 1] = np.where(quad, (-b + sq) / (2 * a), np.nan)
+    inside = (roots > 0) & (roots < length[:, None])
+    return np.where(inside, roots, np.nan)
+
+
+def _monotone_cuts(coef, length):
+    """Sorted cut points per segment (ends + stationary points)."""
+    cuts = np.column_stack([np.zeros_like(length), _stationary_points(coef, length),
+                            length])
+    cuts = np.sort(cuts, axis=1)
+    return np.where(np.isnan(cuts), length[:, None], cuts)
+
+
+def _bisect(coef, lo, hi, f_lo):
+    """Vectorized bisection for roots known to lie in ``[lo, hi]``."""
+    for _ in range(BISECT_ITERATIONS):
+        mid = 0.5 * (lo + hi)
+        f_mid = _polyval(coef, mid)
+        left = np.sign(f_mid) == np.sign(f_lo)
+        lo = np.where(left, mid, lo)
+        f_lo = np.where(left, f_mid, f_lo)
+        hi = np.where(left, hi, mid)
+    return 0.5 * (lo + hi)
+
+
+# =============================================================================
+# SOLVER
+# =============================================================================
+def solve_violations(tide, tkt1, unload_time, load_time, wait_time, aux_time,
+                     draft_change_rate, bottom, berth_time, tide_times=None,
+                     horizon=None, interp="linear", draft=None):
+    """Exact violation intervals and minimum UKC over ``[0, horizon]`` hours.
+
+    ``tide`` is sampled at ``tide_times`` (default: integer hours); the
+    horizon defaults to the last sample. Returns a dict with ``intervals``
+    (``(k, 2)`` start/end hours where actual UKC < required UKC),
+    ``violation_hours`` (their total length), ``min_ukc`` / ``min_ukc_time``
+    and ``min_slack`` / ``min_slack_time`` (actual minus required).
+
+    ``draft``, when given, is a draft series sampled at ``tide_times`` (e.g.
+    from ``ukc.moves``) and is interpolated linearly between samples instead
+    of following ``draft_curve``.
+    """
+    tide = np.asarray(tide, dtype=float)
+    if tide_times is None:
+        tide_times = np.arange(tide.size, dtype=float)
+    tide_times = np.asarray(tide_times, dtype=float)
+    if horizon is None:
+        horizon = tide_times[-1]
+    horizon = min(float(horizon), tide_times[-1])
+    start = tide_times[0]
+
+    breaks = np.concatenate([
+        tide_times,
+        phase_times(unload_time, load_time, wait_time, aux_time),
+        [berth_time, horizon],
+    ])
+    knots = np.unique(breaks[(breaks >= start) & (breaks <= horizon)])
+    t0, t1 = knots[:-1], knots[1:]
+    length = t1 - t0
+    mid = 0.5 * (t0 + t1)
+
+    # Tide re-expanded around each segment start.
+    j = np.clip(np.searchsorted(tide_times, mid, side="right") - 1, 0, tide_times.size - 2)
+    tide_coef = _shift(tide_coefficients(tide_times, tide, interp)[j], t0 - tide_times[j])
+
+    # Draft is continuous and linear on each segment.
+    if draft is None:
+        d0 = draft_curve(t0, tkt1, unload_time, load_time, wait_time, aux_time,
+                         draft_change_rate)
+        d1 = draft_curve(t1, tkt1, unload_time, load_time, wait_time, aux_time,
+                         draft_change_rate)
+    else:
+        d0, d1 = (np.interp(x, tide_times, np.asarray(draft, dtype=float)) for x in (t0, t1))
+    d_slope = (d1 - d0) / length
+    # slack = ukc - k * draft with k = 0.1 at berth and 0.2 afterwards.
+    factor = np.where(mid < berth_time, 1.1, 1.2)
+
+    ukc_coef = tide_coef.copy()
+    ukc_coef[:, 0] += abs(bottom) - d0
+    ukc_coef[:, 1] -= d_slope
+    slack_coef = tide_coef.copy()
+    slack_coef[:, 0] += abs(bottom) - factor * d0
+    slack_coef[:, 1] -= factor * d_slope
+
+    # Minimum UKC: segment ends or stationary points.
+    ukc_cuts = _monotone_cuts(ukc_coef, length)
+    ukc_vals = _polyval(ukc_coef, ukc_cuts)
+    flat = np.argmin(ukc_vals)
+    seg, col = np.unravel_index(flat, ukc_vals.shape)
+
+    # Violations: roots between consecutive monotone cut points.
+    cuts = _monotone_cuts(slack_coef, length)
+    vals = _polyval(slack_coef, cuts)
+    lo, hi = cuts[:, :-1], cuts[:, 1:]
+    f_lo, f_hi = vals[:, :-1], vals[:, 1:]
+    crossing = (np.sign(f_lo) * np.sign(f_hi) < 0) & (hi > lo)
+    rows, cols = np.nonzero(crossing)
+    roots = np.full(lo.shape, np.nan)
+    if rows.size:
+        roots[rows, cols] = _bisect(slack_coef[rows], lo[rows, cols][:, None],
+                                    hi[rows, cols][:, None],
+                                    f_lo[rows, cols][:, None])[:, 0]
+    pieces = np.sort(np.column_stack([cuts, roots]), axis=1)
+    pieces = np.where(np.isnan(pieces), length[:, None], pieces)
+    a, b = pieces[:, :-1], pieces[:, 1:]
+    below = (_polyval(slack_coef, 0.5 * (a + b)) < 0) & (b > a)
+    starts, ends = (t0[:, None] + a)[below], (t0[:, None] + b)[below]
+    order = np.argsort(starts)
+    starts, ends = starts[order], ends[order]
+    if starts.size:
+        new = np.concatenate([[True], starts[1:] > ends[:-1] + 1e-9])
+        intervals = np.column_stack([starts[new], np.maximum.reduceat(ends, np.flatnonzero(new))])
+    else:
+        intervals = np.empty((0, 2))
+
+    slack_flat = np.argmin(vals)
+    s_seg, s_col = np.unravel_index(slack_flat, vals.shape)
+    return {
+        "intervals": intervals,
+        "violation_hours": float((intervals[:, 1] - intervals[:, 0]).sum()),
+        "min_ukc": float(ukc_vals[seg, col]),
+        "min_ukc_time": float(t0[seg] + ukc_cuts[seg, col]),
+        "min_slack": float(vals[s_seg, s_col]),
+        "min_slack_time": float(t0[s_seg] + cuts[s_seg, s_col]),
+        "segments": int(length.size),
+    }
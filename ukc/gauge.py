@@ -0,0 +1,290 @@
+"""Live tide-gauge ingestion: asyncio feed, ring buffer, incremental UKC.
+
+A gauge streams observations as newline-delimited JSON over TCP, one per
+line with local port time and level (m, chart datum)::
+
+    {"time": "2026-10-18T08:31:00", "level": 2.43}
+
+``GaugeFeed`` runs one asyncio loop in a background thread per process.
+It subscribes to the gauge, reconnects with a back-off when the link drops,
+and appends to a fixed-size ``RingBuffer``. Every dashboard session reads
+the same buffer, so a 1-minute feed costs one parse per sample however many
+sessions are open.
+
+``LiveUKC`` keeps the observed UKC of one scenario on its time grid. Each
+``update`` reads only the observations appended since the previous one and
+computes only the grid points between the previous and the newest
+observation, i.e. the tail that changed. Points past the newest observation
+stay NaN until data arrives, as do points inside feed outages longer than
+``MAX_GAP_HOURS``.
+
+``serve_simulated`` is a stand-in gauge for testing. It plays the sample
+tide table plus a slowly varying surge, optionally faster than real time::
+
+    python -m ukc.gauge serve --port 8765 --speed 60
+    python -m ukc.gauge watch 127.0.0.1:8765
+"""
+import argparse
+import asyncio
+import json
+import threading
+
+import numpy as np
+
+from ukc.defaults import DEFAULT_GAUGE, DEFAULT_TIDE
+from ukc.engine import round_values
+
+DEFAULT_CAPACITY = 7 * 24 * 60      # a week of 1-minute observations
+RECONNECT_SECONDS = (1.0, 30.0)     # first and longest back-off
+MAX_GAP_HOURS = 0.25                # no interpolation across longer feed outages
+
+
+def parse_address(address):
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+class RingBuffer:
+    """The latest ``capacity`` observations, safe to share between threads.
+
+    Observations must arrive in time order; older or repeated times are
+    dropped. ``count`` is the number ever appended, so readers ask for
+    "everything after sequence number n" with ``since``.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = int(capacity)
+        self.times = np.zeros(self.capacity, dtype="datetime64[s]")
+        self.levels = np.zeros(self.capacity)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def append(self, time, level):
+        """Add one observation; returns False when it is not newer than the last."""
+        time = np.datetime64(time, "s")
+        with self._lock:
+            if self.count and time <= self.times[(self.count - 1) % self.capacity]:
+                return False
+            i = self.count % self.capacity
+            self.times[i], self.levels[i] = time, level
+            self.count += 1
+        return True
+
+    def snapshot(self, since=0):
+        """``(times, levels, count)`` of the observations numbered ``since`` and later.
+
+        Observations already overwritten are skipped.
+        """
+        with self._lock:
+            count = self.count
+            since = max(since, count - self.capacity)
+            idx = np.arange(since, count) % self.capacity
+            return self.times[idx], self.levels[idx], count
+
+
+# =============================================================================
+# FEED (asyncio, background thread)
+# =============================================================================
+def parse_observation(line):
+    obs = json.loads(line)
+    return np.datetime64(obs["time"], "s"), float(obs["level"])
+
+
+async def subscribe(host, port, buffer, stop, status=None):
+    """Read observations from a gauge into ``buffer`` until ``stop`` is set."""
+    status = {} if status is None else status
+    delay = RECONNECT_SECONDS[0]
+    while not stop.is_set():
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError as exc:
+            status.update(connected=False, error=str(exc))
+        else:
+            status.update(connected=True, error=None)
+            delay = RECONNECT_SECONDS[0]
+            try:
+                while not stop.is_set():
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    try:
+                        buffer.append(*parse_observation(line))
+                    except (ValueError, KeyError, TypeError) as exc:
+                        status["error"] = f"bad observation: {exc}"
+            except OSError as exc:
+                status["error"] = str(exc)
+            finally:
+                writer.close()
+            status["connected"] = False
+        # Sleep before reconnecting, waking early on stop
+        try:
+            await asyncio.wait_for(stop.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+        delay = min(2 * delay, RECONNECT_SECONDS[1])
+
+
+class GaugeFeed:
+    """``subscribe`` on a daemon thread with its own event loop."""
+
+    def __init__(self, address=DEFAULT_GAUGE, capacity=DEFAULT_CAPACITY):
+        self.address = address
+        self.buffer = RingBuffer(capacity)
+        self.status = {"connected": False, "error": None}
+        self._loop = None
+        self._stop = None
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        ready = threading.Event()
+
+        async def run():
+            self._loop, self._stop = asyncio.get_running_loop(), asyncio.Event()
+            ready.set()
+            await subscribe(*parse_address(self.address), self.buffer, self._stop, self.status)
+
+        self._thread = threading.Thread(target=asyncio.run, args=(run(),), daemon=True,
+                                        name=f"gauge-{self.address}")
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self, timeout=5.0):
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(timeout)
+        self._thread = None
+
+
+# =============================================================================
+# INCREMENTAL UKC
+# =============================================================================
+class LiveUKC:
+    """Observed water level and UKC on a scenario's time grid.
+
+    ``start`` is the local time of hour 0; ``t`` (hours), ``draft`` and
+    ``ukc_req`` are the scenario's grid, rounded draft and required UKC.
+    """
+
+    def __init__(self, start, t, draft, ukc_req, bottom):
+        self.start = np.datetime64(start, "s")
+        self.t, self.draft, self.ukc_req, self.bottom = t, draft, ukc_req, bottom
+        self.level = np.full(t.size, np.nan)
+        self.ukc = np.full(t.size, np.nan)
+        self.filled = 0       # grid points before this index are final
+        self.seen = 0         # buffer sequence number consumed
+        self._last = None     # newest observation (hours, level) already used
+
+    def matches(self, start, t, draft, ukc_req, bottom):
+        """Whether this state belongs to the given scenario (same arrays)."""
+        return (self.start == np.datetime64(start, "s") and self.t is t and self.draft is draft
+                and self.ukc_req is ukc_req and self.bottom == bottom)
+
+    def update(self, buffer):
+        """Fold in new observations; returns the slice of grid points computed."""
+        times, levels, self.seen = buffer.snapshot(self.seen)
+        if not times.size:
+            return slice(self.filled, self.filled)
+        hours = (times - self.start) / np.timedelta64(1, "h")
+        if self._last is not None:
+            hours, levels = np.append(self._last[0], hours), np.append(self._last[1], levels)
+        self._last = (hours[-1], levels[-1])
+        lo = max(self.filled, int(np.searchsorted(self.t, hours[0], side="left")))
+        hi = int(np.searchsorted(self.t, hours[-1], side="right"))
+        if hi > lo:
+            t = self.t[lo:hi]
+            level = round_values(np.interp(t, hours, levels))
+            if hours.size > 1:
+                j = np.clip(np.searchsorted(hours, t), 1, hours.size - 1)
+                level[(hours[j] - hours[j - 1] > MAX_GAP_HOURS) & (hours[j] != t)] = np.nan
+            self.level[lo:hi] = level
+            self.ukc[lo:hi] = round_values(level + abs(self.bottom) - self.draft[lo:hi])
+        self.filled = max(self.filled, hi)
+        return slice(lo, max(lo, hi))
+
+    def latest(self):
+        """Index of the newest grid point with an observation, or ``None``."""
+        done = np.flatnonzero(~np.isnan(self.ukc[:self.filled]))
+        return int(done[-1]) if done.size else None
+
+
+# =============================================================================
+# SIMULATED GAUGE
+# =============================================================================
+def simulated_level(hours, surge):
+    """Sample tide table (hour 0 = table start, repeating) plus ``surge``."""
+    table = np.append(DEFAULT_TIDE, DEFAULT_TIDE[0])
+    return np.interp(np.asarray(hours) % len(DEFAULT_TIDE), np.arange(table.size), table) + surge
+
+
+async def serve_simulated(host="127.0.0.1", port=8765, start=None, interval=60.0, speed=1.0,
+                          surge_sd=0.05, seed=None):
+    """Stream simulated observations to every client every ``interval`` gauge seconds.
+
+    Gauge time starts at ``start`` (local, default today 00:00) and runs
+    ``speed`` times faster than the wall clock. The surge is an AR(1)
+    process with standard deviation ``surge_sd`` (m).
+    """
+    rng = np.random.default_rng(seed)
+    origin = np.datetime64(start or np.datetime64("today"), "s")
+    clock = origin
+    step = np.timedelta64(int(interval), "s")
+    clients = set()
+
+    async def handle(reader, writer):
+        clients.add(writer)
+        try:
+            await reader.read()     # until the client goes away
+        finally:
+            clients.discard(writer)
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    surge, keep = 0.0, 0.99
+    async with server:
+        while True:
+            hours = (clock - origin) / np.timedelta64(1, "h")
+            surge = keep * surge + np.sqrt(1 - keep ** 2) * surge_sd * rng.standard_normal()
+            line = json.dumps({"time": str(clock), "level": round(float(simulated_level(hours, surge)), 3)})
+            for writer in list(clients):
+                writer.write(line.encode() + b"\n")
+            await asyncio.gather(*(w.drain() for w in list(clients)), return_exceptions=True)
+            clock += step
+            await asyncio.sleep(interval / speed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulated tide gauge and feed monitor.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="run a simulated gauge")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=parse_address(DEFAULT_GAUGE)[1])
+    serve.add_argument("--start", help="local time of the first observation (default today 00:00)")
+    serve.add_argument("--interval", type=float, default=60.0, help="gauge seconds per observation")
+    serve.add_argument("--speed", type=float, default=1.0, help="gauge seconds per wall-clock second")
+    watch = sub.add_parser("watch", help="print observations from a gauge")
+    watch.add_argument("address", nargs="?", default=DEFAULT_GAUGE)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        print(f"Simulated gauge on {args.host}:{args.port} (x{args.speed:g})")
+        asyncio.run(serve_simulated(args.host, args.port, args.start, args.interval, args.speed))
+        return
+
+    async def watch_feed():
+        reader, _ = await asyncio.open_connection(*parse_address(args.address))
+        while line := await reader.readline():
+            time, level = parse_observation(line)
+            print(f"{time}  {level:6.2f} m")
+
+    asyncio.run(watch_feed())
+
+
+if __name__ == "__main__":
+    main()
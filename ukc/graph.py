@@ -0,0 +1,241 @@
+"""Reactive computation graph with memoized nodes.
+
+Each node declares the names it depends on; inputs are set with
+``Graph.set``. Every value carries a version that is bumped only when the
+value actually changes, and a node is recomputed only when the versions of
+its dependencies differ from the ones it was last computed from. A node whose
+new value equals the old one keeps its version, so its dependants are not
+recomputed either (early cutoff): changing ``bottom`` recomputes the UKC and
+summaries but not the draft series or the tide.
+
+Nodes marked ``persist=True`` are also looked up in a ``ScenarioStore`` by a
+content key of the graph inputs they depend on, before any dependency is
+evaluated. Nodes marked ``shared=True`` are looked up the same way in a
+``SharedCache``, a bounded in-memory LRU that one process hands to every
+session's graph, so a scenario or figure computed for one planner is reused
+by the next one asking for the same inputs (checked before the store).
+"""
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from ukc.engine import (RunningSummary, draft_curve, round_values, time_grid, ukc_array,
+                        ukc_required_array)
+from ukc.events import solve_violations
+from ukc.store import scenario_key, tide_identity
+
+
+def same_value(a, b):
+    """Structural equality for scalars, arrays, lists, tuples and dicts."""
+    if a is b:
+        return True
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return (isinstance(a, np.ndarray) and isinstance(b, np.ndarray)
+                and a.shape == b.shape and np.array_equal(a, b))
+    if isinstance(a, dict):
+        return (isinstance(b, dict) and a.keys() == b.keys()
+                and all(same_value(a[k], b[k]) for k in a))
+    if isinstance(a, (list, tuple)):
+        return (type(a) is type(b) and len(a) == len(b)
+                and all(same_value(x, y) for x, y in zip(a, b)))
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False
+
+
+def _fingerprint(value):
+    if isinstance(value, (np.ndarray, list, tuple)):
+        return tide_identity(value)
+    return value
+
+
+class SharedCache:
+    """Thread-safe LRU of node values, at most ``max_entries`` entries, each
+    dropped ``ttl`` seconds after it was computed."""
+
+    def __init__(self, max_entries=256, ttl=3600.0):
+        self.max_entries, self.ttl = int(max_entries), float(ttl)
+        self._entries = OrderedDict()     # key -> (expires, value)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, key, compute):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+        value = compute()     # outside the lock: other sessions keep going
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class Graph:
+    """Memoized dependency graph; see the module docstring."""
+
+    def __init__(self, store=None, cache=None):
+        self.store = store
+        self.cache = cache
+        self._nodes = {}      # name -> (func, deps, persist, shared)
+        self._values = {}
+        self._versions = {}
+        self._stamps = {}     # node -> dependency versions it was computed from
+        self._leaves = {}
+        self.recomputed = []  # nodes evaluated since the last reset_stats()
+
+    def add(self, name, func, deps=(), persist=False, shared=False):
+        self._nodes[name] = (func, tuple(deps), persist, shared)
+        self._leaves.clear()
+        self._stamps.pop(name, None)
+        return func
+
+    def node(self, name, deps=(), persist=False, shared=False):
+        """Decorator form of ``add``."""
+        return lambda func: self.add(name, func, deps, persist, shared)
+
+    def set(self, **inputs):
+        for name, value in inputs.items():
+            if name in self._nodes:
+                raise ValueError(f"{name!r} is a computed node")
+            self._update(name, value)
+
+    def _update(self, name, value):
+        if name in self._values and same_value(self._values[name], value):
+            return
+        self._values[name] = value
+        self._versions[name] = self._versions.get(name, 0) + 1
+
+    def leaves(self, name):
+        """Graph inputs ``name`` depends on, directly or not."""
+        if name not in self._leaves:
+            if name not in self._nodes:
+                self._leaves[name] = (name,)
+            else:
+                found = set()
+                for dep in self._nodes[name][1]:
+                    found.update(self.leaves(dep))
+                self._leaves[name] = tuple(sorted(found))
+        return self._leaves[name]
+
+    def get(self, name):
+        if name not in self._nodes:
+            if name not in self._values:
+                raise KeyError(f"Input {name!r} has not been set")
+            return self._values[name]
+        func, deps, persist, shared = self._nodes[name]
+
+        backends = [b for b, on in ((self.cache, shared), (self.store, persist))
+                    if on and b is not None]
+        if backends:
+            leaves = self.leaves(name)
+            stamp = ("leaves",) + tuple(self._versions.get(k) for k in leaves)
+            if self._stamps.get(name) != stamp:
+                key = scenario_key({k: _fingerprint(self.get(k)) for k in leaves}, name)
+                compute = lambda: func(*(self.get(d) for d in deps))
+                for backend in reversed(backends):    # cache, then store, then compute
+                    compute = functools.partial(backend.get_or_compute, key, compute)
+                self._finish(name, compute(), stamp)
+            return self._values[name]
+
+        args = [self.get(d) for d in deps]
+        stamp = tuple(self._versions[d] for d in deps)
+        if self._stamps.get(name) != stamp:
+            self._finish(name, func(*args), stamp)
+        return self._values[name]
+
+    __getitem__ = get
+
+    def _finish(self, name, value, stamp):
+        self._update(name, value)
+        self._stamps[name] = stamp
+        self.recomputed.append(name)
+
+    def reset_stats(self):
+        self.recomputed = []
+
+
+# =============================================================================
+# UKC CHAIN
+# =============================================================================
+def ukc_graph(store=None, cache=None):
+    """The dashboard calculation chain as a graph.
+
+    Inputs: ``tide`` (one level per sample), ``tkt1``, ``import_cont``,
+    ``export_cont``, ``crane_rate``, ``cranes``, ``wait_time``, ``aux_time``,
+    ``draft_change``, ``bottom``, ``total_hours``, ``step_minutes`` and the
+    optional ``move_draft`` (default ``None``): a draft series with one value
+    per sample, e.g. from ``ukc.moves``, used instead of ``draft_curve``.
+    ``scenario`` bundles the series, running summary and exact (``exact_*``)
+    results and is the node persisted in ``store`` and shared through ``cache``.
+    """
+    g = Graph(store, cache)
+    g.set(move_draft=None)
+
+    @g.node("throughput", ("crane_rate", "cranes"))
+    def _(crane_rate, cranes):
+        return crane_rate * cranes
+
+    @g.node("unload_time", ("import_cont", "throughput"))
+    def _(import_cont, throughput):
+        return round(import_cont / throughput, 2) if throughput > 0 else 0
+
+    @g.node("load_time", ("export_cont", "throughput"))
+    def _(export_cont, throughput):
+        return round(export_cont / throughput, 2) if throughput > 0 else 0
+
+    @g.node("berth_time", ("wait_time", "aux_time", "unload_time", "load_time"))
+    def _(wait_time, aux_time, unload_time, load_time):
+        return round(wait_time + aux_time + unload_time + load_time, 2)
+
+    g.add("t", time_grid, ("total_hours", "step_minutes"))
+
+    @g.node("draft", ("move_draft", "t", "tkt1", "unload_time", "load_time", "wait_time",
+                      "aux_time", "draft_change"))
+    def _(move_draft, t, *params):
+        if move_draft is not None:
+            return round_values(np.asarray(move_draft, dtype=float)[:t.size])
+        return round_values(draft_curve(t, *params))
+
+    @g.node("ukc_actual", ("tide", "draft", "bottom"))
+    def _(tide, draft, bottom):
+        return ukc_array(np.asarray(tide, dtype=float), draft, bottom)
+
+    @g.node("ukc_req", ("draft", "berth_time", "t"))
+    def _(draft, berth_time, t):
+        return ukc_required_array(draft, berth_time, t=t)
+
+    @g.node("summary", ("t", "ukc_actual", "ukc_req", "step_minutes"))
+    def _(t, ukc_actual, ukc_req, step_minutes):
+        summary = RunningSummary(step_minutes)
+        summary.update({"t": t, "ukc_actual": ukc_actual, "ukc_req": ukc_req})
+        return summary.result()
+
+    @g.node("exact", ("tide", "t", "move_draft", "draft", "tkt1", "unload_time", "load_time",
+                      "wait_time", "aux_time", "draft_change", "bottom", "berth_time"))
+    def _(tide, t, move_draft, draft, *params):
+        # Continuous check between samples (tide interpolated linearly)
+        return solve_violations(tide, *params, tide_times=t,
+                                draft=None if move_draft is None else draft)
+
+    @g.node("scenario", ("draft", "ukc_actual", "ukc_req", "summary", "exact"), persist=True,
+            shared=True)
+    def _(draft, ukc_actual, ukc_req, summary, exact):
+        return {"tkt_series": draft, "ukc_actual": ukc_actual, "ukc_req": ukc_req, **summary,
+                **{f"exact_{k}": v for k, v in exact.items()}}
+
+    return g
@@ -0,0 +1,131 @@
+"""Inverse solver: largest export load / arrival draft, shallowest bottom.
+
+Planners ask "how many more boxes can we load" or "what is the deepest
+arrival draft we can accept". ``solve_limit`` answers such a question in
+one call instead of bisecting a sidebar input. A candidate is safe when
+``ukc_actual >= ukc_req`` at every sample of the tide series, with the
+same rounding as the dashboard.
+
+A stay that runs past the end of the tide series is unsafe for every
+limit, since its departure cannot be checked. Each search starts from a
+closed-form bound and then checks candidates exactly, many per vectorized
+engine call:
+
+* ``tkt1``: the draft is ``tkt1 + g(t)`` with ``g`` independent of
+  ``tkt1``, so every sample gives ``tkt1 <= W(t) / (1 + f(t)) - g(t)``
+  (``W`` water level + |bottom|, ``f`` the 10% / 20% requirement). The
+  minimum over samples is the answer up to rounding, which a small window
+  of 0.01 m candidates settles.
+* ``bottom``: likewise ``|bottom| >= (1 + f(t)) * draft(t) - tide(t)``.
+* ``export_cont``: loading only changes the draft after the unload phase,
+  and the final draft must clear at least the 10% requirement at the
+  highest water after that point. That caps the load time and so the box
+  count, and so does the horizon. Feasibility is not strictly monotone in
+  the box count (a longer stay keeps late samples under the 10% at-berth
+  requirement), so candidates are scanned downward from the cap in
+  blocks. The first safe one is the true maximum.
+"""
+import numpy as np
+
+from ukc.engine import (draft_curve, operation_times, phase_times, round_values, time_grid,
+                        ukc_array, ukc_required_array)
+
+LIMITS = ("export_cont", "tkt1", "bottom")
+CELLS_PER_CALL = 1 << 20     # candidates x samples evaluated per engine call
+WINDOW = 4                   # 0.01 m candidates on each side of a closed-form bound
+
+
+def safe_mask(tide, tkt1, import_cont, export_cont, crane_rate, cranes, wait_time, aux_time,
+              draft_change_rate, bottom, step_minutes=60):
+    """Boolean per candidate (arguments broadcast to ``(N,)``): no violation at any sample."""
+    tide = np.asarray(tide, dtype=float)
+    t = time_grid(tide.size * step_minutes / 60, step_minutes)
+    params = np.broadcast_arrays(*(np.atleast_1d(np.asarray(p, dtype=float)) for p in (
+        tkt1, import_cont, export_cont, crane_rate, cranes, wait_time, aux_time,
+        draft_change_rate, bottom)))
+    col = [p[:, None] for p in params]
+    tkt1, import_cont, export_cont, crane_rate, cranes, wait_time, aux_time, rate, bottom = col
+    _, unload_time, load_time, berth_time = operation_times(
+        import_cont, export_cont, crane_rate, cranes, wait_time, aux_time)
+    draft = round_values(draft_curve(t, tkt1, unload_time, load_time, wait_time, aux_time, rate))
+    ukc = ukc_array(np.broadcast_to(tide, draft.shape), draft, bottom)
+    return np.all(ukc >= ukc_required_array(draft, berth_time, t=t), axis=1)
+
+
+def _scan(start, step, stop, check, n_samples):
+    """First safe candidate of ``start, start + step, ...`` (not past ``stop``)."""
+    block = max(8, CELLS_PER_CALL // max(n_samples, 1))
+    while (stop - start) * np.sign(step) >= 0:
+        n = min(block, int(round((stop - start) / step)) + 1)
+        values = start + step * np.arange(n)
+        ok = check(values)
+        if ok.any():
+            return values[int(np.argmax(ok))]
+        start = values[-1] + step
+    return None
+
+
+def solve_limit(limit, tide, tkt1, import_cont, export_cont, crane_rate, cranes, wait_time,
+                aux_time, draft_change_rate, bottom, step_minutes=60):
+    """Largest safe ``export_cont`` or ``tkt1``, or shallowest safe ``bottom``.
+
+    All other inputs stay at their given values; the given value of
+    ``limit`` itself is ignored. ``tide`` is one level per sample
+    (``step_minutes`` apart) over the horizon to check. Returns ``None``
+    when no value is safe.
+    """
+    if limit not in LIMITS:
+        raise ValueError(f"limit must be one of {LIMITS}, not {limit!r}")
+    tide = np.asarray(tide, dtype=float)
+    horizon = tide.size * step_minutes / 60
+    t = time_grid(horizon, step_minutes)
+    args = dict(tide=tide, tkt1=tkt1, import_cont=import_cont, export_cont=export_cont,
+                crane_rate=crane_rate, cranes=cranes, wait_time=wait_time, aux_time=aux_time,
+                draft_change_rate=draft_change_rate, bottom=bottom, step_minutes=step_minutes)
+    throughput, unload_time, load_time, berth_time = (v.item() for v in operation_times(
+        import_cont, export_cont, crane_rate, cranes, wait_time, aux_time))
+    factor = np.where(t < berth_time, 1.1, 1.2)
+    if limit != "export_cont" and berth_time > horizon:
+        return None     # the stay does not depend on tkt1 or bottom
+
+    if limit == "tkt1":
+        g = draft_curve(t, 0.0, unload_time, load_time, wait_time, aux_time, draft_change_rate)
+        bound = np.floor(np.min((tide + abs(bottom)) / factor - g) * 100) / 100
+        value = _scan(bound + WINDOW / 100, -0.01, 0.0,
+                      lambda v: safe_mask(**{**args, "tkt1": np.round(v, 2)}), t.size)
+        return None if value is None else round(float(value), 2)
+
+    if limit == "bottom":
+        draft = round_values(draft_curve(t, tkt1, unload_time, load_time, wait_time, aux_time,
+                                         draft_change_rate))
+        bound = max(np.ceil(np.max(factor * draft - tide) * 100) / 100, 0.0)
+        value = _scan(max(bound - WINDOW / 100, 0.0), 0.01, bound + 1.0,
+                      lambda v: safe_mask(**{**args, "bottom": -np.round(v, 2)}), t.size)
+        return None if value is None else -round(float(value), 2)
+
+    if throughput <= 0:
+        raise ValueError("export_cont has no effect without crane throughput")
+    # Stay must end inside the horizon: berth_time = fixed part + load time
+    fixed = wait_time + aux_time + unload_time
+    max_load = horizon - fixed
+    if draft_change_rate > 0:
+        _, unload_end, _ = phase_times(unload_time, 0.0, wait_time, aux_time)
+        tkt_min = tkt1 - unload_time * draft_change_rate
+        after = t >= unload_end
+        if after.any():
+            highest = np.max(tide[after] + abs(bottom)) / 1.1
+            max_load = min(max_load, (highest - tkt_min + 0.02) / draft_change_rate)
+    if max_load < 0:
+        return None
+    cap = int(np.floor((max_load + 0.01) * throughput))
+    value = _scan(cap, -1, 0, lambda v: safe_mask(**{**args, "export_cont": v})
+                  & (round_values(fixed + round_values(v / throughput)) <= horizon), t.size)
+    return None if value is None else int(value)
+
+
+def solve_limits(tide, tkt1, import_cont, export_cont, crane_rate, cranes, wait_time, aux_time,
+                 draft_change_rate, bottom, step_minutes=60):
+    """``solve_limit`` for every entry of ``LIMITS``, as a dict."""
+    args = (tide, tkt1, import_cont, export_cont, crane_rate, cranes, wait_time, aux_time,
+            draft_change_rate, bottom, step_minutes)
+    return {limit: solve_limit(limit, *args) for limit in LIMITS}
@@ -0,0 +1,126 @@
+"""Monte Carlo uncertainty: probability of UKC violation and UKC bands.
+
+Crane productivity, waiting time and draft-change rate are drawn per
+realization from simple distributions around the deterministic inputs, and
+the tide gets an AR(1) prediction error (errors persist for hours, they are
+not white noise). Realizations are evaluated in vectorized batches with
+``evaluate_batch``; each batch is reduced straight away to
+
+* per-hour violation counts, and
+* per-hour histograms of actual UKC in 1 cm bins -- UKC is already rounded
+  to 2 decimals, so percentiles read from the histogram are exact,
+
+so memory does not grow with the number of samples. Batches can run on a
+process pool; every batch has its own seed, so results do not depend on the
+number of workers.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ukc.engine import evaluate_batch
+
+DISTRIBUTIONS = ("normal", "uniform", "triangular")
+# Spread (standard deviation for "normal", half-width otherwise) per input.
+DEFAULT_SPREAD = {"crane_rate": 3.0, "wait_time": 0.5, "draft_change_rate": 0.02}
+DEFAULT_TIDE_SIGMA = 0.10
+DEFAULT_TIDE_CORRELATION = 0.9
+PERCENTILES = (5, 50, 95)
+BATCH_SIZE = 5000
+# Histogram range in cm of UKC; values outside are clipped into the end bins.
+UKC_BINS = (-2000, 3000)
+LOWER_BOUNDS = {"crane_rate": 1.0, "wait_time": 0.0, "draft_change_rate": 0.0}
+
+
+def sample(rng, base, spread, size, distribution="normal"):
+    """``size`` draws around ``base`` with the given spread."""
+    if distribution == "normal":
+        noise = rng.standard_normal(size)
+    elif distribution == "uniform":
+        noise = rng.uniform(-1.0, 1.0, size)
+    elif distribution == "triangular":
+        noise = rng.triangular(-1.0, 0.0, 1.0, size)
+    else:
+        raise ValueError(f"Unknown distribution: {distribution!r}")
+    return base + spread * noise
+
+
+def tide_error(rng, size, hours, sigma, correlation):
+    """AR(1) errors ``(size, hours)`` with stationary standard deviation ``sigma``."""
+    err = np.empty((size, hours))
+    err[:, 0] = sigma * rng.standard_normal(size)
+    innovation = sigma * np.sqrt(1.0 - correlation ** 2)
+    for h in range(1, hours):
+        err[:, h] = correlation * err[:, h - 1] + innovation * rng.standard_normal(size)
+    return err
+
+
+def _run_batch(seed, size, tide, inputs, spread, distribution, tide_sigma, tide_correlation):
+    rng = np.random.default_rng(seed)
+    params = dict(inputs)
+    for name, width in spread.items():
+        if width:
+            params[name] = np.maximum(sample(rng, inputs[name], width, size, distribution),
+                                      LOWER_BOUNDS.get(name, -np.inf))
+    water = tide
+    if tide_sigma:
+        water = tide + tide_error(rng, size, tide.size, tide_sigma, tide_correlation)
+    res = evaluate_batch(water, **params, total_hours=tide.size)
+    ukc = np.broadcast_to(res["ukc_actual"], (size, tide.size))
+
+    lo, hi = UKC_BINS
+    bins = np.clip(np.rint(ukc * 100).astype(np.int64), lo, hi - 1) - lo
+    flat = bins + (hi - lo) * np.arange(tide.size)
+    hist = np.bincount(flat.ravel(), minlength=(hi - lo) * tide.size).reshape(tide.size, hi - lo)
+    violation = np.broadcast_to(res["violation"], (size, tide.size))
+    return hist, violation.sum(axis=0), violation.any(axis=1).sum(), violation.sum()
+
+
+def _percentile(hist, q):
+    """Per-row ``q``-th percentile (lower value) from 1 cm histograms, in m."""
+    cum = np.cumsum(hist, axis=1)
+    rank = np.ceil(q / 100 * cum[:, -1:]).clip(min=1)
+    idx = (cum < rank).sum(axis=1)
+    return (idx + UKC_BINS[0]) / 100
+
+
+def monte_carlo(tide, tkt1, import_cont, export_cont, crane_rate, cranes, wait_time,
+                aux_time, draft_change_rate, bottom, n_samples=10_000, spread=None,
+                distribution="normal", tide_sigma=DEFAULT_TIDE_SIGMA,
+                tide_correlation=DEFAULT_TIDE_CORRELATION, seed=0, batch_size=BATCH_SIZE,
+                workers=None, percentiles=PERCENTILES):
+    """Run ``n_samples`` realizations of one vessel call against an hourly tide.
+
+    ``spread`` maps ``crane_rate`` / ``wait_time`` / ``draft_change_rate`` to
+    the standard deviation (``normal``) or half-width (``uniform``,
+    ``triangular``) of their distribution. ``workers=None`` runs in-process;
+    otherwise batches go to a process pool with that many workers.
+
+    Returns a dict with ``p_violation`` (per hour), ``bands`` (percentile ->
+    per-hour UKC), ``p_any_violation`` (share of realizations with at least
+    one violating hour), ``mean_violation_hours`` and ``n_samples``.
+    """
+    tide = np.asarray(tide, dtype=float)
+    spread = DEFAULT_SPREAD if spread is None else spread
+    inputs = dict(tkt1=tkt1, import_cont=import_cont, export_cont=export_cont,
+                  crane_rate=crane_rate, cranes=cranes, wait_time=wait_time,
+                  aux_time=aux_time, draft_change_rate=draft_change_rate, bottom=bottom)
+    sizes = [min(batch_size, n_samples - i) for i in range(0, n_samples, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = (tide, inputs, spread, distribution, tide_sigma, tide_correlation)
+
+    if workers is None:
+        results = [_run_batch(s, n, *args) for s, n in zip(seeds, sizes)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_batch, seeds, sizes, *([a] * len(sizes) for a in args)))
+
+    hist = sum(r[0] for r in results)
+    violations = sum(r[1] for r in results)
+    return {
+        "n_samples": n_samples,
+        "p_violation": violations / n_samples,
+        "bands": {q: _percentile(hist, q) for q in percentiles},
+        "p_any_violation": sum(r[2] for r in results) / n_samples,
+        "mean_violation_hours": sum(r[3] for r in results) / n_samples,
+    }
@@ -0,0 +1,109 @@
+"""Berth-window optimizer: earliest safe arrival and minimum crane count.
+
+A candidate is an (arrival offset, crane count, wait time) triple. Its draft
+and required UKC do not depend on the arrival, so they are computed once per
+(cranes, wait) configuration and slid along the tide series with a zero-copy
+window view. Candidates are pruned before the full hour-by-hour check:
+
+* configurations that fail even at the highest tide are dropped up front;
+* each configuration is first tested at its critical hour (largest water
+  level needed), which rejects most arrival offsets in O(1);
+* once a crane count has a feasible arrival, later offsets skip it.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ukc.engine import draft_curve, operation_times, round_values, ukc_required_array
+
+
+def _configurations(tkt1, import_cont, export_cont, crane_rate, crane_counts,
+                    wait_times, aux_time, draft_change_rate, total_hours):
+    cranes, waits = np.meshgrid(crane_counts, wait_times, indexing="ij")
+    cranes, waits = cranes.ravel(), waits.ravel()
+    _, unload_time, load_time, berth_time = operation_times(
+        import_cont, export_cont, crane_rate, cranes, waits, aux_time)
+    hours = np.arange(total_hours, dtype=float)
+    col = (slice(None), None)
+    draft = round_values(draft_curve(hours, tkt1, unload_time[col], load_time[col],
+                                     waits[col], aux_time, draft_change_rate))
+    ukc_req = ukc_required_array(draft, berth_time[col], t=hours)
+    return cranes, waits, berth_time, draft, ukc_req
+
+
+def _is_safe(water, draft, ukc_req, depth):
+    """Row-wise "no violating hour" test, rounded like the dashboard."""
+    return (round_values((water + depth) - draft) >= ukc_req).all(axis=-1)
+
+
+def find_berth_window(tide, tkt1, import_cont, export_cont, crane_rate, cranes,
+                      spare_cranes, aux_time, draft_change_rate, bottom,
+                      total_hours, wait_times=(0.0,), max_offset=None,
+                      batch_size=256):
+    """Search arrival offsets, crane counts and wait times for a safe stay.
+
+    ``tide`` is an hourly water level series; an arrival offset ``o`` maps
+    hour ``h`` of the stay onto ``tide[o + h]``. Crane counts run from 1 to
+    ``cranes + spare_cranes``. Returns a dict with the earliest safe
+    ``arrival`` and, at that arrival, the fewest ``cranes`` and shortest
+    ``wait_time``; ``earliest_by_cranes`` maps every crane count to its own
+    earliest safe arrival (``None`` when there is none) and ``min_cranes`` is
+    the smallest crane count that is safe at any arrival.
+    """
+    tide = np.asarray(tide, dtype=float)
+    depth = abs(bottom)
+    n_offsets = tide.size - total_hours + 1
+    if max_offset is not None:
+        n_offsets = min(n_offsets, max_offset + 1)
+    crane_counts = np.arange(1, int(cranes) + int(spare_cranes) + 1)
+    cfg_cranes, cfg_waits, cfg_berth, draft, ukc_req = _configurations(
+        tkt1, import_cont, export_cont, crane_rate, crane_counts,
+        np.asarray(wait_times, dtype=float), aux_time, draft_change_rate,
+        total_hours)
+
+    earliest = {int(c): None for c in crane_counts}
+    result = {"arrival": None, "cranes": None, "wait_time": None,
+              "berth_time": None, "earliest_by_cranes": earliest,
+              "min_cranes": None, "evaluated": 0}
+    if n_offsets <= 0:
+        return result
+
+    # Bound 1: a configuration unsafe even at the highest tide is never safe.
+    alive = _is_safe(tide.max(), draft, ukc_req, depth)
+    # Bound 2: the hour needing the most water is checked first.
+    critical = np.argmax(draft + ukc_req, axis=1)
+
+    windows = sliding_window_view(tide, total_hours)[:n_offsets]
+    for start in range(0, n_offsets, batch_size):
+        if not alive.any():
+            break
+        stop = min(start + batch_size, n_offsets)
+        ks = np.flatnonzero(alive)
+        offsets = np.arange(start, stop)
+        k_idx, o_idx = np.repeat(ks, offsets.size), np.tile(offsets, ks.size)
+
+        h_idx = critical[k_idx]
+        water = tide[o_idx + h_idx]
+        ok = (round_values((water + depth) - draft[k_idx, h_idx])
+              >= ukc_req[k_idx, h_idx])
+        k_idx, o_idx = k_idx[ok], o_idx[ok]
+        result["evaluated"] += k_idx.size
+        if k_idx.size == 0:
+            continue
+
+        safe = _is_safe(windows[o_idx], draft[k_idx], ukc_req[k_idx], depth)
+        k_idx, o_idx = k_idx[safe], o_idx[safe]
+        # Earliest offset first, then fewest cranes, then shortest wait.
+        order = np.lexsort((cfg_waits[k_idx], cfg_cranes[k_idx], o_idx))
+        for k, o in zip(k_idx[order], o_idx[order]):
+            c = int(cfg_cranes[k])
+            if earliest[c] is None:
+                earliest[c] = int(o)
+                alive &= cfg_cranes != c
+            if result["arrival"] is None:
+                result.update(arrival=int(o), cranes=c,
+                              wait_time=float(cfg_waits[k]),
+                              berth_time=float(cfg_berth[k]))
+
+    feasible = [c for c, o in earliest.items() if o is not None]
+    result["min_cranes"] = min(feasible) if feasible else None
+    return result
@@ -0,0 +1,74 @@
+"""Per-stage wall-clock timing for one dashboard rerun.
+
+A ``StageTimer`` records named stages either as a ``with timer.stage(name)``
+block or, for straight-line script code that cannot be indented into a
+block, as ``timer.lap(name)`` (time since the previous lap). A disabled
+timer costs one attribute check per call. Results can be appended to a JSONL
+log, and the whole run can be recorded with ``cProfile``.
+"""
+import cProfile
+import json
+import os
+import time
+from contextlib import contextmanager
+
+
+class StageTimer:
+    def __init__(self, enabled=True, profile=False):
+        self.enabled = enabled
+        self.stages = []
+        self.started = time.perf_counter()
+        self._last = self.started
+        self._profiler = None
+        if enabled and profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def lap(self, name):
+        """Record the time since the previous lap (or start) as ``name``."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.stages.append((name, now - self._last))
+        self._last = now
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self.stages.append((name, now - started))
+            self._last = now
+
+    @property
+    def total(self):
+        return time.perf_counter() - self.started
+
+    def rows(self):
+        """``(stage, ms, share of the total)`` rows, in recording order."""
+        total = self.total
+        return [(name, 1e3 * seconds, seconds / total if total else 0.0)
+                for name, seconds in self.stages]
+
+    def stop_profile(self, path):
+        """Stop ``cProfile`` (if running) and dump its stats to ``path``."""
+        if self._profiler is None:
+            return None
+        self._profiler.disable()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._profiler.dump_stats(path)
+        self._profiler = None
+        return path
+
+    def write_jsonl(self, path, **meta):
+        """Append one JSON record (stages in ms plus ``meta``) to ``path``."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        record = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "total_ms": 1e3 * self.total,
+                  "stages": {name: 1e3 * seconds for name, seconds in self.stages}, **meta}
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(record, ensure_ascii=False) + "\n")
@@ -0,0 +1,44 @@
+"""Range-minimum index (sparse table) over a fixed 1-D series.
+
+Level ``j`` of the table holds, for every start ``i``, the position of the
+minimum of ``values[i:i + 2**j]``. Any range ``[lo, hi)`` is covered by two
+overlapping power-of-two blocks, so a query is two lookups and a comparison
+regardless of the range length, and ``lo``/``hi`` may be arrays to answer
+many ranges in one vectorized call. Building costs ``O(n log n)`` once.
+"""
+import numpy as np
+
+
+class RangeMin:
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype=float)
+        n = self.values.size
+        if n == 0:
+            raise ValueError("RangeMin needs at least one value")
+        levels = [np.arange(n, dtype=np.intp)]
+        width = 1
+        while 2 * width <= n:
+            prev = levels[-1]
+            a, b = prev[:n - 2 * width + 1], prev[width:n - width + 1]
+            levels.append(np.where(self.values[b] < self.values[a], b, a))
+            width *= 2
+        # Pad every level to length n so the table is one 2-D array
+        self._table = np.stack([np.pad(level, (0, n - level.size)) for level in levels])
+        self._log2 = np.zeros(n + 1, dtype=np.intp)
+        self._log2[2:] = np.floor(np.log2(np.arange(2, n + 1))).astype(np.intp)
+
+    def __len__(self):
+        return self.values.size
+
+    def argmin(self, lo, hi):
+        """Position of the (first) minimum of ``values[lo:hi]``; needs ``lo < hi``."""
+        lo, hi = np.asarray(lo, dtype=np.intp), np.asarray(hi, dtype=np.intp)
+        if np.any(hi <= lo) or np.any(lo < 0) or np.any(hi > self.values.size):
+            raise ValueError("ranges must satisfy 0 <= lo < hi <= len(values)")
+        k = self._log2[hi - lo]
+        a, b = self._table[k, lo], self._table[k, hi - (1 << k)]
+        idx = np.where(self.values[b] < self.values[a], b, a)
+        return idx if idx.ndim else int(idx)
+
+    def min(self, lo, hi):
+        return self.values[self.argmin(lo, hi)]
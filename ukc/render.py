@@ -0,0 +1,82 @@
+"""Chart payload reduction for long series.
+
+A minute-resolution month is ~43k samples per trace, far more than a chart
+has pixels. These helpers pick which samples to draw so the browser payload
+stays flat as the horizon grows:
+
+* line series are downsampled with Largest-Triangle-Three-Buckets (LTTB),
+  which keeps the visual shape (peaks and troughs) of the curve;
+* samples that must never disappear -- the minimum UKC, the tightest slack
+  and the edges of every violation -- are merged back in;
+* bar series are reduced to one bar per bucket holding the bucket minimum,
+  so a violation inside a bucket still shows.
+
+Only index arithmetic lives here; ``app.py`` builds the Plotly traces.
+"""
+import numpy as np
+
+POINT_BUDGET = 2000     # points per line trace (~ chart width in px x 2)
+BAR_BUDGET = 400        # bars per bar trace
+WEBGL_THRESHOLD = 1000  # traces longer than this use Scattergl
+
+
+def lttb(x, y, n_out):
+    """Indices of ``n_out`` samples chosen by Largest-Triangle-Three-Buckets.
+
+    The first and last samples are always kept; every other bucket keeps the
+    sample forming the largest triangle with the previously kept sample and
+    the mean of the next bucket.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = y.size
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:-1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:-1], edges[:-1]) / counts
+    # The bucket after the last one is the final sample.
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    out = np.empty(n_out, dtype=np.intp)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - next_x[i]) * (y[lo:hi] - y[a])
+                      - (x[a] - x[lo:hi]) * (next_y[i] - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def critical_indices(ukc_actual, ukc_req):
+    """Samples a reduced UKC chart must keep: minima and violation edges."""
+    ukc_actual = np.asarray(ukc_actual, dtype=float)
+    ukc_req = np.asarray(ukc_req, dtype=float)
+    if ukc_actual.size == 0:
+        return np.empty(0, dtype=np.intp)
+    slack = ukc_actual - ukc_req
+    edges = np.flatnonzero(np.diff(slack < 0))
+    return np.unique(np.concatenate([
+        [np.argmin(ukc_actual), np.argmin(slack)], edges, edges + 1,
+    ])).astype(np.intp)
+
+
+def downsample(x, y, budget=POINT_BUDGET, keep=()):
+    """Sorted sample indices for a line trace: LTTB plus the ``keep`` indices."""
+    idx = lttb(x, y, budget)
+    if len(keep) and idx.size < len(y):
+        idx = np.union1d(idx, keep)
+    return idx
+
+
+def bucket_min(y, budget=BAR_BUDGET):
+    """``(starts, minima)`` of ``y`` split into at most ``budget`` buckets."""
+    y = np.asarray(y, dtype=float)
+    if y.size <= budget:
+        return np.arange(y.size), y
+    starts = np.linspace(0, y.size, budget, endpoint=False).astype(np.intp)
+    return starts, np.minimum.reduceat(y, starts)
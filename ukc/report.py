@@ -0,0 +1,274 @@
+"""Batch vessel reports (PNG/PDF) in the layout of the original ``Test.py`` chart.
+
+Each report has two panels: water level against the operating level, and UKC
+against the requirement, with violating hours shaded. Three things make
+hundreds of reports at 300 dpi practical:
+
+* contiguous violating hours are merged into one span (``violation_spans``)
+  and every panel draws all its spans as a single ``PolyCollection``,
+  instead of one ``axvspan`` patch per hour;
+* the figure, ``GridSpec`` layout, axes, legends and text are built once per
+  process (``ReportTemplate``), and each report only replaces the line data,
+  fills, spans and labels before saving;
+* calls are evaluated with ``evaluate_batch`` and rendered in chunks across
+  a process pool, using matplotlib's object API on the Agg canvas (no
+  pyplot state, no GUI backend).
+
+matplotlib is only needed here, not by the dashboard::
+
+    python Test.py calls.csv reports/ --format pdf --dpi 300 --workers 8
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ukc.batch import CALL_COLUMNS, DEFAULT_CONSTITUENTS, TIDE_MODES, checked_tides, read_calls
+from ukc.defaults import DEFAULTS
+from ukc.engine import evaluate_batch
+
+FORMATS = ("png", "pdf")
+DEFAULT_DPI = 300
+DEFAULT_CHUNK_ROWS = 16     # calls per task: small enough to balance the pool
+
+COLOR_TIDE = "#1f77b4"
+COLOR_OPERATING = "#ff7f0e"
+COLOR_UKC = "#2ca02c"
+COLOR_REQUIRED = "#d62728"
+
+
+def violation_spans(violation, t, step=1.0):
+    """Merge runs of violating samples into ``(start, stop)`` spans (h).
+
+    Sample ``i`` covers ``t[i] - step/2`` to ``t[i] + step/2``, as in the
+    original per-hour shading.
+    """
+    v = np.asarray(violation, dtype=np.int8)
+    edges = np.diff(np.concatenate([[0], v, [0]]))
+    first, last = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1
+    t = np.asarray(t, dtype=float)
+    return np.column_stack([t[first] - step / 2, t[last] + step / 2])
+
+
+def _area(t, y):
+    """Polygon between ``y`` and 0, as drawn by ``fill_between(t, y)``."""
+    return np.concatenate([[[t[0], 0.0]], np.column_stack([t, y]), [[t[-1], 0.0]]])
+
+
+def _span_rects(spans):
+    return [[(a, 0.0), (a, 1.0), (b, 1.0), (b, 0.0)] for a, b in spans]
+
+
+class ReportTemplate:
+    """One figure reused for every report: ``draw`` new data, then ``save``."""
+
+    def __init__(self, figsize=(16, 10)):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.collections import PolyCollection
+        from matplotlib.figure import Figure
+        from matplotlib.gridspec import GridSpec
+        from matplotlib.patches import Patch
+        from matplotlib.transforms import blended_transform_factory
+
+        self.fig = Figure(figsize=figsize, facecolor="white")
+        FigureCanvasAgg(self.fig)
+        gs = GridSpec(2, 1, figure=self.fig, height_ratios=[1.2, 1], hspace=0.08)
+        ax1 = self.fig.add_subplot(gs[0])
+        ax2 = self.fig.add_subplot(gs[1], sharex=ax1)
+        self.axes = (ax1, ax2)
+
+        # --- Panel 1: water level ---
+        self.tide_line, = ax1.plot([], [], color=COLOR_TIDE, linewidth=2.5,
+                                   label="Mực nước thủy triều", zorder=3)
+        self.tide_fill = PolyCollection([], facecolor=COLOR_TIDE, alpha=0.15, edgecolor="none")
+        self.operating_line = ax1.axhline(0.0, color=COLOR_OPERATING, linestyle="--",
+                                          linewidth=1.5, zorder=2)
+        ax1.set_ylabel("Mực nước (m)", fontsize=11, fontweight="bold")
+        self.title = ax1.set_title("", fontsize=14, fontweight="bold", pad=15)
+        ax1.tick_params(labelbottom=False)
+
+        # --- Panel 2: UKC ---
+        self.ukc_line, = ax2.plot([], [], color=COLOR_UKC, linewidth=2.5, label="UKC thực tế",
+                                  zorder=3)
+        self.ukc_fill = PolyCollection([], facecolor=COLOR_UKC, alpha=0.15, edgecolor="none")
+        self.req_line, = ax2.plot([], [], color=COLOR_REQUIRED, linestyle="-.", linewidth=2,
+                                  label="[UKC] yêu cầu", zorder=2)
+        ax2.axhline(y=0, color="gray", linestyle=":", linewidth=0.5, alpha=0.3)
+        ax2.set_xlabel("Thời gian (giờ)", fontsize=11, fontweight="bold")
+        ax2.set_ylabel("UKC (m)", fontsize=11, fontweight="bold")
+        self.bottom_text = ax2.text(0.99, 0.03, "", transform=ax2.transAxes, ha="right",
+                                    fontsize=9, bbox=dict(boxstyle="round", facecolor="lightgray",
+                                                          alpha=0.5))
+
+        # Violation spans: full axis height, x in hours
+        self.spans = []
+        for ax, alpha in ((ax1, 0.1), (ax2, 0.2)):
+            spans = PolyCollection([], facecolor="red", alpha=alpha, edgecolor="none",
+                                   transform=blended_transform_factory(ax.transData, ax.transAxes))
+            ax.add_collection(spans)
+            self.spans.append(spans)
+        ax1.add_collection(self.tide_fill)
+        ax2.add_collection(self.ukc_fill)
+
+        for ax in self.axes:
+            ax.grid(True, linestyle=":", alpha=0.6)
+            ax.set_axisbelow(True)
+        self.legend1 = ax1.legend(handles=[self.tide_line, self.operating_line],
+                                  loc="upper right", fontsize=9, framealpha=0.9)
+        ax2.legend(handles=[self.ukc_line, self.req_line,
+                            Patch(facecolor="red", alpha=0.2, label="Cảnh báo")],
+                   loc="upper right", fontsize=9, framealpha=0.9)
+        self.info = self.fig.text(0.5, 0.96, "", ha="center", fontsize=10, style="italic",
+                                  bbox=dict(boxstyle="round", facecolor="wheat", alpha=0.3))
+        self.fig.subplots_adjust(left=0.06, right=0.98, top=0.9, bottom=0.07)
+
+    def draw(self, t, tide, ukc_actual, ukc_req, title, info, bottom, operating_level,
+             step=1.0):
+        """Replace the data of every artist for one report."""
+        t = np.asarray(t, dtype=float)
+        ax1, ax2 = self.axes
+        self.tide_line.set_data(t, tide)
+        self.tide_fill.set_verts([_area(t, tide)])
+        self.operating_line.set_ydata([operating_level, operating_level])
+        self.legend1.get_texts()[1].set_text(f"Mực nước khai thác ({operating_level:g}m)")
+        self.ukc_line.set_data(t, ukc_actual)
+        self.ukc_fill.set_verts([_area(t, ukc_actual)])
+        self.req_line.set_data(t, ukc_req)
+        rects = _span_rects(violation_spans(np.asarray(ukc_actual) < np.asarray(ukc_req), t, step))
+        for spans in self.spans:
+            spans.set_verts(rects)
+
+        ax1.set_xlim(t[0], t[-1])
+        top = max(float(np.max(tide)), operating_level)
+        ax1.set_ylim(min(0.0, float(np.min(tide))), top + max(1.0, 0.25 * abs(top)))
+        low = min(0.0, float(np.min(ukc_actual)))
+        high = max(float(np.max(ukc_actual)), float(np.max(ukc_req)))
+        ax2.set_ylim(low, high + max(1.0, 0.2 * abs(high)))
+        self.title.set_text(title)
+        self.info.set_text(info)
+        self.bottom_text.set_text(f"Cao độ đáy: {bottom:g}m")
+
+    def save(self, path, dpi=DEFAULT_DPI):
+        self.fig.savefig(path, dpi=dpi, facecolor="white")
+
+
+_TEMPLATE = None
+
+
+def _template():
+    """This process's template, built on first use."""
+    global _TEMPLATE
+    if _TEMPLATE is None:
+        _TEMPLATE = ReportTemplate()
+    return _TEMPLATE
+
+
+def _filename(call_id):
+    return re.sub(r"[^\w.-]+", "_", str(call_id)).strip("._") or "call"
+
+
+def render_calls(calls, tide, total_hours, out_dir, fmt="png", dpi=DEFAULT_DPI,
+                 utc_offset_hours=7, operating_level=DEFAULTS["op_water_level"],
+                 port=DEFAULTS["port"]):
+    """Evaluate and render one chunk of calls: ``(paths, skipped)``.
+
+    As in ``evaluate_calls``, a call without a complete tide-store window is
+    not rendered; ``skipped`` maps its ``call_id`` to the reason, and the
+    other calls in the chunk are still written.
+    """
+    water, errors = checked_tides(tide, calls.get("arrival"), total_hours, utc_offset_hours)
+    if errors is None:
+        errors = np.full(len(calls["call_id"]), "", dtype=object)
+    skipped = {calls["call_id"][i]: errors[i] for i in np.flatnonzero(errors != "")}
+    res = evaluate_batch(water, **{c: calls[c] for c in CALL_COLUMNS}, total_hours=total_hours)
+    water = np.broadcast_to(water, res["ukc_actual"].shape)
+    hours = np.arange(total_hours)
+    template = _template()
+    paths = []
+    for i in np.flatnonzero(errors == ""):
+        call_id = calls["call_id"][i]
+        arrival = calls["arrival"][i] if "arrival" in calls else None
+        info = (f"Chuyến: {call_id}" + (f" | Đến: {str(arrival)[:16].replace('T', ' ')}"
+                                         if arrival is not None else "")
+                + f" | Tkt đến: {calls['tkt1'][i]:.2f}m | Hàng: {calls['import_cont'][i]:.0f} dỡ"
+                  f" / {calls['export_cont'][i]:.0f} xếp | Vi phạm: {res['violation_hours'][i]}h")
+        template.draw(hours, water[i], res["ukc_actual"][i], res["ukc_req"][i],
+                      f"BIỂU ĐỒ VẬN HÀNH TÀU - {call_id} | {port}", info,
+                      calls["bottom"][i], operating_level)
+        path = os.path.join(out_dir, f"{_filename(call_id)}.{fmt}")
+        template.save(path, dpi)
+        paths.append(path)
+    return paths, skipped
+
+
+def render_reports(calls_path, out_dir, tide=("table",), total_hours=None, fmt="png",
+                   dpi=DEFAULT_DPI, utc_offset_hours=7, workers=None,
+                   chunk_rows=DEFAULT_CHUNK_ROWS):
+    """One report per call in ``calls_path``: ``(written, skipped)``.
+
+    ``written`` is the number of reports saved and ``skipped`` maps the
+    ``call_id`` of each call left out for its tide window to the reason.
+    ``workers=1`` renders in-process; otherwise chunks are spread across a
+    process pool, each worker reusing its own template.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}, not {fmt!r}")
+    total_hours = int(total_hours or DEFAULTS["total_hours"])
+    os.makedirs(out_dir, exist_ok=True)
+    args = (tide, total_hours, out_dir, fmt, dpi, utc_offset_hours)
+    chunks = read_calls(calls_path, chunk_rows)
+    count, skipped = 0, {}
+
+    def collect(result):
+        nonlocal count
+        count += len(result[0])
+        skipped.update(result[1])
+
+    if workers == 1:
+        for calls in chunks:
+            collect(render_calls(calls, *args))
+        return count, skipped
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        limit = 2 * (workers or os.cpu_count() or 1)
+        for calls in chunks:
+            pending.append(pool.submit(render_calls, calls, *args))
+            if len(pending) >= limit:
+                collect(pending.popleft().result())
+        while pending:
+            collect(pending.popleft().result())
+    return count, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a UKC report per vessel call.")
+    parser.add_argument("calls", help="CSV or Parquet of vessel calls")
+    parser.add_argument("out_dir", help="directory for the reports")
+    parser.add_argument("--format", choices=FORMATS, default="png")
+    parser.add_argument("--dpi", type=int, default=DEFAULT_DPI)
+    parser.add_argument("--tide", choices=TIDE_MODES, default="table")
+    parser.add_argument("--constituents", default=DEFAULT_CONSTITUENTS)
+    parser.add_argument("--tide-store", default=os.path.join("data", "namdinhvu_tide.ukt"))
+    parser.add_argument("--hours", type=int, default=DEFAULTS["total_hours"])
+    parser.add_argument("--utc-offset", type=float, default=7.0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args(argv)
+    tide = {"table": ("table",), "harmonic": ("harmonic", args.constituents),
+            "store": ("store", args.tide_store)}[args.tide]
+    started = time.perf_counter()
+    count, skipped = render_reports(args.calls, args.out_dir, tide, args.hours, args.format,
+                                    args.dpi, args.utc_offset, args.workers, args.chunk_rows)
+    for call_id, reason in skipped.items():
+        print(f"skipped {call_id}: {reason}", file=sys.stderr)
+    print(f"{count} reports in {time.perf_counter() - started:.1f}s -> {args.out_dir}"
+          + (f", {len(skipped)} skipped" if skipped else ""))
+
+
+if __name__ == "__main__":
+    main()
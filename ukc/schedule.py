@@ -0,0 +1,405 @@
+"""Multi-vessel berth and crane scheduler sharing one quay and crane pool.
+
+Each call arrives at ``eta`` (hours from the start of the tide series) and
+needs a stretch of quay (``loa`` plus ``clearance``) and a crane gang for its
+whole stay. The gang size (1 up to the call's ``cranes``, at most the
+pool) sets the stay through ``operation_times``. The scheduler picks a start
+hour, gang size and quay position per call. Its goal is to minimize the total
+wait ``start - eta`` while the cranes in use never exceed the pool, vessels
+alongside at the same time never overlap on the quay, and every stay passes
+the UKC check, departure sample included.
+
+The UKC check does not depend on the other vessels. For every call and gang
+size, ``feasibility_windows`` evaluates all start hours in one vectorized
+pass and stores ``next_safe[s]``, the first safe start at or after ``s``.
+The search itself never touches the tide again.
+
+Schedules are built serially: vessels are placed one at a time, each with
+a chosen gang at its earliest feasible start given those already placed.
+That start is exact from a handful of candidates, namely ``next_safe`` at
+the ETA and at every placed vessel's departure, because resources only free
+up at departures. The search is a best-first branch and bound over
+(vessel, gang) choices, so it weighs a large gang that finishes early
+against smaller gangs that let other vessels work at the same time:
+
+* the bound of a partial schedule is its wait so far plus, for every
+  unplaced vessel, the smallest wait over its gangs of the earliest
+  placement given the vessels already placed (adding vessels never makes a
+  placement earlier), raised by ``busy_time_bound`` when the unplaced
+  vessels compete for the crane pool or the quay: each holds at least one
+  crane and its quay length for its shortest stay;
+* placing a vessel only moves the earliest placements it overlaps in time,
+  so the others are reused from the parent;
+* choices that reach the same set of placements are expanded once;
+* every expansion dives greedily (earliest start, then earliest departure)
+  to a complete schedule, so a good incumbent exists from the first dive.
+
+Quay positions are first fit, so ``optimal`` and ``lower_bound`` are with
+respect to serial schedules with first-fit positions. The search stops when
+no open node can beat the incumbent (``optimal``) or at ``time_limit`` /
+``max_nodes``, returning the best schedule found and the smallest open
+bound. A schedule that is not ``optimal`` is a heuristic, at most
+``total_wait - lower_bound`` above the optimum. A vessel that cannot be
+placed within the horizon is reported in ``unscheduled`` and counts as
+waiting until the end of the horizon.
+
+    python -m ukc.schedule calls.csv --quay 900 --cranes 6 --hours 168 --out plan.csv
+"""
+import argparse
+import heapq
+import itertools
+import math
+import time
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ukc.batch import CALL_COLUMNS
+from ukc.defaults import DEFAULTS
+from ukc.engine import draft_curve, operation_times, round_values, ukc_required_array
+
+SCHEDULE_COLUMNS = {**CALL_COLUMNS, "eta": 0.0, "loa": DEFAULTS["loa"]}
+DEFAULT_CLEARANCE = 15.0     # m of quay kept free between vessels
+DEFAULT_TIME_LIMIT = 5.0     # s
+DEFAULT_MAX_NODES = 50_000
+
+
+def read_schedule_calls(source):
+    """Calls from a CSV path or file object as a dict of column arrays.
+
+    Missing columns take ``SCHEDULE_COLUMNS`` defaults; ``cranes`` is the
+    largest gang the vessel can work with.
+    """
+    table = np.atleast_1d(np.genfromtxt(source, delimiter=",", names=True, dtype=None,
+                                        encoding="utf-8"))
+    names = table.dtype.names
+    calls = {c: table[c].astype(float) if c in names else np.full(table.size, d, float)
+             for c, d in SCHEDULE_COLUMNS.items()}
+    calls["call_id"] = table["call_id"] if "call_id" in names else np.arange(table.size)
+    return calls
+
+
+def feasibility_windows(calls, tide, crane_pool):
+    """Berth time and first safe start per call and gang size.
+
+    Returns ``berth_time`` (calls x gangs, ``inf`` for gangs the call cannot
+    use) and ``next_safe`` (calls x gangs x hours + 1): the first hour at or
+    after each hour where a stay with that gang passes the UKC check at
+    every hourly sample, ``len(tide)`` when there is none. Gang ``g`` is
+    index ``g - 1``.
+    """
+    tide = np.asarray(tide, dtype=float)
+    horizon = tide.size
+    gangs = np.arange(1, int(crane_pool) + 1, dtype=float)
+    n = len(calls["call_id"])
+    berth_time = np.full((n, gangs.size), np.inf)
+    next_safe = np.full((n, gangs.size, horizon + 1), horizon, dtype=np.intp)
+    starts = np.arange(horizon)
+    for i in range(n):
+        c = {k: float(np.asarray(calls[k])[i]) for k in CALL_COLUMNS}
+        usable = gangs <= c["cranes"]
+        if not usable.any():
+            continue
+        _, unload, load, berth = operation_times(c["import_cont"], c["export_cont"],
+                                                 c["crane_rate"], gangs[usable],
+                                                 c["wait_time"], c["aux_time"])
+        # Samples 0..ceil(berth): the last one is the departure (20% rule)
+        last = np.ceil(berth - 1e-9).astype(np.intp)
+        hours = np.arange(last.max() + 1, dtype=float)
+        col = (slice(None), None)
+        draft = round_values(draft_curve(hours, c["tkt1"], unload[col], load[col],
+                                         c["wait_time"], c["aux_time"], c["draft_change_rate"]))
+        req = ukc_required_array(draft, berth[col], t=hours)
+        # Samples past the end of the tide series are unknown, hence unsafe
+        padded = np.concatenate([tide, np.full(hours.size - 1, np.nan)])
+        water = sliding_window_view(padded, hours.size)[:, None, :]
+        ok = round_values(water + abs(c["bottom"]) - draft) >= req
+        safe = (ok | (hours > last[col])).all(axis=-1)
+        first = np.where(safe, starts[:, None], horizon)
+        berth_time[i, usable] = berth
+        next_safe[i, usable, :horizon] = np.minimum.accumulate(first[::-1], axis=0)[::-1].T
+    return {"berth_time": berth_time, "next_safe": next_safe}
+
+
+def busy_time_bound(release, hold, share, horizon, taken=()):
+    """Lower bound on ``sum(start)`` for jobs sharing one resource.
+
+    Job ``j`` starts at or after ``release[j]`` and then holds at least
+    ``share[j]`` of the resource for ``hold[j]`` hours; ``taken`` lists
+    ``(start, end, share)`` already in use. A job's mean busy time is
+    ``start + hold / 2``. Relaxed to preemptive processing of ``share * hold``
+    units on the capacity left, the sum of mean busy times is smallest when
+    the smallest job available is always processed first (Smith's rule), so
+    ``sum(start)`` is at least that sum minus ``sum(hold) / 2``. Work still
+    left at ``horizon`` counts as done there, where unplaced vessels start.
+    """
+    release = np.asarray(release, dtype=float)
+    work = np.asarray(share, dtype=float) * hold
+    left = work.copy()
+    mean = np.zeros(release.size)
+    edges = sorted({horizon, *release, *(e for s, t, _ in taken for e in (s, t))})
+    order = np.argsort(release, kind="stable")
+    ready, k = [], 0
+    t = float(release[order[0]])
+    for edge in edges:
+        if edge <= t:
+            continue
+        while k < order.size and release[order[k]] <= t:
+            heapq.heappush(ready, (work[order[k]], order[k]))
+            k += 1
+        free = 1.0 - sum(f for s, e, f in taken if s <= t < e)
+        while ready and free > 1e-12 and t < edge:
+            j = ready[0][1]
+            run = min(left[j] / free, edge - t)
+            mean[j] += free * run * (t + run / 2)
+            left[j] -= free * run
+            t += run
+            if left[j] <= 1e-12:
+                heapq.heappop(ready)
+        t = edge
+        if t >= horizon:
+            break
+    mean += left * horizon
+    return float((mean / work).sum() - np.sum(hold) / 2)
+
+
+class _Node:
+    __slots__ = ("placed", "cost", "options", "bound")
+
+    def __init__(self, placed, cost, options, bound):
+        self.placed, self.cost, self.options, self.bound = placed, cost, options, bound
+
+
+class _Scheduler:
+    """Placement of one vessel given others, and the branch and bound over
+    (vessel, gang) choices.
+
+    A placement is ``(call, start, end, position, gang)``; a vessel that
+    cannot be placed gets ``(call, horizon, horizon, None, 0)``, which holds
+    no quay or cranes.
+    """
+
+    def __init__(self, calls, windows, quay_length, crane_pool, clearance):
+        self.eta = np.maximum(np.asarray(calls["eta"], dtype=float), 0.0)
+        self.length = np.asarray(calls["loa"], dtype=float) + clearance
+        self.berth_time = windows["berth_time"]
+        self.next_safe = windows["next_safe"]
+        self.horizon = self.next_safe.shape[2] - 1
+        self.quay_length = float(quay_length)
+        self.pool = int(crane_pool)
+        self.gangs = [tuple(np.flatnonzero(np.isfinite(row))) for row in self.berth_time]
+        self.shortest_stay = self.berth_time.min(axis=1)
+        # Every vessel alongside holds at least one crane and its quay length
+        self.resources = ((np.full(self.eta.size, 1 / self.pool), lambda p: p[4] / self.pool),
+                          (self.length / self.quay_length,
+                           lambda p: self.length[p[0]] / self.quay_length))
+
+    def wait(self, placement):
+        return max(placement[1] - self.eta[placement[0]], 0.0)
+
+    def _unplaced(self, v):
+        return (v, self.horizon, self.horizon, None, 0)
+
+    def _fits(self, start, end, gang, length, placed):
+        """First-fit quay position for ``[start, end)``, or ``None``."""
+        busy = [p for p in placed if p[3] is not None and p[1] < end and p[2] > start]
+        for tau in [start] + [p[1] for p in busy if p[1] > start]:
+            if gang + sum(p[4] for p in busy if p[1] <= tau < p[2]) > self.pool:
+                return None
+        x = 0.0
+        for x0, x1 in sorted((p[3], p[3] + self.length[p[0]]) for p in busy):
+            if x0 - x >= length:
+                break
+            x = max(x, x1)
+        return x if x + length <= self.quay_length + 1e-9 else None
+
+    def _events(self, v, placed):
+        eta = self.eta[v]
+        return sorted({math.ceil(eta - 1e-9)} |
+                      {math.ceil(p[2] - 1e-9) for p in placed if p[3] is not None and p[2] > eta})
+
+    def _earliest_gang(self, v, g, events, placed):
+        """Earliest feasible placement of ``v`` with gang index ``g``, or ``None``."""
+        nxt, stay = self.next_safe[v, g], float(self.berth_time[v, g])
+        tried = -1
+        for p in events:
+            start = int(nxt[min(p, self.horizon)])
+            if start >= self.horizon:
+                return None
+            if start == tried:
+                continue
+            tried = start
+            x = self._fits(start, start + stay, g + 1, self.length[v], placed)
+            if x is not None:
+                return (v, start, start + stay, x, g + 1)
+        return None
+
+    def options(self, v, placed, gangs=None):
+        """Earliest placement of ``v`` per usable gang (``gangs``: indexes to
+        recompute, default all), or just its unplaced placement."""
+        events = self._events(v, placed)
+        found = [self._earliest_gang(v, g, events, placed)
+                 for g in (self.gangs[v] if gangs is None else gangs)]
+        return tuple(o for o in found if o is not None)
+
+    def earliest(self, v, placed):
+        """Earliest placement of ``v`` over its gangs; ties go to the earlier departure."""
+        return min(self.options(v, placed), key=lambda o: (o[1], o[2]), default=self._unplaced(v))
+
+    def _best_wait(self, options):
+        return min(self.wait(o) for o in options)
+
+    def bound(self, placed, options):
+        """Lower bound on the wait of the vessels in ``options`` given ``placed``."""
+        own = sum(self._best_wait(o) for o in options.values())
+        live = [u for u, opts in options.items() if opts[0][3] is not None]
+        if len(live) < 2:
+            return own
+        release = np.array([min(o[1] for o in options[u]) for u in live], dtype=float)
+        rest = own - sum(self._best_wait(options[u]) for u in live)
+        best = own
+        for share, used in self.resources:
+            taken = [(p[1], p[2], used(p)) for p in placed if p[3] is not None]
+            starts = busy_time_bound(release, self.shortest_stay[live], share[live],
+                                     self.horizon, taken)
+            best = max(best, rest + starts - self.eta[live].sum())
+        return best
+
+    def child(self, node, v, k):
+        """``node`` with ``v`` placed at its ``k``-th option."""
+        new = node.options[v][k]
+        placed = node.placed + (new,)
+        options = {}
+        for u, opts in node.options.items():
+            if u == v:
+                continue
+            if new[3] is None or opts[0][3] is None:
+                options[u] = opts
+                continue
+            # Only gangs whose placement overlaps the new vessel can move (later)
+            moved = [o[4] - 1 for o in opts if o[1] < new[2] and o[2] > new[1]]
+            if moved:
+                kept = [o for o in opts if not (o[1] < new[2] and o[2] > new[1])]
+                opts = tuple(sorted(kept + list(self.options(u, placed, moved)), key=lambda o: o[4]))
+            options[u] = opts or (self._unplaced(u),)
+        cost = node.cost + self.wait(new)
+        # The parent's bound holds for every schedule below it as well
+        return _Node(placed, cost, options, max(node.bound, cost + self.bound(placed, options)))
+
+    def serial(self, order):
+        """Wait of placing vessels in ``order`` (e.g. first come, first served)."""
+        placed = ()
+        for v in order:
+            placed += (self.earliest(v, placed),)
+        return sum(self.wait(p) for p in placed), placed
+
+    def search(self, time_limit, max_nodes):
+        started = time.perf_counter()
+        options = {v: self.options(v, ()) or (self._unplaced(v),) for v in range(self.eta.size)}
+        root = _Node((), 0.0, options, self.bound((), options))
+        best_cost, best = math.inf, None
+        heap, seen, counter, nodes = [(root.bound, 0, 0, None, root)], set(), itertools.count(1), 0
+        while heap and nodes < max_nodes and time.perf_counter() - started < time_limit:
+            bound, _, _, parent, item = heapq.heappop(heap)
+            if bound >= best_cost - 1e-9:
+                heap = []   # the heap is ordered by bound: nothing left can improve
+                break
+            node = item if parent is None else self.child(parent, *item)
+            while True:      # dive: earliest placement first, siblings go on the heap
+                nodes += 1
+                if node.bound >= best_cost - 1e-9:
+                    break
+                key = frozenset(node.placed)
+                if key in seen:
+                    break
+                seen.add(key)
+                if not node.options:
+                    best_cost, best = node.cost, node
+                    break
+                choices = sorted(((u, k) for u, opts in node.options.items() for k in range(len(opts))),
+                                 key=lambda c: (node.options[c[0]][c[1]][1], node.options[c[0]][c[1]][2],
+                                                self.eta[c[0]], c))
+                for c in choices[1:]:
+                    heapq.heappush(heap, (node.bound, -len(node.placed), next(counter), node, c))
+                node = self.child(node, *choices[0])
+        lower = min(heap[0][0], best_cost) if heap else best_cost
+        return best, lower, not heap, nodes
+
+
+def schedule_calls(calls, tide, quay_length, crane_pool, clearance=DEFAULT_CLEARANCE,
+                   time_limit=DEFAULT_TIME_LIMIT, max_nodes=DEFAULT_MAX_NODES, windows=None):
+    """Start, gang and quay position per call minimizing total wait.
+
+    ``calls`` is a dict of column arrays (see ``read_schedule_calls``);
+    ``tide`` is hourly from hour 0 and sets the horizon. ``windows`` may be
+    passed to reuse ``feasibility_windows`` across runs. Returns per-call
+    arrays in input order (``start``/``end`` hours, ``position`` m along the
+    quay, ``cranes``, ``wait``; NaN / 0 for ``unscheduled`` calls) plus
+    ``total_wait``, ``fcfs_wait`` (placing calls in ETA order),
+    ``lower_bound``, ``optimal`` and ``nodes``.
+    """
+    if windows is None:
+        windows = feasibility_windows(calls, tide, crane_pool)
+    solver = _Scheduler(calls, windows, quay_length, crane_pool, clearance)
+    n = solver.eta.size
+    fcfs_wait, fcfs = solver.serial(np.argsort(solver.eta, kind="stable"))
+    best, lower, optimal, nodes = solver.search(time_limit, max_nodes)
+    placed = best.placed if best is not None and best.cost <= fcfs_wait else fcfs
+    total = sum(solver.wait(p) for p in placed)
+
+    start, end, position = np.full(n, np.nan), np.full(n, np.nan), np.full(n, np.nan)
+    cranes, wait = np.zeros(n, dtype=int), np.zeros(n)
+    for v, s, e, x, g in placed:
+        wait[v] = solver.wait((v, s))
+        if x is not None:
+            start[v], end[v], position[v], cranes[v] = s, e, x, g
+    ids = np.asarray(calls["call_id"])
+    return {
+        "call_id": ids, "eta": solver.eta, "start": start, "end": end, "position": position,
+        "cranes": cranes, "wait": round_values(wait),
+        "unscheduled": ids[np.isnan(start)],
+        "total_wait": round(float(total), 2),
+        "fcfs_wait": round(float(fcfs_wait), 2),
+        "lower_bound": round(float(min(lower, total)), 2),
+        "optimal": optimal,
+        "nodes": nodes,
+    }
+
+
+def main(argv=None):
+    from ukc.batch import DEFAULT_CONSTITUENTS, TableWriter, call_tides
+
+    parser = argparse.ArgumentParser(description="Berth and crane schedule for a queue of calls.")
+    parser.add_argument("calls", help="CSV: call_id, eta (h), loa and the batch call columns")
+    parser.add_argument("--quay", type=float, required=True, help="quay length (m)")
+    parser.add_argument("--cranes", type=int, required=True, help="quay cranes in the pool")
+    parser.add_argument("--hours", type=int, default=168)
+    parser.add_argument("--tide", choices=("table", "harmonic"), default="table")
+    parser.add_argument("--start", help="local time of hour 0 (harmonic tide)")
+    parser.add_argument("--constituents", default=DEFAULT_CONSTITUENTS)
+    parser.add_argument("--clearance", type=float, default=DEFAULT_CLEARANCE)
+    parser.add_argument("--time-limit", type=float, default=DEFAULT_TIME_LIMIT)
+    parser.add_argument("--out", help="schedule output (.csv or .parquet)")
+    args = parser.parse_args(argv)
+
+    tide = ("table",) if args.tide == "table" else ("harmonic", args.constituents)
+    start = None if args.start is None else np.array([args.start], dtype="datetime64[s]")
+    water = np.atleast_2d(call_tides(tide, start, args.hours))[0]
+    calls = read_schedule_calls(args.calls)
+    started = time.perf_counter()
+    res = schedule_calls(calls, water, args.quay, args.cranes, args.clearance, args.time_limit)
+    status = ("optimal" if res["optimal"] else
+              f"heuristic: up to {res['total_wait'] - res['lower_bound']:.2f} h above the optimum, "
+              f"lower bound {res['lower_bound']:.2f} h")
+    print(f"{len(calls['call_id'])} calls in {time.perf_counter() - started:.1f}s: total wait "
+          f"{res['total_wait']:.2f} h ({status}), first come first served {res['fcfs_wait']:.2f} h")
+    if res["unscheduled"].size:
+        print(f"Not placed within {args.hours} h: {', '.join(map(str, res['unscheduled']))}")
+    if args.out:
+        with TableWriter(args.out) as out:
+            out.write({k: res[k] for k in ("call_id", "eta", "start", "end", "position", "cranes",
+                                           "wait")})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Window and tide-cycle queries on the UKC slack of one scenario.
+
+The slack is actual minus required UKC on the scenario's time grid
+(negative = violation). ``SlackIndex`` builds a ``RangeMin`` over the slack
+and one over the actual UKC once, plus a running count of violating points,
+so the minimum, its time and the hours below requirement of any window
+``[a, b]`` (hours) cost a few lookups whatever the window length. ``a`` and
+``b`` may be arrays to answer every candidate window in one call.
+
+Tide cycles run from one low water to the next. A low water is a sample
+that is the lowest within ``min_cycle_hours / 2`` on either side, which
+ignores small wiggles of observed or interpolated tides; the partial cycles
+before the first and after the last low water are kept and flagged
+incomplete::
+
+    index = SlackIndex(t, ukc_actual, ukc_req, tide)
+    index.window(12, 36)["min_slack"]
+    index.cycles()["min_ukc"]        # one value per tide cycle
+"""
+import numpy as np
+
+from ukc.engine import round_values
+from ukc.rangemin import RangeMin
+
+MIN_CYCLE_HOURS = 8.0     # shortest tide cycle recognised (diurnal and semidiurnal tides)
+
+
+def _scalar(values, index):
+    return {k: v if np.ndim(index) else v.item() for k, v in values.items()}
+
+
+class SlackIndex:
+    """Range-minimum index over one scenario's UKC and slack.
+
+    ``t`` (hours, increasing), ``ukc_actual`` and ``ukc_req`` are the
+    scenario grid and series; ``tide`` (same grid) is needed for ``cycles``.
+    """
+
+    def __init__(self, t, ukc_actual, ukc_req, tide=None):
+        self.t = np.asarray(t, dtype=float)
+        self.ukc = np.asarray(ukc_actual, dtype=float)
+        # Rounded like the dashboard's violation check (actual < required)
+        self.slack = round_values(self.ukc - np.asarray(ukc_req, dtype=float))
+        self.tide = None if tide is None else np.asarray(tide, dtype=float)
+        self._ukc = RangeMin(self.ukc)
+        self._slack = RangeMin(self.slack)
+        self._below = np.concatenate([[0], np.cumsum(self.slack < 0)])
+        self.step_hours = float(self.t[1] - self.t[0]) if self.t.size > 1 else 1.0
+        self._cycles = {}
+
+    def __len__(self):
+        return self.t.size
+
+    def bounds(self, a, b):
+        """Grid index ranges ``[lo, hi)`` of the points with ``a <= t <= b``."""
+        return (np.searchsorted(self.t, a, side="left"),
+                np.searchsorted(self.t, b, side="right"))
+
+    def _summary(self, lo, hi):
+        i, j = self._ukc.argmin(lo, hi), self._slack.argmin(lo, hi)
+        return {
+            "min_ukc": self.ukc[i], "min_ukc_time": self.t[i],
+            "min_slack": self.slack[j], "min_slack_time": self.t[j],
+            "below_hours": (self._below[hi] - self._below[lo]) * self.step_hours,
+        }
+
+    def window(self, a, b):
+        """Minimum UKC and slack (with their times) and hours below requirement
+        between hours ``a`` and ``b`` inclusive; arrays give one row per window.
+        """
+        lo, hi = self.bounds(a, b)
+        if np.any(hi <= lo):
+            raise ValueError("every window must contain at least one grid point")
+        return _scalar(self._summary(lo, hi), lo)
+
+    def low_waters(self, min_cycle_hours=MIN_CYCLE_HOURS):
+        """Grid indexes of the low waters (see the module docstring)."""
+        if self.tide is None:
+            raise ValueError("SlackIndex was built without a tide")
+        half = max(1, int(round(min_cycle_hours / 2 / self.step_hours)))
+        i = np.arange(half, self.t.size - half)
+        if not i.size:
+            return i
+        return i[RangeMin(self.tide).argmin(i - half, i + half + 1) == i]
+
+    def cycles(self, min_cycle_hours=MIN_CYCLE_HOURS):
+        """Per-tide-cycle table as a dict of columns.
+
+        ``start``/``end`` (hours) are the bounding low waters, or the grid
+        ends for the partial first and last cycles (``complete`` False);
+        ``high_water`` and ``high_water_time`` are the highest tide in the
+        cycle, followed by the ``window`` columns.
+        """
+        if min_cycle_hours not in self._cycles:
+            lows = self.low_waters(min_cycle_hours)
+            lo = np.append(0, lows)      # low waters never fall on the first sample
+            # Half-open, so every point (and violating hour) is in exactly one cycle
+            hi = np.append(lo[1:], self.t.size)
+            k = RangeMin(-self.tide).argmin(lo, hi)
+            self._cycles[min_cycle_hours] = {
+                "start": self.t[lo], "end": self.t[np.minimum(hi, self.t.size - 1)],
+                "complete": np.isin(lo, lows) & np.isin(hi, lows),
+                "high_water": self.tide[k], "high_water_time": self.t[k],
+                **self._summary(lo, hi),
+            }
+        return self._cycles[min_cycle_hours]
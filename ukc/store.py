@@ -0,0 +1,156 @@
+"""Persistent cross-process store for computed UKC scenarios (SQLite).
+
+Results are keyed by a stable hash of every engine input plus the identity
+of the tide series, and stored as compressed ``.npz`` blobs. The database
+runs in WAL mode so several dashboard replicas and batch jobs can share one
+file; least-recently-used rows are evicted once the total payload exceeds
+``max_bytes``.
+"""
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 256 * 2 ** 20
+_NONE_KEY = "__none__"     # names of the None values in a payload
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    key       TEXT PRIMARY KEY,
+    payload   BLOB NOT NULL,
+    nbytes    INTEGER NOT NULL,
+    created   REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scenarios_last_used ON scenarios (last_used);
+"""
+
+
+def tide_identity(tide):
+    """Short content hash of a tide series (or a caller-chosen string id)."""
+    if isinstance(tide, str):
+        return tide
+    data = np.ascontiguousarray(tide, dtype=np.float64)
+    return hashlib.sha256(data.tobytes()).hexdigest()[:32]
+
+
+def scenario_key(inputs, tide):
+    """Stable key for a dict of engine inputs and a tide series.
+
+    Numbers are normalised to ``float`` so ``2`` and ``2.0`` share a key.
+    """
+    normalised = {k: float(v) if isinstance(v, (int, float, np.number)) else v
+                  for k, v in inputs.items()}
+    blob = json.dumps({"inputs": normalised, "tide": tide_identity(tide)},
+                      sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def _normalise(arrays):
+    arrays = {k: np.asarray(v) for k, v in arrays.items()}
+    return {k: v.item() if v.ndim == 0 else v for k, v in arrays.items()}
+
+
+def _pack(arrays):
+    """``.npz`` bytes; ``None`` values are listed under ``_NONE_KEY``.
+
+    ``np.asarray(None)`` is an object array, which ``_unpack`` cannot load
+    without pickle (e.g. ``min_ukc_time`` of a summary with no samples).
+    """
+    arrays = dict(arrays)
+    if _NONE_KEY in arrays:
+        raise ValueError(f"{_NONE_KEY!r} is reserved")
+    none = [k for k, v in arrays.items() if v is None]
+    arrays = {k: np.asarray(v) for k, v in arrays.items() if v is not None}
+    for k, v in arrays.items():
+        if v.dtype.hasobject:
+            raise TypeError(f"{k!r}: object arrays cannot be stored")
+    if none:
+        arrays[_NONE_KEY] = np.array(none, dtype=str)
+    buf = io.BytesIO()
+    np.savez_compressed(buf, **arrays)
+    return buf.getvalue()
+
+
+def _unpack(payload):
+    with np.load(io.BytesIO(payload), allow_pickle=False) as npz:
+        arrays = _normalise({k: npz[k] for k in npz.files if k != _NONE_KEY})
+        if _NONE_KEY in npz.files:
+            arrays.update(dict.fromkeys(npz[_NONE_KEY].tolist()))
+    return arrays
+
+
+class ScenarioStore:
+    """Disk-backed LRU cache of scenario results.
+
+    Values are dicts of NumPy arrays, scalars or ``None``; scalars come back
+    as plain Python numbers. A connection is opened per call, so one instance can be
+    shared by threads and every process can open the same path.
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def get(self, key):
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT payload FROM scenarios WHERE key = ?",
+                               (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE scenarios SET last_used = ? WHERE key = ?",
+                         (time.time(), key))
+        return _unpack(row[0])
+
+    def put(self, key, arrays):
+        payload = _pack(arrays)
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO scenarios (key, payload, nbytes, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?)", (key, payload, len(payload), now, now))
+            self._evict(conn)
+            conn.execute("COMMIT")
+
+    def get_or_compute(self, key, compute):
+        """Return the stored result for ``key``, computing and storing it on a miss."""
+        result = self.get(key)
+        if result is None:
+            result = _normalise(compute())
+            self.put(key, result)
+        return result
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM scenarios").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT key, nbytes FROM scenarios ORDER BY last_used").fetchall()
+        doomed = []
+        for key, nbytes in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= nbytes
+        conn.executemany("DELETE FROM scenarios WHERE key = ?", doomed)
+
+    def __len__(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM scenarios").fetchone()[0]
+
+    def clear(self):
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM scenarios")
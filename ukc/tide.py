@@ -0,0 +1,168 @@
+"""Harmonic tide prediction.
+
+Water level is ``Z0 + sum f * A * cos(V0 + speed * dt + u - g)`` over the
+constituents read from a local CSV (``name, amplitude, phase, speed``; a
+``Z0`` row holds the mean level above chart datum). Phases are Greenwich
+phase lags in degrees for UTC timestamps; speeds are in degrees per hour.
+
+The astronomical argument ``V0`` and the nodal corrections ``f``/``u`` change
+slowly, so they are computed once per calendar year and cached (``f``/``u``
+are interpolated linearly through the year); a year of predictions is then a
+handful of vectorized ``cos`` passes.
+"""
+import csv
+from functools import lru_cache
+
+import numpy as np
+
+# Doodson numbers (tau, s, h, p, N', p1) and phase offset (deg) of the
+# constituents we know the astronomy for. Others get V0 = 0 and no nodal
+# correction, i.e. their phase is taken relative to 1 January.
+DOODSON = {
+    "M2":  ((2, 0, 0, 0, 0, 0), 0),
+    "S2":  ((2, 2, -2, 0, 0, 0), 0),
+    "N2":  ((2, -1, 0, 1, 0, 0), 0),
+    "K2":  ((2, 2, 0, 0, 0, 0), 0),
+    "K1":  ((1, 1, 0, 0, 0, 0), 90),
+    "O1":  ((1, -1, 0, 0, 0, 0), -90),
+    "P1":  ((1, 1, -2, 0, 0, 0), -90),
+    "Q1":  ((1, -2, 0, 1, 0, 0), -90),
+    "M4":  ((4, 0, 0, 0, 0, 0), 0),
+    "MS4": ((4, 2, -2, 0, 0, 0), 0),
+    "Sa":  ((0, 0, 1, 0, 0, 0), 0),
+    "Ssa": ((0, 0, 2, 0, 0, 0), 0),
+}
+
+DATUM = "Z0"
+
+
+# =============================================================================
+# CONSTITUENTS FILE
+# =============================================================================
+def load_constituents(path):
+    """Read a constituents CSV into a dict of arrays plus the ``z0`` datum."""
+    names, amplitude, phase, speed = [], [], [], []
+    z0 = 0.0
+    with open(path, newline="", encoding="utf-8") as fh:
+        rows = csv.DictReader(line for line in fh if not line.lstrip().startswith("#"))
+        for row in rows:
+            if row["name"].strip() == DATUM:
+                z0 = float(row["amplitude"])
+                continue
+            names.append(row["name"].strip())
+            amplitude.append(float(row["amplitude"]))
+            phase.append(float(row["phase"]))
+            speed.append(float(row["speed"]))
+    return {
+        "name": tuple(names),
+        "amplitude": np.array(amplitude),
+        "phase": np.array(phase),
+        "speed": np.array(speed),
+        "z0": z0,
+    }
+
+
+# =============================================================================
+# ASTRONOMY (per-year cache)
+# =============================================================================
+def _mean_longitudes(when):
+    """Mean longitudes (deg) s, h, p, N, p1 and lunar time tau at ``when``."""
+    jd = (when - np.datetime64("2000-01-01T12:00", "s")) / np.timedelta64(1, "D") + 2451545.0
+    t = (jd - 2451545.0) / 36525.0
+    s = 218.3164477 + 481267.88123421 * t
+    h = 280.46646 + 36000.76983 * t
+    p = 83.3532465 + 4069.0137287 * t
+    n = 125.04452 - 1934.136261 * t
+    p1 = 282.94 + 1.7192 * t
+    ut_hours = ((when - when.astype("datetime64[D]")) / np.timedelta64(1, "h"))
+    tau = 180.0 + 15.0 * ut_hours + h - s
+    return tau, s, h, p, n, p1
+
+
+def _nodal(name, n):
+    """Nodal factor f and phase correction u (deg) for lunar node N (deg)."""
+    n = np.radians(n)
+    c1, c2, c3 = np.cos(n), np.cos(2 * n), np.cos(3 * n)
+    s1, s2, s3 = np.sin(n), np.sin(2 * n), np.sin(3 * n)
+    m2 = (1.0004 - 0.0373 * c1 + 0.0002 * c2, -2.14 * s1)
+    table = {
+        "M2": m2,
+        "N2": m2,
+        "K2": (1.0241 + 0.2863 * c1 + 0.0083 * c2 - 0.0015 * c3,
+               -17.74 * s1 + 0.68 * s2 - 0.04 * s3),
+        "K1": (1.0060 + 0.1150 * c1 - 0.0088 * c2 + 0.0006 * c3,
+               -8.86 * s1 + 0.68 * s2 - 0.07 * s3),
+        "O1": (1.0089 + 0.1871 * c1 - 0.0147 * c2 + 0.0014 * c3,
+               10.80 * s1 - 1.34 * s2 + 0.19 * s3),
+        "M4": (m2[0] ** 2, 2 * m2[1]),
+        "MS4": m2,
+    }
+    table["Q1"] = table["O1"]
+    return table.get(name, (1.0, 0.0))
+
+
+@lru_cache(maxsize=64)
+def year_terms(year, names):
+    """Cached astronomical terms for ``names`` in calendar ``year``.
+
+    Returns ``(v0, f0, df, u0, du, hours)``: V0 at 1 January 00:00 UTC, and
+    the nodal factor / phase correction at the start of the year with their
+    change over the year, so predictions interpolate them linearly and stay
+    continuous across year boundaries.
+    """
+    start = np.datetime64(f"{year:04d}-01-01T00:00", "s")
+    end = np.datetime64(f"{year + 1:04d}-01-01T00:00", "s")
+    tau, s, h, p, n, p1 = _mean_longitudes(start)
+    n_end = _mean_longitudes(end)[4]
+    size = len(names)
+    v0, f0, f1, u0, u1 = (np.zeros(size) for _ in range(5))
+    f0[:], f1[:] = 1.0, 1.0
+    for i, name in enumerate(names):
+        if name not in DOODSON:
+            continue
+        numbers, offset = DOODSON[name]
+        # N' = -N in Doodson's convention.
+        v0[i] = np.dot(numbers, (tau, s, h, p, -n, p1)) + offset
+        f0[i], u0[i] = _nodal(name, n)
+        f1[i], u1[i] = _nodal(name, n_end)
+    hours = (end - start) / np.timedelta64(1, "h")
+    return np.mod(v0, 360.0), f0, f1 - f0, u0, u1 - u0, hours
+
+
+# =============================================================================
+# PREDICTION
+# =============================================================================
+def predict(constituents, times):
+    """Water level (m) at ``times`` (``datetime64``, UTC)."""
+    times = np.asarray(times, dtype="datetime64[s]")
+    flat = times.reshape(-1)
+    out = np.full(flat.shape, constituents["z0"], dtype=float)
+    if flat.size == 0:
+        return out.reshape(times.shape)
+    years = flat.astype("datetime64[Y]")
+    first, last = years.min(), years.max()
+    omega = np.radians(constituents["speed"])
+    for year in np.arange(first, last + np.timedelta64(1, "Y")):
+        start = year.astype("datetime64[s]")
+        sel = slice(None) if first == last else (years == year)
+        dt = (flat[sel] - start) / np.timedelta64(1, "h")
+        v0, f0, df, u0, du, hours = year_terms(int(str(year)), constituents["name"])
+        frac = dt / hours
+        lag = np.radians(v0 + u0 - constituents["phase"])
+        level = out[sel]
+        for k in range(omega.size):
+            arg = (omega[k] + np.radians(du[k]) / hours) * dt + lag[k]
+            if df[k]:
+                level += constituents["amplitude"][k] * (f0[k] + df[k] * frac) * np.cos(arg)
+            else:
+                level += constituents["amplitude"][k] * f0[k] * np.cos(arg)
+        out[sel] = level
+    return out.reshape(times.shape)
+
+
+def predict_range(constituents, start, hours, step_minutes=60):
+    """Prediction on a regular grid from ``start`` for ``hours`` hours."""
+    start = np.datetime64(start, "s")
+    n = int(round(hours * 60 / step_minutes))
+    times = start + np.arange(n) * np.timedelta64(int(step_minutes * 60), "s")
+    return times, predict(constituents, times)
@@ -0,0 +1,169 @@
+"""Memory-mapped binary tide tables.
+
+A tide store file is a 64-byte header followed by one fixed-dtype array of
+regularly spaced water levels::
+
+    magic  8s   b"UKCTIDE1"
+    dtype  8s   NumPy dtype string, e.g. b"<f8"
+    start  q    epoch seconds (UTC) of sample 0
+    step   q    seconds between samples
+    count  q    number of samples
+
+Opening a store maps the array with ``numpy.memmap``; a time lookup is
+``(t - start) // step`` and a window is a slice of the map, so reading a
+two-day window from a multi-year table touches only those pages. With the
+default ``<f8`` dtype the slice goes into the engine without a copy.
+
+Convert a CSV with::
+
+    python -m ukc.tide_store observed.csv observed.ukt --time-column time --value-column level
+"""
+import argparse
+import struct
+
+import numpy as np
+
+MAGIC = b"UKCTIDE1"
+HEADER = struct.Struct("<8s8sqqq")
+HEADER_SIZE = 64
+DEFAULT_DTYPE = "<f8"
+
+
+def _header(dtype, start, step, count):
+    raw = HEADER.pack(MAGIC, np.dtype(dtype).str.encode().ljust(8, b"\0"),
+                      start, step, count)
+    return raw.ljust(HEADER_SIZE, b"\0")
+
+
+def _epoch_seconds(t):
+    return int(np.datetime64(t, "s").astype(np.int64))
+
+
+# =============================================================================
+# WRITING
+# =============================================================================
+def write_tide_store(path, start, step_seconds, values, dtype=DEFAULT_DTYPE):
+    """Write a whole series (``values[i]`` at ``start + i * step``)."""
+    values = np.asarray(values, dtype=dtype)
+    with open(path, "wb") as fh:
+        fh.write(_header(dtype, _epoch_seconds(start), int(step_seconds), values.size))
+        fh.write(values.tobytes())
+
+
+def csv_to_tide_store(csv_path, path, time_column="time", value_column="level",
+                      step_seconds=None, dtype=DEFAULT_DTYPE, chunk_rows=1_000_000):
+    """Stream a (time, level) CSV into a tide store.
+
+    Rows must be in time order. The step defaults to the spacing of the
+    first two rows (a one-row file needs ``step_seconds``); missing samples
+    are written as NaN. Returns the sample count.
+    """
+    import pandas as pd
+
+    start = step = None
+    count = 0
+    with open(path, "wb") as fh:
+        fh.write(_header(dtype, 0, 1, 0))
+        for chunk in pd.read_csv(csv_path, usecols=[time_column, value_column],
+                                 chunksize=chunk_rows):
+            times = pd.to_datetime(chunk[time_column]).to_numpy("datetime64[s]").astype(np.int64)
+            levels = chunk[value_column].to_numpy(dtype=float)
+            if start is None:
+                if not step_seconds and times.size < 2:
+                    raise ValueError("Cannot infer the step from fewer than two rows; "
+                                     "pass step_seconds (--step-seconds)")
+                start = int(times[0])
+                step = int(step_seconds or times[1] - times[0])
+                if step <= 0:
+                    raise ValueError("Timestamps must be strictly increasing")
+            offsets = times - start
+            if (offsets % step).any():
+                raise ValueError("Timestamps are not on a regular grid")
+            idx = offsets // step - count
+            if (idx < 0).any() or (np.diff(idx) <= 0).any():
+                raise ValueError("Timestamps must be strictly increasing")
+            block = np.full(int(idx[-1]) + 1, np.nan, dtype=dtype)
+            block[idx] = levels
+            fh.write(block.tobytes())
+            count += block.size
+        fh.seek(0)
+        fh.write(_header(dtype, start or 0, step or 1, count))
+    return count
+
+
+# =============================================================================
+# READING
+# =============================================================================
+class TideStore:
+    """Read-only view of a tide store file."""
+
+    def __init__(self, path):
+        with open(path, "rb") as fh:
+            magic, dtype, start, step, count = HEADER.unpack(fh.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a tide store file")
+        self.path = path
+        self.dtype = np.dtype(dtype.rstrip(b"\0").decode())
+        self.start = np.datetime64(start, "s")
+        self.step = np.timedelta64(step, "s")
+        self.count = count
+        self.values = np.memmap(path, dtype=self.dtype, mode="r",
+                                offset=HEADER_SIZE, shape=(count,))
+
+    @property
+    def end(self):
+        """Timestamp of the last sample."""
+        return self.start + (self.count - 1) * self.step
+
+    def index(self, t):
+        """Sample index at or before ``t`` (O(1))."""
+        return int((np.datetime64(t, "s") - self.start) // self.step)
+
+    def stride(self, step):
+        """Samples per ``step`` (a ``timedelta64``), for coarser windows."""
+        every, rest = divmod(np.timedelta64(step, "s"), self.step)
+        if rest or not every:
+            raise ValueError(f"{step} is not a multiple of the store step {self.step}")
+        return int(every)
+
+    def covers(self, start, n, every=1):
+        i = self.index(start)
+        return 0 <= i and i + (n - 1) * every < self.count
+
+    def window(self, start, n, every=1):
+        """``n`` samples from ``start`` (every ``every``-th) as a zero-copy view."""
+        if not self.covers(start, n, every):
+            raise IndexError(f"Window {start} + {n} samples is outside "
+                             f"{self.start} .. {self.end}")
+        i = self.index(start)
+        return self.values[i:i + (n - 1) * every + 1:every]
+
+    def missing(self, start, n, every=1):
+        """Positions in ``window(start, n, every)`` with no sample (NaN)."""
+        return np.flatnonzero(np.isnan(self.window(start, n, every)))
+
+    def times(self, start, n, every=1):
+        i = self.index(start)
+        return self.start + (i + np.arange(n) * every) * self.step
+
+    def __len__(self):
+        return self.count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a tide CSV into a tide store file.")
+    parser.add_argument("csv_path")
+    parser.add_argument("path")
+    parser.add_argument("--time-column", default="time")
+    parser.add_argument("--value-column", default="level")
+    parser.add_argument("--step-seconds", type=int, default=None)
+    parser.add_argument("--dtype", default=DEFAULT_DTYPE)
+    args = parser.parse_args(argv)
+    count = csv_to_tide_store(args.csv_path, args.path, args.time_column, args.value_column,
+                              args.step_seconds, args.dtype)
+    store = TideStore(args.path)
+    print(f"{count} samples, {store.start} .. {store.end}, step {store.step}")
+
+
+if __name__ == "__main__":
+    main()
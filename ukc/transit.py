@@ -0,0 +1,216 @@
+"""Channel transit UKC along a bathymetry profile.
+
+The berth check uses one scalar ``bottom``; on the way in the vessel crosses
+a dredged channel whose depth varies along its centreline. A
+``ChannelProfile`` holds that centreline as chainage (m from the entrance)
+and depth below chart datum, and the vessel passes chainage ``i`` at
+``departure + elapsed[i]`` hours, ``elapsed`` following from the speed
+profile. UKC at each point is ``tide(t) + depth - draft`` (the engine's
+formula with a per-point ``bottom``) against the underway requirement of
+20% of draft.
+
+``transit_grid`` evaluates every chainage x departure in one array.
+``transit_safe`` and ``plan_transit`` ("is this departure safe, where is
+the controlling shoal, what is the latest safe departure") avoid that grid:
+each departure starts as one segment covering the whole profile, bounded
+with the profile's ``RangeMin`` index (shallowest point of any chainage
+range in O(1)) and one over the tide (lowest and highest level during the
+segment's passage). A segment whose bound clears the requirement is done,
+one whose shallowest point fails even at the highest tide marks the
+departure unsafe, and the rest are halved; only short segments are checked
+point by point. A query touches O(log n) segments per departure in the
+usual case instead of all n points.
+"""
+import numpy as np
+
+from ukc.engine import ukc_array
+from ukc.rangemin import RangeMin
+
+KNOT = 1852.0               # metres per hour at 1 knot
+TRANSIT_UKC_FACTOR = 0.2    # required UKC underway, as a fraction of draft
+DEFAULT_SPEED = 8.0         # knots
+LEAF_POINTS = 32            # segments this short are checked point by point
+
+
+class ChannelProfile:
+    """Channel centreline: strictly increasing ``chainage`` (m) and ``depth`` (m).
+
+    ``depth`` may be given as positive depth or negative bed elevation below
+    chart datum (like ``bottom``). ``speed`` (knots, scalar or one value per
+    point, the speed over the segment starting there) is the default speed
+    profile for queries.
+    """
+
+    def __init__(self, chainage, depth, speed=DEFAULT_SPEED):
+        self.chainage = np.asarray(chainage, dtype=float)
+        self.depth = np.abs(np.asarray(depth, dtype=float))
+        if self.chainage.ndim != 1 or self.chainage.shape != self.depth.shape:
+            raise ValueError("chainage and depth must be 1-D arrays of the same length")
+        if self.chainage.size < 2 or np.any(np.diff(self.chainage) <= 0):
+            raise ValueError("chainage must be strictly increasing with at least two points")
+        self.speed = speed
+        self.index = RangeMin(self.depth)
+
+    @classmethod
+    def from_csv(cls, source, chainage_column="chainage", depth_column="depth",
+                 speed_column="speed"):
+        """Load a profile from a CSV path or file object with a header row.
+
+        The speed column is optional; without it the default speed is used.
+        """
+        table = np.genfromtxt(source, delimiter=",", names=True, dtype=float, encoding="utf-8")
+        names = table.dtype.names
+        for column in (chainage_column, depth_column):
+            if column not in names:
+                raise ValueError(f"Column {column!r} not found (have {', '.join(names)})")
+        table = table[np.argsort(table[chainage_column], kind="stable")]
+        speed = table[speed_column] if speed_column in names else DEFAULT_SPEED
+        return cls(table[chainage_column], table[depth_column], speed)
+
+    def __len__(self):
+        return self.chainage.size
+
+    def elapsed(self, speed=None):
+        """Hours from departure (chainage 0 of the profile) to each point."""
+        speed = np.broadcast_to(np.asarray(self.speed if speed is None else speed, dtype=float),
+                                self.chainage.shape)
+        if np.any(speed[:-1] <= 0):
+            raise ValueError("speed must be positive")
+        hours = np.empty_like(self.chainage)
+        hours[0] = 0.0
+        np.cumsum(np.diff(self.chainage) / (speed[:-1] * KNOT), out=hours[1:])
+        return hours
+
+
+def _tide_at(tide, t, step_minutes):
+    tide = np.asarray(tide, dtype=float)
+    horizon = (tide.size - 1) * step_minutes / 60
+    if np.any(t < 0) or np.any(t > horizon + 1e-9):
+        raise ValueError(f"Transit times fall outside the tide series (0-{horizon:g} h)")
+    return np.interp(t, np.arange(tide.size) * (step_minutes / 60), tide)
+
+
+def transit_grid(profile, tide, departures, draft, speed=None, step_minutes=60,
+                 factor=TRANSIT_UKC_FACTOR):
+    """UKC at every departure x chainage.
+
+    ``tide`` is sampled every ``step_minutes`` from hour 0 and is linearly
+    interpolated to the passage times. Returns ``elapsed`` (hours per
+    point), ``ukc`` (departures x points) and ``ukc_req`` (scalar).
+    """
+    elapsed = profile.elapsed(speed)
+    t = np.asarray(departures, dtype=float)[..., None] + elapsed
+    ukc = ukc_array(_tide_at(tide, t, step_minutes), draft, profile.depth)
+    return {"elapsed": elapsed, "ukc": ukc, "ukc_req": round(factor * draft, 2)}
+
+
+def controlling_shoal(profile, tide, departure, draft, speed=None, step_minutes=60,
+                      factor=TRANSIT_UKC_FACTOR):
+    """The point with the least UKC margin on one transit, checked point by point."""
+    grid = transit_grid(profile, tide, departure, draft, speed, step_minutes, factor)
+    margin = grid["ukc"] - grid["ukc_req"]
+    i = int(np.argmin(margin))
+    return {
+        "safe": bool(margin[i] >= 0),
+        "index": i,
+        "chainage": float(profile.chainage[i]),
+        "depth": float(profile.depth[i]),
+        "time": float(departure + grid["elapsed"][i]),
+        "ukc": float(grid["ukc"][i]),
+        "ukc_req": grid["ukc_req"],
+    }
+
+
+def _ranges(lo, hi):
+    """Flattened ``arange(lo[j], hi[j])`` for all j, and the j of each entry."""
+    n = hi - lo
+    owner = np.repeat(np.arange(n.size), n)
+    return np.arange(n.sum()) - np.repeat(np.cumsum(n) - n - lo, n), owner
+
+
+def transit_safe(profile, tide, departures, draft, speed=None, step_minutes=60,
+                 factor=TRANSIT_UKC_FACTOR):
+    """Boolean per departure: UKC meets the requirement at every point."""
+    departures = np.atleast_1d(np.asarray(departures, dtype=float))
+    elapsed = profile.elapsed(speed)
+    levels = np.asarray(tide, dtype=float)
+    _tide_at(levels, departures[:, None] + elapsed[[0, -1]], step_minutes)  # range check
+    step = step_minutes / 60
+    tide_low, tide_high = RangeMin(levels), RangeMin(-levels)
+    # Same rounding as the point-by-point check, so the bounds never disagree with it
+    need = round(factor * draft, 2)
+
+    unsafe = np.zeros(departures.size, dtype=bool)
+    dep = np.arange(departures.size)
+    lo = np.zeros(departures.size, dtype=np.intp)
+    hi = np.full(departures.size, elapsed.size, dtype=np.intp)
+    while dep.size:
+        keep = ~unsafe[dep]
+        dep, lo, hi = dep[keep], lo[keep], hi[keep]
+        leaf = hi - lo <= LEAF_POINTS
+        if leaf.any():
+            idx, owner = _ranges(lo[leaf], hi[leaf])
+            owner = dep[leaf][owner]
+            t = departures[owner] + elapsed[idx]
+            ukc = ukc_array(_tide_at(levels, t, step_minutes), draft, profile.depth[idx])
+            unsafe[owner[ukc < need]] = True
+            dep, lo, hi = dep[~leaf], lo[~leaf], hi[~leaf]
+        if not dep.size:
+            break
+
+        # Tide range over the segment's passage: its two ends plus samples inside
+        t0, t1 = departures[dep] + elapsed[lo], departures[dep] + elapsed[hi - 1]
+        ends = _tide_at(levels, np.stack([t0, t1]), step_minutes)
+        low, high = ends.min(axis=0), ends.max(axis=0)
+        i0 = np.ceil(t0 / step - 1e-9).astype(np.intp)
+        i1 = np.minimum(np.floor(t1 / step + 1e-9).astype(np.intp) + 1, levels.size)
+        inner = i1 > i0
+        low[inner] = np.minimum(low[inner], tide_low.min(i0[inner], i1[inner]))
+        high[inner] = np.maximum(high[inner], -tide_high.min(i0[inner], i1[inner]))
+
+        shoal = profile.index.min(lo, hi)
+        sure = ukc_array(low, draft, shoal) >= need
+        # The shallowest point itself fails even at the segment's highest tide
+        unsafe[dep[ukc_array(high, draft, shoal) < need]] = True
+        split = ~sure & ~unsafe[dep]
+        dep, lo, hi = dep[split], lo[split], hi[split]
+        mid = (lo + hi) // 2
+        dep, lo, hi = np.concatenate([dep, dep]), np.concatenate([lo, mid]), np.concatenate([mid, hi])
+    return ~unsafe
+
+
+def plan_transit(profile, tide, departure, draft, speed=None, step_minutes=60,
+                 departure_step_minutes=1, factor=TRANSIT_UKC_FACTOR):
+    """Controlling shoal for ``departure`` and the safe departure window after it.
+
+    Candidate departures run from ``departure`` every ``departure_step_minutes``
+    until the transit would leave the tide series. ``earliest_departure`` is
+    the first safe candidate (``departure`` itself when it is safe) and
+    ``latest_departure`` the last one of the unbroken safe run that starts
+    there; both are ``None`` when no candidate is safe.
+    """
+    elapsed = profile.elapsed(speed)
+    horizon = (len(tide) - 1) * step_minutes / 60 - elapsed[-1]
+    if departure > horizon + 1e-9:
+        raise ValueError(f"Transit of {elapsed[-1]:.2f} h from hour {departure:g} "
+                         f"runs past the tide series")
+    step = departure_step_minutes / 60
+    candidates = departure + np.arange(int(np.floor((horizon - departure) / step + 1e-9)) + 1) * step
+    safe = transit_safe(profile, tide, candidates, draft, speed, step_minutes, factor)
+
+    earliest = latest = None
+    ok = np.flatnonzero(safe)
+    if ok.size:
+        start = ok[0]
+        broken = np.flatnonzero(~safe[start:])
+        end = start + (broken[0] if broken.size else safe.size - start) - 1
+        earliest, latest = float(candidates[start]), float(candidates[end])
+    return {
+        "departure": float(departure),
+        "passage_hours": float(elapsed[-1]),
+        "shoal": controlling_shoal(profile, tide, departure, draft, speed, step_minutes, factor),
+        "earliest_departure": earliest,
+        "latest_departure": latest,
+        "candidates": candidates,
+        "safe": safe,
+    }